@@ -395,6 +395,14 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         max=100
     )
 
+    export_image_threads: IntProperty(
+        name='Image threads',
+        description='Number of images encoded and written at the same time (0 = one per CPU core, 1 = no parallel encoding)',
+        default=0,
+        min=0,
+        max=256
+    )
+
     export_keep_originals: BoolProperty(
         name='Keep original',
         description=('Keep original textures files if possible. '
@@ -477,6 +485,14 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         max=30
     )
 
+    export_draco_mesh_compression_threads: IntProperty(
+        name='Compression threads',
+        description='Number of primitives encoded at the same time (0 = one per CPU core, 1 = no parallel encoding)',
+        default=0,
+        min=0,
+        max=256
+    )
+
     export_tangents: BoolProperty(
         name='Tangents',
         description='Export vertex tangents with meshes',
@@ -975,6 +991,38 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         default=False
     )
 
+    export_profile: BoolProperty(
+        name='Profiling Report',
+        description=(
+            'Write a JSON report with time, call count and produced bytes of each export stage, '
+            'next to the exported file'
+            ),
+        default=False
+    )
+
+    export_cache_directory: StringProperty(
+        name='Cache Directory',
+        description=(
+            'Folder where extracted meshes and encoded images are kept between exports. '
+            'Unchanged meshes and images are loaded from it instead of being computed again. '
+            'Leave empty to disable'
+            ),
+        default='',
+        subtype='DIR_PATH'
+    )
+
+    export_incremental: BoolProperty(
+        name='Incremental Export',
+        description=(
+            'Keep extracted meshes and encoded images between exports (in the Cache Directory, '
+            'or next to the exported file), with a manifest of the ones used. '
+            'Only the ones that changed since the previous export are computed again. '
+            'Skinned meshes, meshes with UDIM materials, the scene hierarchy and animations '
+            'are always exported again'
+            ),
+        default=False
+    )
+
     export_extra_animations: BoolProperty(
         name='Prepare extra animations',
         description=(
@@ -1052,8 +1100,9 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         import os
         import datetime
         import logging
-        from .io.com.debug import Log
+        from .io.com.debug import Log, ExportProfiler
         from .blender.exp import export as gltf2_blender_export
+        from .blender.exp.disk_cache import DiskCache
         from .io.com.path import path_to_uri
 
         if self.will_save_settings:
@@ -1067,6 +1116,8 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         export_settings['loglevel'] = set_debug_log()
 
         export_settings['exported_images'] = {}
+        export_settings['encoded_images'] = {}
+        export_settings['image_source_hashes'] = {}
         export_settings['exported_texture_nodes'] = []
         export_settings['additional_texture_export'] = []
         export_settings['additional_texture_export_current_idx'] = 0
@@ -1086,6 +1137,7 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         export_settings['gltf_add_webp'] = self.export_image_add_webp
         export_settings['gltf_webp_fallback'] = self.export_image_webp_fallback
         export_settings['gltf_image_quality'] = self.export_image_quality
+        export_settings['gltf_image_threads'] = self.export_image_threads
         export_settings['gltf_copyright'] = self.export_copyright
         export_settings['gltf_texcoords'] = self.export_texcoords
         export_settings['gltf_normals'] = self.export_normals
@@ -1101,6 +1153,7 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
             export_settings['gltf_draco_texcoord_quantization'] = self.export_draco_texcoord_quantization
             export_settings['gltf_draco_color_quantization'] = self.export_draco_color_quantization
             export_settings['gltf_draco_generic_quantization'] = self.export_draco_generic_quantization
+            export_settings['gltf_draco_mesh_compression_threads'] = self.export_draco_mesh_compression_threads
         else:
             export_settings['gltf_draco_mesh_compression'] = False
 
@@ -1227,6 +1280,15 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
 
         export_settings['gltf_hierarchy_full_collections'] = self.export_hierarchy_full_collections
 
+        export_settings['gltf_profile'] = self.export_profile
+        export_settings['profiler'] = ExportProfiler() if self.export_profile else None
+
+        export_settings['gltf_cache_directory'] = bpy.path.abspath(self.export_cache_directory) if self.export_cache_directory else None
+        export_settings['gltf_incremental'] = self.export_incremental
+        if self.export_incremental and export_settings['gltf_cache_directory'] is None:
+            export_settings['gltf_cache_directory'] = os.path.splitext(export_settings['gltf_filepath'])[0] + '.cache'
+        export_settings['disk_cache'] = DiskCache(export_settings['gltf_cache_directory']) if export_settings['gltf_cache_directory'] else None
+
         # gltfpack stuff
         export_settings['gltf_use_gltfpack'] = self.export_use_gltfpack
         if self.export_use_gltfpack:
@@ -1341,6 +1403,9 @@ def export_main(layout, operator, is_file_browser):
         layout.label(text="This is the least efficient of the available forms, and should only be used when required.", icon='ERROR')
 
     layout.prop(operator, 'export_copyright')
+    layout.prop(operator, 'export_profile')
+    layout.prop(operator, 'export_cache_directory')
+    layout.prop(operator, 'export_incremental')
     if is_file_browser:
         layout.prop(operator, 'will_save_settings')
 
@@ -1459,6 +1524,9 @@ def export_panel_data_material(layout, operator):
         col = body.column()
         col.active = operator.export_image_format != "WEBP"
         col.prop(operator, "export_image_webp_fallback")
+        col = body.column()
+        col.active = operator.export_materials == "EXPORT"
+        col.prop(operator, 'export_image_threads')
 
         header, sub_body = body.panel("GLTF_export_data_material_unused", default_closed=True)
         header.label(text="Unused Textures & Images")
@@ -1553,6 +1621,8 @@ def export_panel_data_compression(layout, operator):
         col.prop(operator, 'export_draco_color_quantization', text="Color")
         col.prop(operator, 'export_draco_generic_quantization', text="Generic")
 
+        body.prop(operator, 'export_draco_mesh_compression_threads')
+
 
 def export_panel_animation(layout, operator):
     header, body = layout.panel("GLTF_export_animation", default_closed=True)
@@ -1767,6 +1837,14 @@ class ImportGLTF2(Operator, ConvertGLTF2_Base, ImportHelper):
         default=False,
     )
 
+    import_decode_threads: IntProperty(
+        name='Decoding Threads',
+        description='Number of meshes decoded at the same time (0 = one per CPU core, 1 = no parallel decoding)',
+        default=0,
+        min=0,
+        max=256
+    )
+
     import_shading: EnumProperty(
         name="Shading",
         items=(("NORMALS", "Use Normal Data", ""),
@@ -1826,6 +1904,20 @@ class ImportGLTF2(Operator, ConvertGLTF2_Base, ImportHelper):
         default=False,
     )
 
+    import_gpu_instances: EnumProperty(
+        name='GPU Instances',
+        items=(
+            ('OBJECTS', 'Objects',
+                'Create one object for each instance of EXT_mesh_gpu_instancing'),
+            ('INSTANCER', 'Instancer',
+                'Create a single object with one point per instance, '
+                'instancing the mesh on its points with Geometry Nodes. '
+                'Faster for files with many instances'),
+        ),
+        description='How instances of EXT_mesh_gpu_instancing are imported',
+        default='OBJECTS',
+    )
+
     def draw(self, context):
         operator = self
         layout = self.layout
@@ -1836,9 +1928,11 @@ class ImportGLTF2(Operator, ConvertGLTF2_Base, ImportHelper):
         layout.prop(self, 'import_pack_images')
         layout.prop(self, 'merge_vertices')
         layout.prop(self, 'import_shading')
+        layout.prop(self, 'import_decode_threads')
         layout.prop(self, 'guess_original_bind_pose')
         layout.prop(self, 'export_import_convert_lighting_mode')
         layout.prop(self, 'import_webp_texture')
+        layout.prop(self, 'import_gpu_instances')
         import_bone_panel(layout, operator)
 
         import_panel_user_extension(context, layout)
@@ -1897,6 +1991,7 @@ class ImportGLTF2(Operator, ConvertGLTF2_Base, ImportHelper):
         from .io.imp.gltf2_io_gltf import glTFImporter, ImportError
         from .blender.imp.blender_gltf import BlenderGlTF
 
+        gltf_importer = None
         try:
             gltf_importer = glTFImporter(filename, import_settings)
             gltf_importer.read()
@@ -1921,6 +2016,11 @@ class ImportGLTF2(Operator, ConvertGLTF2_Base, ImportHelper):
             self.report({'ERROR'}, e.args[0])
             return {'CANCELLED'}
 
+        finally:
+            # Don't keep the source files mapped (and locked, on Windows) until garbage collection
+            if gltf_importer is not None:
+                gltf_importer.close()
+
 
 def import_bone_panel(layout, operator):
     header, body = layout.panel("GLTF_import_bone", default_closed=False)
@@ -14,6 +14,7 @@
 
 import typing
 import math
+import numpy as np
 from mathutils import Matrix, Vector, Quaternion, Euler
 
 from .data_path import get_target_property_name
@@ -214,3 +215,140 @@ def nearby_signed_perm_matrix(rot):
     z[(k+2) % 3] = 0
 
     return m
+
+
+def decompose_matrices(matrices: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Decompose a (n, 4, 4) array of matrices into locations, rotations and scales.
+
+    Works like Matrix.decompose() on each matrix: rotations are w-first
+    quaternions with a non negative w, and scales are negated for matrices
+    with a negative determinant.
+    """
+    matrices = np.asarray(matrices, dtype=np.float64)
+
+    locations = matrices[:, :3, 3].copy()
+
+    rotations, scales = __decompose_basis(matrices[:, :3, :3])
+
+    return locations, rotations, scales
+
+
+def __decompose_basis(basis: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Decompose a (n, 3, 3) array of matrices into quaternions and scales."""
+    scales = np.linalg.norm(basis, axis=1)
+    rotations = basis / np.where(scales == 0.0, 1.0, scales)[:, np.newaxis, :]
+
+    negative = np.linalg.det(rotations) < 0.0
+    rotations[negative] *= -1.0
+    scales[negative] *= -1.0
+
+    return rotation_matrices_to_quaternions(rotations), scales
+
+
+def rotation_matrices_to_quaternions(rotations: np.ndarray) -> np.ndarray:
+    """Convert a (n, 3, 3) array of rotation matrices into (n, 4) w-first quaternions."""
+    r = rotations
+    quaternions = np.empty((len(r), 4), dtype=np.float64)
+
+    # Use the largest diagonal term to keep a good precision, as Blender does
+    positive_z = r[:, 2, 2] >= 0.0
+    w_branch = positive_z & (r[:, 0, 0] >= -r[:, 1, 1])
+    z_branch = positive_z & ~w_branch
+    x_branch = ~positive_z & (r[:, 0, 0] > r[:, 1, 1])
+    y_branch = ~positive_z & ~x_branch
+
+    m = r[w_branch]
+    s = 2.0 * np.sqrt(1.0 + m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2])
+    quaternions[w_branch] = np.stack((
+        0.25 * s,
+        (m[:, 2, 1] - m[:, 1, 2]) / s,
+        (m[:, 0, 2] - m[:, 2, 0]) / s,
+        (m[:, 1, 0] - m[:, 0, 1]) / s), axis=-1)
+
+    m = r[x_branch]
+    s = 2.0 * np.sqrt(1.0 + m[:, 0, 0] - m[:, 1, 1] - m[:, 2, 2])
+    quaternions[x_branch] = np.stack((
+        (m[:, 2, 1] - m[:, 1, 2]) / s,
+        0.25 * s,
+        (m[:, 0, 1] + m[:, 1, 0]) / s,
+        (m[:, 0, 2] + m[:, 2, 0]) / s), axis=-1)
+
+    m = r[y_branch]
+    s = 2.0 * np.sqrt(1.0 - m[:, 0, 0] + m[:, 1, 1] - m[:, 2, 2])
+    quaternions[y_branch] = np.stack((
+        (m[:, 0, 2] - m[:, 2, 0]) / s,
+        (m[:, 0, 1] + m[:, 1, 0]) / s,
+        0.25 * s,
+        (m[:, 1, 2] + m[:, 2, 1]) / s), axis=-1)
+
+    m = r[z_branch]
+    s = 2.0 * np.sqrt(1.0 - m[:, 0, 0] - m[:, 1, 1] + m[:, 2, 2])
+    quaternions[z_branch] = np.stack((
+        (m[:, 1, 0] - m[:, 0, 1]) / s,
+        (m[:, 0, 2] + m[:, 2, 0]) / s,
+        (m[:, 1, 2] + m[:, 2, 1]) / s,
+        0.25 * s), axis=-1)
+
+    # Canonical result, with w non negative
+    quaternions[quaternions[:, 0] < 0.0] *= -1.0
+
+    lengths = np.linalg.norm(quaternions, axis=1)
+    quaternions /= np.where(lengths == 0.0, 1.0, lengths)[:, np.newaxis]
+
+    return quaternions
+
+
+def quaternions_to_rotation_matrices(quaternions: np.ndarray) -> np.ndarray:
+    """Convert a (n, 4) array of w-first quaternions into (n, 3, 3) rotation matrices."""
+    lengths = np.linalg.norm(quaternions, axis=1)
+    q = quaternions / np.where(lengths == 0.0, 1.0, lengths)[:, np.newaxis]
+    w, x, y, z = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+
+    return np.stack((
+        1.0 - 2.0 * (y * y + z * z), 2.0 * (x * y - z * w), 2.0 * (x * z + y * w),
+        2.0 * (x * y + z * w), 1.0 - 2.0 * (x * x + z * z), 2.0 * (y * z - x * w),
+        2.0 * (x * z - y * w), 2.0 * (y * z + x * w), 1.0 - 2.0 * (x * x + y * y)
+    ), axis=-1).reshape(-1, 3, 3)
+
+
+def multiply_quaternions(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Product of w-first quaternions, stored in (n, 4) or (4,) arrays (broadcasted)."""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    aw, ax, ay, az = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    bw, bx, by, bz = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+
+    return np.stack((
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw
+    ), axis=-1)
+
+
+def transform_array(values: np.ndarray, data_path: str, transform: Matrix = Matrix.Identity(4)) -> np.ndarray:
+    """Manage transformations of a (n, k) array of values, like transform() does for a single value."""
+    target = get_target_property_name(data_path)
+    values = np.asarray(values, dtype=np.float64)
+    matrix = np.array(transform, dtype=np.float64)
+
+    if target in ["delta_location", "location"]:
+        return values @ matrix[:3, :3].T + matrix[:3, 3]
+    elif target == "rotation_quaternion":
+        rotations, _ = __decompose_basis(matrix[:3, :3] @ quaternions_to_rotation_matrices(values))
+        return rotations
+    elif target == "scale":
+        # Like Matrix.to_scale() in transform_scale(), the scales are never negative
+        return np.linalg.norm(matrix[:3, :3] @ (np.identity(3) * values[:, np.newaxis, :]), axis=1)
+    elif target == "value":
+        return values
+
+    raise RuntimeError("Cannot transform values at {}".format(data_path))
+
+
+def array_to_gltf(values: np.ndarray, data_path: str) -> np.ndarray:
+    """Transform a (n, k) array of values to glTF layout."""
+    if get_target_property_name(data_path) == "rotation_quaternion":
+        # Blender has w-first quaternion notation
+        return values[:, [1, 2, 3, 0]]
+    return values
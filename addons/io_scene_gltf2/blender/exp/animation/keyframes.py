@@ -83,6 +83,10 @@ class Keyframe:
     def get_indices(self):
         return self.__indices
 
+    def get_value_list(self):
+        # Raw values, without conversion to mathutils
+        return self.__value
+
     def set_value_index(self, idx, val):
         self.__value[idx] = val
 
@@ -15,6 +15,7 @@
 import typing
 import numpy as np
 from ....cache import cached
+from .....com.gltf2_blender_math import decompose_matrices
 from ...keyframes import Keyframe
 from ..sampling_cache import get_cache_data
 
@@ -31,33 +32,30 @@ def gather_bone_sampled_keyframes(
     start_frame = export_settings['ranges'][armature_uuid][action_name]['start']
     end_frame  = export_settings['ranges'][armature_uuid][action_name]['end']
 
-    keyframes = []
-
-    frame = start_frame
     step = export_settings['gltf_frame_step']
 
-    while frame <= end_frame:
-        key = Keyframe(None, frame, channel)
-
-        mat = get_cache_data(
-            'bone',
-            armature_uuid,
-            bone,
-            action_name,
-            frame,
-            step,
-            export_settings)
-
-        trans, rot, scale = mat.decompose()
-
-        key.value = {
-            "location": trans,
-            "rotation_quaternion": rot,
-            "scale": scale
-            }[channel]
+    matrices = get_cache_data(
+        'bone',
+        armature_uuid,
+        bone,
+        action_name,
+        None,
+        step,
+        export_settings).get_range(start_frame, end_frame)
+
+    # Decompose all sampled matrices at once
+    trans, rot, scale = decompose_matrices(matrices)
+    values = {
+        "location": trans,
+        "rotation_quaternion": rot,
+        "scale": scale
+        }[channel]
 
+    keyframes = []
+    for idx, value in enumerate(values.tolist()):
+        key = Keyframe(None, start_frame + idx * step, channel)
+        key.value = value
         keyframes.append(key)
-        frame += step
 
     if len(keyframes) == 0:
         # For example, option CROP negative frames, but all are negatives
@@ -71,7 +69,7 @@ def gather_bone_sampled_keyframes(
             # baked bones
             if export_settings['gltf_optimize_animation_keep_armature'] is False:
                  # Not keeping if not changing property
-                cst = fcurve_is_constant(keyframes)
+                cst = fcurve_is_constant(values)
                 return None if cst is True else keyframes
             else:
                 # Keep data, as requested by user. We keep all samples, as user don't want to optimize
@@ -84,7 +82,7 @@ def gather_bone_sampled_keyframes(
         # In that case, if there is no real keyframe on this channel for this given bone,
         # We can ignore these keyframes
         # if there are some fcurve, we can keep only 2 keyframes, first and last
-        cst = fcurve_is_constant(keyframes)
+        cst = fcurve_is_constant(values)
 
         if node_channel_is_animated is True: # fcurve on this bone for this property
                 # Keep animation, but keep only 2 keyframes if data are not changing
@@ -97,5 +95,5 @@ def gather_bone_sampled_keyframes(
                 # Keep at least 2 keyframes if data are not changing
                 return [keyframes[0], keyframes[-1]] if cst is True and len(keyframes) >= 2 else keyframes
 
-def fcurve_is_constant(keyframes):
-    return all([j < 0.0001 for j in np.ptp([[k.value[i] for i in range(len(keyframes[0].value))] for k in keyframes], axis=0)])
+def fcurve_is_constant(values):
+    return bool(np.all(np.ptp(values, axis=0) < 0.0001))
@@ -15,6 +15,7 @@
 import bpy
 import typing
 import mathutils
+import numpy as np
 from ......io.com import gltf2_io
 from ......io.exp.user_extensions import export_user_extensions
 from ......io.com import constants as gltf2_io_constants
@@ -106,13 +107,13 @@ def __convert_keyframes(armature_uuid, bone_name, channel, keyframes, action_nam
             k.frame += -export_settings['slide'][armature_uuid][action_name]
             k.seconds = k.frame / (bpy.context.scene.render.fps * bpy.context.scene.render.fps_base)
 
-    times = [k.seconds for k in keyframes]
+    times = np.array([k.seconds for k in keyframes], dtype=np.float32)
     input =  gather_accessor(
-        gltf2_io_binary_data.BinaryData.from_list(times, gltf2_io_constants.ComponentType.Float),
+        gltf2_io_binary_data.BinaryData(times.tobytes()),
         gltf2_io_constants.ComponentType.Float,
         len(times),
-        tuple([max(times)]),
-        tuple([min(times)]),
+        tuple([float(times.max())]),
+        tuple([float(times.min())]),
         gltf2_io_constants.DataType.Scalar,
         export_settings)
 
@@ -154,46 +155,21 @@ def __convert_keyframes(armature_uuid, bone_name, channel, keyframes, action_nam
             correction_matrix_local = axis_basis_change
     transform = correction_matrix_local
 
-    values = []
-    fps = (bpy.context.scene.render.fps * bpy.context.scene.render.fps_base)
-    for keyframe in keyframes:
-        # Transform the data and build gltf control points
-        value = gltf2_blender_math.transform(keyframe.value, target_datapath, transform, False)
-        keyframe_value = gltf2_blender_math.mathutils_to_gltf(value)
+    # Transform the data of all keyframes at once and build gltf control points
+    # Sampled keyframes have no tangents
+    values = np.array([k.get_value_list() for k in keyframes], dtype=np.float64)
+    values = gltf2_blender_math.transform_array(values, target_datapath, transform)
+    values = gltf2_blender_math.array_to_gltf(values, target_datapath)
 
-        if keyframe.in_tangent is not None:
-            # we can directly transform the tangent as it currently is represented by a control point
-            in_tangent = gltf2_blender_math.transform(keyframe.in_tangent, target_datapath, transform, False)
-
-            # the tangent in glTF is relative to the keyframe value and uses seconds
-            if not isinstance(value, list):
-                in_tangent = fps * (in_tangent - value)
-            else:
-                in_tangent = [fps * (in_tangent[i] - value[i]) for i in range(len(value))]
-            keyframe_value = gltf2_blender_math.mathutils_to_gltf(in_tangent) + keyframe_value  # append
-
-        if keyframe.out_tangent is not None:
-            # we can directly transform the tangent as it currently is represented by a control point
-            out_tangent = gltf2_blender_math.transform(keyframe.out_tangent, target_datapath, transform, False)
-
-            # the tangent in glTF is relative to the keyframe value and uses seconds
-            if not isinstance(value, list):
-                out_tangent = fps * (out_tangent - value)
-            else:
-                out_tangent = [fps * (out_tangent[i] - value[i]) for i in range(len(value))]
-            keyframe_value = keyframe_value + gltf2_blender_math.mathutils_to_gltf(out_tangent)  # append
-
-        values += keyframe_value
-
-     # store the keyframe data in a binary buffer
+    # store the keyframe data in a binary buffer
     component_type = gltf2_io_constants.ComponentType.Float
-    data_type = gltf2_io_constants.DataType.vec_type_from_num(len(keyframes[0].value))
+    data_type = gltf2_io_constants.DataType.vec_type_from_num(values.shape[1])
 
     output =  gltf2_io.Accessor(
-        buffer_view=gltf2_io_binary_data.BinaryData.from_list(values, component_type),
+        buffer_view=gltf2_io_binary_data.BinaryData(np.ascontiguousarray(values, dtype=np.float32).tobytes()),
         byte_offset=None,
         component_type=component_type,
-        count=len(values) // gltf2_io_constants.DataType.num_elements(data_type),
+        count=len(values),
         extensions=None,
         extras=None,
         max=None,
@@ -15,6 +15,7 @@
 import numpy as np
 from ....tree import VExportNode
 from ....cache import cached
+from .....com.gltf2_blender_math import decompose_matrices
 from ...keyframes import Keyframe
 from ..sampling_cache import get_cache_data
 
@@ -31,32 +32,30 @@ def gather_object_sampled_keyframes(
     start_frame = export_settings['ranges'][obj_uuid][action_name]['start']
     end_frame  = export_settings['ranges'][obj_uuid][action_name]['end']
 
-    keyframes = []
-
-    frame = start_frame
     step = export_settings['gltf_frame_step']
 
-    while frame <= end_frame:
-        key = Keyframe(None, frame, channel)
+    matrices = get_cache_data(
+        'matrix',
+        obj_uuid,
+        None,
+        action_name,
+        None,
+        step,
+        export_settings).get_range(start_frame, end_frame)
 
-        mat = get_cache_data(
-            'matrix',
-            obj_uuid,
-            None,
-            action_name,
-            frame,
-            step,
-            export_settings)
-
-        trans, rot, sca = mat.decompose()
-        key.value_total = {
-            "location": trans,
-            "rotation_quaternion": rot,
-            "scale": sca,
+    # Decompose all sampled matrices at once
+    trans, rot, scale = decompose_matrices(matrices)
+    values = {
+        "location": trans,
+        "rotation_quaternion": rot,
+        "scale": scale
         }[channel]
 
+    keyframes = []
+    for idx, value in enumerate(values.tolist()):
+        key = Keyframe(None, start_frame + idx * step, channel)
+        key.value_total = value
         keyframes.append(key)
-        frame += step
 
     if len(keyframes) == 0:
         # For example, option CROP negative frames, but all are negatives
@@ -70,7 +69,7 @@ def gather_object_sampled_keyframes(
             # baked object
             if export_settings['gltf_optimize_animation_keep_object'] is False:
                  # Not keeping if not changing property
-                cst = fcurve_is_constant(keyframes)
+                cst = fcurve_is_constant(values)
                 return None if cst is True else keyframes
             else:
                 # Keep data, as requested by user. We keep all samples, as user don't want to optimize
@@ -79,7 +78,7 @@ def gather_object_sampled_keyframes(
     else:
 
         # For objects, if all values are the same, we keep only first and last
-        cst = fcurve_is_constant(keyframes)
+        cst = fcurve_is_constant(values)
         if node_channel_is_animated is True:
             return [keyframes[0], keyframes[-1]] if cst is True and len(keyframes) >= 2 else keyframes
         else:
@@ -91,5 +90,5 @@ def gather_object_sampled_keyframes(
                 # Keep at least 2 keyframes if data are not changing
                 return [keyframes[0], keyframes[-1]] if cst is True and len(keyframes) >= 2 else keyframes
 
-def fcurve_is_constant(keyframes):
-    return all([j < 0.0001 for j in np.ptp([[k.value[i] for i in range(len(keyframes[0].value))] for k in keyframes], axis=0)])
+def fcurve_is_constant(values):
+    return bool(np.all(np.ptp(values, axis=0) < 0.0001))
@@ -15,14 +15,17 @@
 import mathutils
 import bpy
 import typing
+import numpy as np
 from .....blender.com.data_path import get_sk_exported
 from .....blender.com.conversion import inverted_trs_mapping_node, texture_transform_blender_to_gltf, yvof_blender_to_gltf
+from .....io.com.debug import profiled
 from ...cache import datacache
 from ...tree import VExportNode
 from ..drivers import get_sk_drivers
 
 # Warning : If you change some parameter here, need to be changed in cache system
 @datacache
+@profiled('get_cache_data', object_name=lambda path, blender_obj_uuid, *args, **kwargs: str(blender_obj_uuid))
 def get_cache_data(path: str,
                       blender_obj_uuid: str,
                       bone: typing.Optional[str],
@@ -68,12 +71,21 @@ def get_cache_data(path: str,
 
     depsgraph = bpy.context.evaluated_depsgraph_get()
 
+    # Objects that have GN instances to cache
+    instancer_uuids = set([export_settings['vtree'].nodes[uid].parent_uuid for uid in obj_uuids if export_settings['vtree'].nodes[uid].blender_type == VExportNode.INSTANCE])
+
+    frames = []
     frame = min_
     while frame <= max_:
+        frames.append(frame)
+        frame += step
+
+    for frame in frames:
         bpy.context.scene.frame_set(int(frame))
         current_instance = {} # For GN instances, we are going to track instances by their order in instance iterator
+        instance_matrices = instance_caching(instancer_uuids, depsgraph, export_settings)
 
-        object_caching(data, obj_uuids, current_instance, action_name, frame, depsgraph, export_settings)
+        object_caching(data, obj_uuids, current_instance, instance_matrices, action_name, frame, frames, depsgraph, export_settings)
 
         # KHR_animation_pointer caching for materials, lights, cameras
         if export_settings['gltf_export_anim_pointer'] is True:
@@ -82,8 +94,6 @@ def get_cache_data(path: str,
             light_nodetree_caching(data, action_name, frame, export_settings)
             camera_caching(data, action_name, frame, export_settings)
 
-        frame += step
-
     # And now, restoring meshes in viewport
     for node, obj in [(n, n.blender_object) for n in export_settings['vtree'].nodes.values() if n.blender_type in
                 [VExportNode.OBJECT, VExportNode.ARMATURE, VExportNode.COLLECTION]]:
@@ -107,6 +117,49 @@ def get_range(obj_uuid, key, export_settings):
     return min_, max_
 
 
+class SampledMatrices:
+    """Matrices of an object or a bone, for each sampled frame.
+
+    Matrices are stored in a (n_frames, 4, 4) float32 array, so keyframes can
+    be computed on the whole range at once. Accessing a single frame returns
+    a Matrix, like other cached data.
+    """
+
+    def __init__(self, frames):
+        self.start = frames[0]
+        self.step = frames[1] - frames[0] if len(frames) > 1 else 1
+        self.matrices = np.tile(np.identity(4, dtype=np.float32), (len(frames), 1, 1))
+
+    def __index(self, frame):
+        position = (frame - self.start) / self.step
+        index = round(position)
+        if abs(position - index) > 1e-4 or not 0 <= index < len(self.matrices):
+            raise KeyError(frame)
+        return index
+
+    def __contains__(self, frame):
+        try:
+            self.__index(frame)
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, frame):
+        return mathutils.Matrix(self.matrices[self.__index(frame)].tolist())
+
+    def __setitem__(self, frame, matrix):
+        self.matrices[self.__index(frame)] = matrix
+
+    def get_range(self, start_frame, end_frame):
+        """Return the (n_frames, 4, 4) array of matrices sampled from start_frame to end_frame."""
+        if end_frame < start_frame:
+            return self.matrices[:0]
+        count = int((end_frame - start_frame) // self.step) + 1
+        first = self.__index(start_frame)
+        self.__index(start_frame + (count - 1) * self.step) # Check that all frames are sampled
+        return self.matrices[first:first + count]
+
+
 def initialize_data_dict(data, key1, key2, key3, key4):
     # No check on key1, this is already done before calling this function
     if key2 not in data[key1].keys():
@@ -320,7 +373,17 @@ def material_nodetree_caching(data, action_name, frame, export_settings):
                     data[key1][key2][key3][path][frame] = list(val)[:export_settings['KHR_animation_pointer']['materials'][mat]['paths'][path]['length']]
 
 
-def armature_caching(data, obj_uuid, blender_obj, action_name, frame, export_settings):
+def initialize_matrices(data, key1, key2, key3, key4, frames):
+    # Same as initialize_data_dict, but matrices are stored for the whole sampled range
+    if key2 not in data[key1].keys():
+        data[key1][key2] = {}
+    if key3 not in data[key1][key2].keys():
+        data[key1][key2][key3] = {}
+    if key4 not in data[key1][key2][key3].keys():
+        data[key1][key2][key3][key4] = SampledMatrices(frames)
+
+
+def armature_caching(data, obj_uuid, blender_obj, action_name, frame, frames, export_settings):
     bones = export_settings['vtree'].get_all_bones(obj_uuid)
     if blender_obj.animation_data and blender_obj.animation_data.action \
             and export_settings['gltf_animation_mode'] in ["ACTIVE_ACTIONS", "ACTIONS", "BROADCAST"]:
@@ -352,11 +415,32 @@ def armature_caching(data, obj_uuid, blender_obj, action_name, frame, export_set
             if export_settings['gltf_armature_object_remove'] is True:
                 matrix = matrix @ blender_obj.matrix_world
 
-        if blender_bone.name not in data[key1][key2][key3].keys():
-            data[key1][key2][key3][blender_bone.name] = {}
+        initialize_matrices(data, key1, key2, key3, blender_bone.name, frames)
         data[key1][key2][key3][blender_bone.name][frame] = matrix
 
-def object_caching(data, obj_uuids, current_instance, action_name, frame, depsgraph, export_settings):
+def instance_caching(instancer_uuids, depsgraph, export_settings):
+    # For GN instances, retrieve matrices of instances of each instancer, in instance iterator order
+    # This is done in a single pass on instance iterator, for all instancers
+    instance_matrices = {}
+    if len(instancer_uuids) == 0:
+        return instance_matrices
+
+    instancers = {}
+    for instancer_uuid in instancer_uuids:
+        eval = export_settings['vtree'].nodes[instancer_uuid].blender_object.evaluated_get(depsgraph)
+        instancers[eval.as_pointer()] = instancer_uuid
+        instance_matrices[instancer_uuid] = []
+
+    for inst in depsgraph.object_instances: # use only as iterator
+        if inst.parent is None:
+            continue
+        instancer_uuid = instancers.get(inst.parent.as_pointer())
+        if instancer_uuid is not None:
+            instance_matrices[instancer_uuid].append(inst.matrix_world.copy())
+
+    return instance_matrices
+
+def object_caching(data, obj_uuids, current_instance, instance_matrices, action_name, frame, frames, depsgraph, export_settings):
     for obj_uuid in obj_uuids:
 
         # Do not cache real collection
@@ -398,15 +482,10 @@ def object_caching(data, obj_uuids, current_instance, action_name, frame, depsgr
             else:
                 mat = parent_mat.inverted_safe()
         else:
-            eval = export_settings['vtree'].nodes[export_settings['vtree'].nodes[obj_uuid].parent_uuid].blender_object.evaluated_get(depsgraph)
-            cpt_inst = 0
-            for inst in depsgraph.object_instances: # use only as iterator
-                if inst.parent == eval:
-                    if current_instance[export_settings['vtree'].nodes[obj_uuid].parent_uuid] == cpt_inst:
-                        mat = inst.matrix_world.copy()
-                        current_instance[export_settings['vtree'].nodes[obj_uuid].parent_uuid] += 1
-                        break
-                    cpt_inst += 1
+            parent_uuid = export_settings['vtree'].nodes[obj_uuid].parent_uuid
+            if current_instance[parent_uuid] < len(instance_matrices[parent_uuid]):
+                mat = instance_matrices[parent_uuid][current_instance[parent_uuid]]
+                current_instance[parent_uuid] += 1
 
 
         if obj_uuid not in data.keys():
@@ -424,19 +503,19 @@ def object_caching(data, obj_uuids, current_instance, action_name, frame, depsgr
                 key1, key2, key3, key4 = obj_uuid, obj_uuid, "matrix", None
         else:
             key1, key2, key3, key4 = obj_uuid, obj_uuid, "matrix", None
-        initialize_data_dict(data, key1, key2, key3, key4)
+        initialize_matrices(data, key1, key2, key3, key4, frames)
         data[key1][key2][key3][key4][frame] = mat
 
         # Store data for all bones, if object is an armature
 
         if blender_obj and blender_obj.type == "ARMATURE":
-            armature_caching(data, obj_uuid, blender_obj, action_name, frame, export_settings)
+            armature_caching(data, obj_uuid, blender_obj, action_name, frame, frames, export_settings)
 
         elif blender_obj is None: # GN instances
             # case of baking object, for GN instances
             # There is no animation, so use uuid of object as key
             key1, key2, key3, key4 = obj_uuid, obj_uuid, "matrix", None
-            initialize_data_dict(data, key1, key2, key3, key4)
+            initialize_matrices(data, key1, key2, key3, key4, frames)
             data[key1][key2][key3][key4][frame] = mat
 
         # Check SK animation here, as we are caching data
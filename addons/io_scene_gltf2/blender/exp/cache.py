@@ -78,6 +78,11 @@ def default_key(*args, **kwargs):
 def cached(func):
     return cached_by_key(key=default_key)(func)
 
+def __get_cached_frame(frames_data, frame):
+    if frame is None:
+        return frames_data
+    return frames_data[frame]
+
 def datacache(func):
 
     def reset_all_cache():
@@ -92,7 +97,7 @@ def datacache(func):
         # 1 : object_uuid
         # 2 : bone (can be, of course, None for path other than 'bone')
         # 3 : action_name
-        # 4 : current_frame
+        # 4 : current_frame (None to get data of all sampled frames)
         # 5 : step
         # 6 : export_settings
         # only_gather_provided : only_gather_provided
@@ -108,7 +113,7 @@ def datacache(func):
             result = func(*args)
             func.__cache = result
             # Here are the key used: result[obj_uuid][action_name][path][bone][frame]
-            return result[cache_key_args[1]][cache_key_args[3]][cache_key_args[0]][cache_key_args[2]][cache_key_args[4]]
+            return __get_cached_frame(result[cache_key_args[1]][cache_key_args[3]][cache_key_args[0]][cache_key_args[2]], cache_key_args[4])
         # object is in cache, but not this action
         # We need to not erase other actions of this object
         elif cache_key_args[3] not in func.__cache[cache_key_args[1]].keys():
@@ -117,11 +122,11 @@ def datacache(func):
             # Need to create all newly retrieved animations
             func.__cache.update(result)
             # Here are the key used: result[obj_uuid][action_name][path][bone][frame]
-            return result[cache_key_args[1]][cache_key_args[3]][cache_key_args[0]][cache_key_args[2]][cache_key_args[4]]
+            return __get_cached_frame(result[cache_key_args[1]][cache_key_args[3]][cache_key_args[0]][cache_key_args[2]], cache_key_args[4])
         # all is already cached
         else:
             # Here are the key used: result[obj_uuid][action_name][path][bone][frame]
-            return func.__cache[cache_key_args[1]][cache_key_args[3]][cache_key_args[0]][cache_key_args[2]][cache_key_args[4]]
+            return __get_cached_frame(func.__cache[cache_key_args[1]][cache_key_args[3]][cache_key_args[0]][cache_key_args[2]], cache_key_args[4])
     return wrapper_objectcache
 
 # TODO: replace "cached" with "unique" in all cases where the caching is functional and not only for performance reasons
@@ -0,0 +1,222 @@
+# Copyright 2018-2021 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import numpy as np
+from ... import get_version_string
+
+
+class DiskCache:
+    """
+    Persistent cache of export results, stored in a local directory, and kept
+    between exports.
+
+    Entries are keyed by a hash of everything used to compute them (see
+    content_hash): when an input changes, the key changes too, so entries
+    never need to be invalidated.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        # Entries loaded or saved during this export: {namespace: {key: label}}
+        self.used = {}
+
+    def __path(self, namespace, key):
+        return os.path.join(self.directory, namespace, key[:2], key)
+
+    def __use(self, namespace, key, label):
+        self.used.setdefault(namespace, {})[key] = label
+
+    def load(self, namespace, key, label=None):
+        """Returns the cached value, or None if there is no (readable) entry."""
+        path = self.__path(namespace, key)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except Exception:
+            # Truncated entry, or entry written by an incompatible version
+            return None
+        self.__use(namespace, key, label)
+        return value
+
+    def remove(self, namespace, key):
+        path = self.__path(namespace, key)
+        if os.path.isfile(path):
+            os.remove(path)
+
+    def save(self, namespace, key, value, label=None):
+        """Stores a value. The cache is best effort: failing to write is not an error."""
+        self.__use(namespace, key, label)
+        path = self.__path(namespace, key)
+        tmp_path = path + '.%d.%d.tmp' % (os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Atomic, so that concurrent exports never read a partial entry
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def manifest_path(disk_cache, output_path):
+    """Manifests are stored in the cache directory, one per exported file, as several exports can share a directory."""
+    name = hashlib.blake2b(os.path.normcase(os.path.abspath(output_path)).encode(), digest_size=20).hexdigest()
+    return os.path.join(disk_cache.directory, 'manifests', name + '.json')
+
+
+def __read_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def update_manifest(disk_cache, output_path, log):
+    """
+    Compares the entries used by this export with the ones of the previous
+    export of the same file (stored in its manifest), logs what changed,
+    removes the entries that no export of the cache directory uses anymore,
+    and writes the new manifest.
+    """
+    path = manifest_path(disk_cache, output_path)
+    previous = __read_manifest(path) if os.path.isfile(path) else {}
+
+    if previous.get('version') == get_version_string():
+        for namespace, entries in disk_cache.used.items():
+            previous_entries = previous.get('entries', {}).get(namespace, {})
+            changed = sorted(str(label) for key, label in entries.items() if key not in previous_entries)
+            log.info('Incremental export: {} {} reused, {} regenerated{}'.format(
+                len(entries) - len(changed), namespace, len(changed), (': ' + ', '.join(changed)) if changed else ''))
+
+        # Entries used by the other exports sharing the cache directory are kept
+        used_elsewhere = {}
+        manifests_directory = os.path.dirname(path)
+        for name in os.listdir(manifests_directory):
+            other_path = os.path.join(manifests_directory, name)
+            if name.endswith('.json') and other_path != path:
+                for namespace, entries in __read_manifest(other_path).get('entries', {}).items():
+                    used_elsewhere.setdefault(namespace, set()).update(entries.keys())
+
+        for namespace, previous_entries in previous.get('entries', {}).items():
+            for key in previous_entries:
+                if key not in disk_cache.used.get(namespace, {}) and key not in used_elsewhere.get(namespace, set()):
+                    disk_cache.remove(namespace, key)
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf8') as f:
+            json.dump({'version': get_version_string(), 'output': os.path.abspath(output_path), 'entries': disk_cache.used}, f, indent=1, sort_keys=True)
+    except OSError as e:
+        log.warning('Incremental export manifest can not be written: {}'.format(e))
+
+
+def content_hash(*parts):
+    """
+    Hash of all parts, and of the addon version. Parts can be numpy arrays,
+    bytes, lists, tuples or dicts of parts, or anything with a stable repr.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(get_version_string().encode())
+    __hash_parts(h, parts)
+    return h.hexdigest()
+
+
+def __hash_parts(h, parts):
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            h.update(repr((part.dtype.str, part.shape)).encode())
+            h.update(np.ascontiguousarray(part).data)
+        elif isinstance(part, (bytes, bytearray, memoryview)):
+            h.update(part)
+        elif isinstance(part, (list, tuple, dict)):
+            # Containers are walked: numpy shortens the repr of large arrays
+            items = list(part.items()) if isinstance(part, dict) else part
+            h.update(repr((type(part).__name__, len(items))).encode())
+            __hash_parts(h, items)
+        else:
+            h.update(repr(part).encode())
+        # Separator, so that parts can't be shifted into each other
+        h.update(b'\0')
+
+
+# foreach_get property, numpy type and number of components, by attribute data type
+__ATTRIBUTE_FOREACH = {
+    'FLOAT': ('value', np.float32, 1),
+    'INT': ('value', np.intc, 1),
+    'INT8': ('value', np.intc, 1),
+    'BOOLEAN': ('value', bool, 1),
+    'FLOAT2': ('vector', np.float32, 2),
+    'INT32_2D': ('value', np.intc, 2),
+    'FLOAT_VECTOR': ('vector', np.float32, 3),
+    'FLOAT_COLOR': ('color', np.float32, 4),
+    'BYTE_COLOR': ('color', np.float32, 4),
+    'QUATERNION': ('value', np.float32, 4),
+    'FLOAT4X4': ('value', np.float32, 16),
+}
+
+
+def mesh_content(blender_mesh):
+    """
+    Returns the list of all data of an (evaluated) mesh that can change the
+    extracted primitives, for use in content_hash.
+    Returns None if the mesh has data that can't be hashed.
+    """
+    content = [len(blender_mesh.vertices), len(blender_mesh.edges), len(blender_mesh.loops), len(blender_mesh.polygons)]
+
+    loop_starts = np.empty(len(blender_mesh.polygons), dtype=np.intc)
+    blender_mesh.polygons.foreach_get('loop_start', loop_starts)
+    content.append(loop_starts)
+
+    for attribute in blender_mesh.attributes:
+        if attribute.data_type not in __ATTRIBUTE_FOREACH.keys():
+            return None
+        prop, dtype, length = __ATTRIBUTE_FOREACH[attribute.data_type]
+        data = np.empty(len(attribute.data) * length, dtype=dtype)
+        attribute.data.foreach_get(prop, data)
+        content.extend([attribute.name, attribute.domain, attribute.data_type, data])
+
+    # Custom normals are not stored as a generic attribute
+    normals = np.empty(len(blender_mesh.loops) * 3, dtype=np.float32)
+    blender_mesh.corner_normals.foreach_get('vector', normals)
+    content.append(normals)
+
+    # Tangents are computed on the active UVMap, materials can use the active
+    # render one, and vertex colors can be the active or render color attribute
+    uv_layers = blender_mesh.uv_layers
+    content.append([(uv_layer.name, uv_layer.active, uv_layer.active_render) for uv_layer in uv_layers])
+    content.append(uv_layers.active.name if uv_layers.active else None)
+    color_attributes = blender_mesh.color_attributes
+    content.extend([color_attributes.active_color_index, color_attributes.render_color_index])
+    content.extend([
+        color_attributes[idx].name if idx != -1 else None
+        for idx in (color_attributes.active_color_index, color_attributes.render_color_index)
+    ])
+
+    content.append(blender_mesh.users != 0)
+    if blender_mesh.shape_keys:
+        for key_block in blender_mesh.shape_keys.key_blocks:
+            co = np.empty(len(key_block.points) * 3, dtype=np.float32)
+            key_block.points.foreach_get('co', co)
+            content.extend([key_block.name, key_block.mute, key_block.relative_key.name, co])
+
+    return content
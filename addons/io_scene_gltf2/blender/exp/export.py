@@ -19,6 +19,7 @@ import time
 import bpy
 import sys
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 from ...io.exp import export as gltf2_io_export
 from ...io.exp import draco as gltf2_io_draco_compression_extension
@@ -26,6 +27,7 @@ from ...io.exp.user_extensions import export_user_extensions
 from ..com import json_util
 from . import gather as gltf2_blender_gather
 from .exporter import GlTF2Exporter
+from .disk_cache import update_manifest
 
 
 def save(context, export_settings):
@@ -44,7 +46,15 @@ def save(context, export_settings):
     for callback in pre_export_callbacks:
         callback(export_settings)
 
-    json, buffer = __export(export_settings)
+    # Images are encoded and written by worker threads, while the export goes on
+    image_threads = export_settings['gltf_image_threads'] or os.cpu_count() or 1
+    export_settings['image_executor'] = ThreadPoolExecutor(max_workers=image_threads) if image_threads > 1 else None
+    try:
+        json, buffer = __export(export_settings)
+    finally:
+        if export_settings['image_executor'] is not None:
+            export_settings['image_executor'].shutdown()
+        export_settings['image_executor'] = None
 
     post_export_callbacks = export_settings["post_export_callbacks"]
     for callback in post_export_callbacks:
@@ -54,6 +64,12 @@ def save(context, export_settings):
     end_time = time.time()
     __notify_end(context, end_time - start_time, export_settings)
 
+    if export_settings['profiler'] is not None:
+        __write_profile_report(export_settings)
+
+    if export_settings['gltf_incremental']:
+        __write_incremental_manifest(export_settings)
+
     if not export_settings['gltf_current_frame']:
         bpy.context.scene.frame_set(int(original_frame))
 
@@ -69,14 +85,17 @@ def __export(export_settings):
     export_user_extensions('gather_gltf_extensions_hook', export_settings, exporter.glTF)
     exporter.traverse_extensions()
 
+    json = exporter.glTF.to_dict()
+
     # Detect extensions that are animated
     # If they are not animated, we can remove the extension if it is empty (all default values), and if default values don't change the shader
     # But if they are animated, we need to keep the extension, even if it is empty
-    __detect_animated_extensions(exporter.glTF.to_dict(), export_settings)
+    __detect_animated_extensions(json, export_settings)
 
     # now that addons possibly add some fields in json, we can fix if needed
     # Also deleting no more needed extensions, based on what we detected above
-    json = __fix_json(exporter.glTF.to_dict(), export_settings)
+    # This is done in place, in a single pass over the whole json
+    json = __fix_json(json, export_settings)
 
     # IOR is a special case where we need to export only if some other extensions are used
     __check_ior(json, export_settings)
@@ -84,13 +103,10 @@ def __export(export_settings):
     # Volum is a special case where we need to export only if transmission is used
     __check_volume(json, export_settings)
 
-    __manage_extension_declaration(json, export_settings)
-
+    # Material "extensions" dicts can now be empty (because we removed some extensions)
+    __remove_empty_material_extensions(json)
 
-    # We need to run it again, as we can now have some "extensions" dict that are empty
-    # Or extensionsUsed / extensionsRequired that are empty
-    # (because we removed some extensions)
-    json = __fix_json(json, export_settings)
+    __manage_extension_declaration(json, export_settings)
 
     # Convert additional data if needed
     if export_settings['gltf_unused_textures'] is True:
@@ -138,7 +154,7 @@ def __check_ior(json, export_settings):
         ior_found = True
         break
     if not ior_found:
-        export_settings['gltf_need_to_keep_extension_declaration'] = [e for e in export_settings['gltf_need_to_keep_extension_declaration'] if e != 'KHR_materials_ior']
+        export_settings['gltf_need_to_keep_extension_declaration'].discard('KHR_materials_ior')
 
 def __check_volume(json, export_settings):
     if 'materials' not in json.keys():
@@ -163,12 +179,18 @@ def __check_volume(json, export_settings):
         volume_found = True
         break
     if not volume_found:
-        export_settings['gltf_need_to_keep_extension_declaration'] = [e for e in export_settings['gltf_need_to_keep_extension_declaration'] if e != 'KHR_materials_volume']
+        export_settings['gltf_need_to_keep_extension_declaration'].discard('KHR_materials_volume')
+
+
+def __remove_empty_material_extensions(json):
+    for mat in json.get('materials', []):
+        if 'extensions' in mat.keys() and len(mat['extensions']) == 0:
+            del mat['extensions']
 
 
 def __detect_animated_extensions(obj, export_settings):
     export_settings['gltf_animated_extensions'] = []
-    export_settings['gltf_need_to_keep_extension_declaration'] = []
+    export_settings['gltf_need_to_keep_extension_declaration'] = set()
     if not 'animations' in obj.keys():
         return
     for anim in obj['animations']:
@@ -187,20 +209,14 @@ def __detect_animated_extensions(obj, export_settings):
                     export_settings['gltf_animated_extensions'].append(tab[-1])
 
 def __manage_extension_declaration(json, export_settings):
-    if 'extensionsUsed' in json.keys():
-        new_ext_used = []
-        for ext in json['extensionsUsed']:
-            if ext not in export_settings['gltf_need_to_keep_extension_declaration']:
-                continue
-            new_ext_used.append(ext)
-        json['extensionsUsed'] = new_ext_used
-    if 'extensionsRequired' in json.keys():
-        new_ext_required = []
-        for ext in json['extensionsRequired']:
-            if ext not in export_settings['gltf_need_to_keep_extension_declaration']:
-                continue
-            new_ext_required.append(ext)
-        json['extensionsRequired'] = new_ext_required
+    for key in ['extensionsUsed', 'extensionsRequired']:
+        if key not in json.keys():
+            continue
+        new_ext = [ext for ext in json[key] if ext in export_settings['gltf_need_to_keep_extension_declaration']]
+        if new_ext:
+            json[key] = new_ext
+        else:
+            del json[key]
 
 def __gather_gltf(exporter, export_settings):
     active_scene_idx, scenes, animations = gltf2_blender_gather.gather_gltf2(export_settings)
@@ -303,25 +319,25 @@ def __postprocess_with_gltfpack(export_settings):
 
 def __fix_json(obj, export_settings):
     # TODO: move to custom JSON encoder
-    fixed = obj
+    # Fixed in place, children first, so that collections emptied by the fix are removed too
     if isinstance(obj, dict):
-        fixed = {}
-        for key, value in obj.items():
+        for key in list(obj.keys()):
+            value = obj[key]
             if key == 'extras' and value is not None:
-                fixed[key] = value
                 continue
-            if not __should_include_json_value(key, value, export_settings):
-                continue
-            fixed[key] = __fix_json(value, export_settings)
+            value = __fix_json(value, export_settings)
+            if __should_include_json_value(key, value, export_settings):
+                obj[key] = value
+            else:
+                del obj[key]
     elif isinstance(obj, list):
-        fixed = []
-        for value in obj:
-            fixed.append(__fix_json(value, export_settings))
+        for idx, value in enumerate(obj):
+            obj[idx] = __fix_json(value, export_settings)
     elif isinstance(obj, float):
         # force floats to int, if they are integers (prevent INTEGER_WRITTEN_AS_FLOAT validator warnings)
         if int(obj) == obj:
             return int(obj)
-    return fixed
+    return obj
 
 
 def __should_include_json_value(key, value, export_settings):
@@ -349,7 +365,7 @@ def __should_include_json_value(key, value, export_settings):
         if key in allowed_empty_collections_if_animated:
             if key in export_settings['gltf_animated_extensions']:
                 # There is an animation, so we can keep this empty collection, and store that this extension declaration needs to be kept
-                export_settings['gltf_need_to_keep_extension_declaration'].append(key)
+                export_settings['gltf_need_to_keep_extension_declaration'].add(key)
                 return True
             else:
                 # There is no animation, so we will not keep this empty collection
@@ -359,10 +375,10 @@ def __should_include_json_value(key, value, export_settings):
     elif not __is_empty_collection(value):
         # If extensions is not empty, export it, always
         # This can be an official extension, or a user extension
-        export_settings['gltf_need_to_keep_extension_declaration'].append(key)
+        export_settings['gltf_need_to_keep_extension_declaration'].add(key)
     elif __is_empty_collection(value) and key in allowed_empty_collections:
         # We can have this empty collection for this extension. So keeping it, and store that this extension declaration needs to be kept
-        export_settings['gltf_need_to_keep_extension_declaration'].append(key)
+        export_settings['gltf_need_to_keep_extension_declaration'].add(key)
     return True
 
 
@@ -372,11 +388,20 @@ def __is_empty_collection(value):
 
 def __write_file(json, buffer, export_settings):
     try:
-        gltf2_io_export.save_gltf(
-            json,
-            export_settings,
-            json_util.BlenderJSONEncoder,
-            buffer)
+        if export_settings['profiler'] is not None:
+            with export_settings['profiler'].stage('save_gltf') as stage:
+                gltf2_io_export.save_gltf(
+                    json,
+                    export_settings,
+                    json_util.BlenderJSONEncoder,
+                    buffer)
+                stage['bytes'] = os.path.getsize(export_settings['gltf_filepath'])
+        else:
+            gltf2_io_export.save_gltf(
+                json,
+                export_settings,
+                json_util.BlenderJSONEncoder,
+                buffer)
         if (export_settings['gltf_use_gltfpack'] == True):
             __postprocess_with_gltfpack(export_settings)
 
@@ -391,6 +416,19 @@ def __write_file(json, buffer, export_settings):
         raise e
 
 
+def __write_profile_report(export_settings):
+    report_path = os.path.splitext(export_settings['gltf_filepath'])[0] + '.profile.json'
+    try:
+        export_settings['profiler'].save(report_path)
+        export_settings['log'].info('Profiling report written to {}'.format(report_path))
+    except OSError as e:
+        export_settings['log'].warning('Profiling report can not be written: {}'.format(e))
+
+
+def __write_incremental_manifest(export_settings):
+    update_manifest(export_settings['disk_cache'], export_settings['gltf_filepath'], export_settings['log'])
+
+
 def __notify_start(context, export_settings):
     export_settings['log'].info('Starting glTF 2.0 export')
     context.window.cursor_set('WAIT')
@@ -97,6 +97,9 @@ class GlTF2Exporter:
             gltf2_io.Texture: self.__gltf.textures
         }
 
+        # index of objects already stored in each child of root list, by identity
+        self.__childOfRootIndexLookup = {}
+
         self.__propertyTypeLookup = [
             gltf2_io.AccessorSparseIndices,
             gltf2_io.AccessorSparse,
@@ -132,7 +135,7 @@ class GlTF2Exporter:
                 uri = None
             elif output_path and buffer_name:
                 with open(output_path + uri_to_path(buffer_name), 'wb') as f:
-                    f.write(self.__buffer.to_bytes())
+                    self.__buffer.write_to(f)
                 uri = buffer_name
             else:
                 uri = self.__buffer.to_embed_string()
@@ -149,7 +152,8 @@ class GlTF2Exporter:
         self.__finalized = True
 
         if is_glb:
-            return self.__buffer.to_bytes()
+            # The buffer is streamed to the .glb file by save_gltf, without being read back in memory
+            return self.__buffer
 
     def add_draco_extension(self):
         """
@@ -169,10 +173,18 @@ class GlTF2Exporter:
         if self.__images:
             os.makedirs(output_path, exist_ok=True)
 
-        for name, image in self.__images.items():
-            dst_path = output_path + "/" + name
-            with open(dst_path, 'wb') as f:
-                f.write(image.data)
+        def write_image(name, image):
+            image.write_to_file(output_path + "/" + name)
+
+        # Images still being encoded are written as soon as they are ready
+        executor = self.export_settings.get('image_executor')
+        if executor is not None:
+            writes = [executor.submit(write_image, name, image) for name, image in self.__images.items()]
+            for write in writes:
+                write.result()
+        else:
+            for name, image in self.__images.items():
+                write_image(name, image)
 
 
     def manage_gpu_instancing(self, node, also_mesh=False):
@@ -418,7 +430,42 @@ class GlTF2Exporter:
             # The object is not of a child of root --> don't convert to reference
             return property
 
-        return self.__append_unique_and_get_index(gltf_list, property)
+        return self.__append_unique_and_get_index_by_identity(gltf_list, property)
+
+    def __append_unique_and_get_index_by_identity(self, target: list, obj):
+        """
+        Same as __append_unique_and_get_index, for child of root lists, without scanning the list.
+
+        glTF properties don't define equality, so a property is already stored only if this very object is in the list.
+        """
+        lookup = self.__get_identity_lookup(target)
+        idx = lookup['index'].get(id(obj))
+        if idx is not None and target[idx] is not obj:
+            # The list was modified outside of the traversal
+            lookup = self.__get_identity_lookup(target, rebuild=True)
+            idx = lookup['index'].get(id(obj))
+
+        if idx is not None:
+            return idx
+
+        idx = len(target)
+        target.append(obj)
+        lookup['index'][id(obj)] = idx
+        lookup['length'] = len(target)
+        return idx
+
+    def __get_identity_lookup(self, target: list, rebuild=False):
+        lookup = self.__childOfRootIndexLookup.get(id(target))
+        # Keep a reference to the list, so its id can't be reused by another list.
+        # The list length is tracked apart from the index size, as the same object can be in the list several times
+        if rebuild or lookup is None or lookup['list'] is not target or lookup['length'] != len(target):
+            lookup = {
+                'list': target,
+                'index': {id(o): i for i, o in reversed(list(enumerate(target)))},
+                'length': len(target),
+            }
+            self.__childOfRootIndexLookup[id(target)] = lookup
+        return lookup
 
     @staticmethod
     def __append_unique_and_get_index(target: list, obj):
@@ -15,6 +15,7 @@
 import bpy
 
 from ...io.com import gltf2_io
+from ...io.com.debug import profiled
 from ...io.exp.user_extensions import export_user_extensions
 from ..com.extras import generate_extras
 from .cache import cached
@@ -25,6 +26,7 @@ from .animation.sampled.object.keyframes import get_cache_data
 from .animation.animations import gather_animations
 
 
+@profiled('gather_gltf2')
 def gather_gltf2(export_settings):
     """
     Gather glTF properties from the current state of blender.
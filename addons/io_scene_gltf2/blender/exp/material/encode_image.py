@@ -18,6 +18,11 @@ from typing import Optional, Tuple
 import numpy as np
 import tempfile
 import enum
+from concurrent.futures import Future
+from ....io.com.debug import profiled
+from ....io.exp.png import encode_png
+from ....io.exp.binary_data import SourceFile
+from ..disk_cache import content_hash
 
 
 class Channel(enum.IntEnum):
@@ -196,7 +201,20 @@ class ExportImage:
             all(fill.tile == self.fills[list(self.fills.keys())[0]].tile for fill in self.fills.values())
         )
 
+    def __profiled_name(self):
+        return ", ".join(sorted(set(fill.image.name for fill in self.fills.values() if getattr(fill, 'image', None) is not None)))
+
+    @profiled(
+        'ExportImage.encode',
+        object_name=lambda self, *args, **kwargs: self.__profiled_name(),
+        produced_bytes=lambda result: len(result[0]) if isinstance(result[0], bytes) else getattr(result[0], 'byte_length', 0))
     def encode(self, mime_type: Optional[str], export_settings) -> Tuple[bytes, bool]:
+        """
+        Returns the encoded image, and its factor.
+        The encoded image is a Future when it is encoded in a worker thread
+        (see __encode_from_numpy_array), and a SourceFile when an existing
+        file is exported as is.
+        """
         self.file_format = {
             "image/jpeg": "JPEG",
             "image/png": "PNG",
@@ -216,14 +234,119 @@ class ExportImage:
 
         # Unhappy path = we need to create the image self.fills describes or self.stores describes
         if self.numpy_calc is None:
-            if self.__unhappy_is_udim():
-                return self.__encode_unhappy_udim(export_settings), None
-            else:
-                return self.__encode_unhappy(export_settings), None
+            # The same channels of the same images may be packed for several
+            # materials: look for the result before doing any pixel work
+            quality = export_settings['gltf_image_quality'] if self.file_format in ["JPEG", "WEBP"] else None
+            recipe = (self.__fill_recipe(), self.file_format, quality)
+            data = export_settings['encoded_images'].get(recipe)
+            if data is not None:
+                self.__mark_partially_used(export_settings)
+                return data, None
+
+            disk_cache = export_settings['disk_cache']
+            cache_key = self.__disk_cache_key(export_settings) if disk_cache is not None else None
+            if cache_key is not None:
+                data = disk_cache.load('images', cache_key, self.__profiled_name())
+                if data is not None:
+                    self.__mark_partially_used(export_settings)
+
+            if data is None:
+                # Already cached by recipe: not by pixels too
+                pixel_cache = cache_key is None
+                if self.__unhappy_is_udim():
+                    data = self.__encode_unhappy_udim(export_settings, pixel_cache)
+                else:
+                    data = self.__encode_unhappy(export_settings, pixel_cache)
+
+                if cache_key is not None:
+                    self.__save_to_disk_cache(data, cache_key, export_settings)
+
+            export_settings['encoded_images'][recipe] = data
+            return data, None
         else:
             pixels, width, height, factor = self.numpy_calc(self.stored, export_settings)
             return self.__encode_from_numpy_array(pixels, (width, height), export_settings), factor
 
+    def __fill_recipe(self):
+        """Hashable description of how the channels are filled, in this export."""
+        recipe = []
+        for dst_chan, fill in sorted(self.fills.items()):
+            if isinstance(fill, FillImage):
+                recipe.append((dst_chan, 'IMAGE', fill.image, fill.src_chan))
+            elif isinstance(fill, FillImageTile):
+                recipe.append((dst_chan, 'IMAGE', fill.image, fill.src_chan, fill.tile))
+            elif isinstance(fill, FillImageRGB2BW):
+                recipe.append((dst_chan, 'RGB2BW', fill.image))
+            elif isinstance(fill, FillImageRGB2BWTile):
+                recipe.append((dst_chan, 'RGB2BW', fill.image, fill.tile))
+            elif isinstance(fill, FillWith):
+                recipe.append((dst_chan, 'VALUE', fill.value))
+            else:
+                recipe.append((dst_chan, 'WHITE'))
+        return tuple(recipe)
+
+    def __disk_cache_key(self, export_settings):
+        """
+        Same as the fill recipe, but with the content of the source images
+        instead of the images, so that it is still valid in the next exports.
+        Returns None if a source image can't be hashed.
+        """
+        recipe = []
+        for dst_chan, kind, *args in self.__fill_recipe():
+            if kind in ['IMAGE', 'RGB2BW']:
+                image = args[0]
+                tile = args[-1] if isinstance(self.fills[dst_chan], (FillImageTile, FillImageRGB2BWTile)) else None
+                source_hash = self.__source_hash(image, tile, export_settings)
+                if source_hash is None:
+                    return None
+                args = [source_hash, image.colorspace_settings.name, image.alpha_mode, tuple(image.size)] + [
+                    int(arg) if isinstance(arg, Channel) else arg for arg in args[1:]]
+            recipe.append((int(dst_chan), kind, *args))
+
+        quality = export_settings['gltf_image_quality'] if self.file_format in ["JPEG", "WEBP"] else None
+        return content_hash('recipe', recipe, self.file_format, quality)
+
+    def __source_hash(self, image: bpy.types.Image, tile, export_settings):
+        # Hash of the file of the image if it is unchanged, else of its pixels
+        key = (image, tile)
+        hashes = export_settings['image_source_hashes']
+        if key in hashes:
+            return hashes[key]
+
+        source_hash = None
+        if tile is not None:
+            src_path = bpy.path.abspath(image.filepath_raw).replace("<UDIM>", tile)
+            if os.path.isfile(src_path):
+                source_hash = content_hash(SourceFile(src_path).digest())
+        elif image.source == 'FILE' and not image.is_dirty and image.packed_file is not None:
+            source_hash = content_hash(image.packed_file.data)
+        elif image.source == 'FILE' and not image.is_dirty and os.path.isfile(bpy.path.abspath(image.filepath_raw)):
+            # Hashed chunk by chunk, without reading the file in memory
+            source_hash = content_hash(SourceFile(bpy.path.abspath(image.filepath_raw)).digest())
+        elif image.source in ['FILE', 'GENERATED']:
+            pixels = np.empty(image.size[0] * image.size[1] * 4, np.float32)
+            image.pixels.foreach_get(pixels)
+            source_hash = content_hash(pixels)
+
+        hashes[key] = source_hash
+        return source_hash
+
+    def __save_to_disk_cache(self, data, cache_key, export_settings):
+        disk_cache = export_settings['disk_cache']
+        label = self.__profiled_name()
+        if isinstance(data, Future):
+            # Saved by the worker thread, once encoded
+            data.add_done_callback(
+                lambda future: disk_cache.save('images', cache_key, future.result(), label)
+                if future.exception() is None else None)
+        else:
+            disk_cache.save('images', cache_key, data, label)
+
+    def __mark_partially_used(self, export_settings):
+        for fill in self.fills.values():
+            if isinstance(fill, (FillImage, FillImageRGB2BW, FillImageTile, FillImageRGB2BWTile)):
+                export_settings['exported_images'][fill.image.name] = 2 # 2 = partially used
+
     def __encode_happy(self, export_settings) -> bytes:
         return self.__encode_from_image(self.blender_image(export_settings), export_settings)
 
@@ -234,7 +357,7 @@ class ExportImage:
         return any(isinstance(fill, FillImageTile) or isinstance(fill, FillImageRGB2BWTile) for fill in self.fills.values())
 
 
-    def __encode_unhappy_udim(self, export_settings) -> bytes:
+    def __encode_unhappy_udim(self, export_settings, pixel_cache=True) -> bytes:
         # We need to assemble the image out of channels.
         # Do it with numpy and image.pixels of the right UDIM tile.
 
@@ -248,7 +371,7 @@ class ExportImage:
         if not images:
             # No ImageFills; use a 1x1 white pixel
             pixels = np.array([1.0, 1.0, 1.0, 1.0], np.float32)
-            return self.__encode_from_numpy_array(pixels, (1, 1), export_settings)
+            return self.__encode_from_numpy_array(pixels, (1, 1), export_settings, pixel_cache)
 
         # We need to open the original UDIM image tile to get size & pixel data
         original_image_sizes = []
@@ -263,45 +386,33 @@ class ExportImage:
         width = max(image_size[0] for image_size in original_image_sizes)
         height = max(image_size[1] for image_size in original_image_sizes)
 
-        out_buf = np.ones(width * height * 4, np.float32)
-        tmp_buf = np.empty(width * height * 4, np.float32)
-
-        for idx, (image, tile) in enumerate(images):
-            if original_image_sizes[idx][0] == width and original_image_sizes[idx][1] == height:
-                src_path = bpy.path.abspath(image.filepath_raw).replace("<UDIM>", tile)
-                with TmpImageGuard() as guard:
-                    guard.image = bpy.data.images.load(
-                        src_path,
-                    )
-                    guard.image.pixels.foreach_get(tmp_buf)
-            else:
-                # Image is the wrong size; make a temp copy and scale it.
-                src_path = bpy.path.abspath(image.filepath_raw).replace("<UDIM>", tile)
-                with TmpImageGuard() as guard:
-                    guard.image = bpy.data.images.load(
-                        src_path,
-                    )
-                    tmp_image = guard.image
-                    tmp_image.scale(width, height)
-                    tmp_image.pixels.foreach_get(tmp_buf)
+        out_buf = np.full((height, width, 4), 255, np.uint8)
+
+        for image, tile in images:
+            src_path = bpy.path.abspath(image.filepath_raw).replace("<UDIM>", tile)
+            with TmpImageGuard() as guard:
+                guard.image = bpy.data.images.load(
+                    src_path,
+                )
+                tmp_buf = read_pixels(guard.image, width, height)
 
             # Copy any channels for this image to the output
             for dst_chan, fill in self.fills.items():
                 if isinstance(fill, FillImageTile) and fill.image == image:
-                    out_buf[int(dst_chan)::4] = tmp_buf[int(fill.src_chan)::4]
+                    out_buf[:, :, dst_chan] = float_to_byte(tmp_buf[:, :, fill.src_chan])
                 elif isinstance(fill, FillWith):
-                    out_buf[int(dst_chan)::4] = fill.value
+                    out_buf[:, :, dst_chan] = float_to_byte(fill.value)
                 elif isinstance(fill, FillImageRGB2BWTile) and fill.image == image:
-                    out_buf[int(dst_chan)::4] = tmp_buf[0::4] * 0.2989 + tmp_buf[1::4] * 0.5870 + tmp_buf[2::4] * 0.1140
+                    out_buf[:, :, dst_chan] = float_to_byte(rgb2bw(tmp_buf))
 
         tmp_buf = None  # GC this
 
-        return self.__encode_from_numpy_array(out_buf, (width, height), export_settings)
+        return self.__encode_from_numpy_array(out_buf, (width, height), export_settings, pixel_cache)
 
 
 
 
-    def __encode_unhappy(self, export_settings) -> bytes:
+    def __encode_unhappy(self, export_settings, pixel_cache=True) -> bytes:
         # We need to assemble the image out of channels.
         # Do it with numpy and image.pixels.
 
@@ -316,76 +427,96 @@ class ExportImage:
         if not images:
             # No ImageFills; use a 1x1 white pixel
             pixels = np.array([1.0, 1.0, 1.0, 1.0], np.float32)
-            return self.__encode_from_numpy_array(pixels, (1, 1), export_settings)
+            return self.__encode_from_numpy_array(pixels, (1, 1), export_settings, pixel_cache)
 
         width = max(image.size[0] for image in images)
         height = max(image.size[1] for image in images)
 
-        out_buf = np.ones(width * height * 4, np.float32)
-        tmp_buf = np.empty(width * height * 4, np.float32)
+        # Channels are packed as bytes, the way they are encoded
+        out_buf = np.full((height, width, 4), 255, np.uint8)
 
         for image in images:
-            if image.size[0] == width and image.size[1] == height:
-                image.pixels.foreach_get(tmp_buf)
-            else:
-                # Image is the wrong size; make a temp copy and scale it.
-                with TmpImageGuard() as guard:
-                    make_temp_image_copy(guard, src_image=image)
-                    tmp_image = guard.image
-                    tmp_image.scale(width, height)
-                    tmp_image.pixels.foreach_get(tmp_buf)
+            tmp_buf = read_pixels(image, width, height)
 
             # Copy any channels for this image to the output
             for dst_chan, fill in self.fills.items():
                 if isinstance(fill, FillImage) and fill.image == image:
-                    out_buf[int(dst_chan)::4] = tmp_buf[int(fill.src_chan)::4]
+                    out_buf[:, :, dst_chan] = float_to_byte(tmp_buf[:, :, fill.src_chan])
                 elif isinstance(fill, FillWith):
-                    out_buf[int(dst_chan)::4] = fill.value
+                    out_buf[:, :, dst_chan] = float_to_byte(fill.value)
                 elif isinstance(fill, FillImageRGB2BW) and fill.image == image:
-                    out_buf[int(dst_chan)::4] = tmp_buf[0::4] * 0.2989 + tmp_buf[1::4] * 0.5870 + tmp_buf[2::4] * 0.1140
+                    out_buf[:, :, dst_chan] = float_to_byte(rgb2bw(tmp_buf))
 
         tmp_buf = None  # GC this
 
-        return self.__encode_from_numpy_array(out_buf, (width, height), export_settings)
-
-    def __encode_from_numpy_array(self, pixels: np.ndarray, dim: Tuple[int, int], export_settings) -> bytes:
-        with TmpImageGuard() as guard:
-            guard.image = bpy.data.images.new(
-                "##gltf-export:tmp-image##",
-                width=dim[0],
-                height=dim[1],
-                alpha=Channel.A in self.fills,
+        return self.__encode_from_numpy_array(out_buf, (width, height), export_settings, pixel_cache)
+
+    def __encode_from_numpy_array(self, pixels: np.ndarray, dim: Tuple[int, int], export_settings, pixel_cache=True):
+        # Pixels are extracted from Blender on the main thread, but PNG encoding
+        # doesn't need Blender: it is done by a worker, while the export goes on
+        # Workers never read Blender data: everything they need is computed here
+        alpha = Channel.A in self.fills
+        label = self.__profiled_name()
+        executor = export_settings.get('image_executor')
+        if executor is not None and self.file_format == "PNG":
+            return executor.submit(self.__encode_pixels, pixels, dim, alpha, self.file_format, label, pixel_cache, export_settings)
+        return self.__encode_pixels(pixels, dim, alpha, self.file_format, label, pixel_cache, export_settings)
+
+    def __encode_pixels(self, pixels: np.ndarray, dim: Tuple[int, int], alpha: bool, file_format: str, label: str, pixel_cache: bool, export_settings) -> bytes:
+        # pixels are float (0-1) or bytes, in Blender order (bottom row first)
+        if pixels.dtype != np.uint8:
+            pixels = float_to_byte(pixels)
+        pixels = pixels.reshape(dim[1], dim[0], 4)
+
+        # Encoding is slow: look for the same pixels in the disk cache first
+        disk_cache = export_settings['disk_cache'] if pixel_cache else None
+        cache_key = None
+        if disk_cache is not None:
+            cache_key = content_hash(
+                pixels, dim, alpha, file_format,
+                export_settings['gltf_image_quality'] if file_format in ["JPEG", "WEBP"] else None
             )
-            tmp_image = guard.image
+            data = disk_cache.load('images', cache_key, label)
+            if data is not None:
+                return data
+
+        if file_format == "PNG":
+            # Encoded in memory, top row first
+            channels = 4 if alpha else 3
+            data = encode_png(pixels[::-1, :, :channels])
+        else:
+            # Other formats are encoded by Blender
+            with TmpImageGuard() as guard:
+                guard.image = bpy.data.images.new(
+                    "##gltf-export:tmp-image##",
+                    width=dim[0],
+                    height=dim[1],
+                    alpha=alpha,
+                )
+                tmp_image = guard.image
 
-            tmp_image.pixels.foreach_set(pixels)
+                tmp_image.pixels.foreach_set((pixels.reshape(-1) / np.float32(255)).astype(np.float32, copy=False))
 
-            return _encode_temp_image(tmp_image, self.file_format, export_settings)
+                data = _encode_temp_image(tmp_image, file_format, export_settings)
+
+        if cache_key is not None:
+            disk_cache.save('images', cache_key, data, label)
+
+        return data
 
-    def __encode_from_image(self, image: bpy.types.Image, export_settings) -> bytes:
+    def __encode_from_image(self, image: bpy.types.Image, export_settings):
         # See if there is an existing file we can use.
-        data = None
         # Sequence image can't be exported, but it avoid to crash to check that default image exists
         # Else, it can crash when trying to access a non existing image
         if image.source in ['FILE', 'SEQUENCE'] and not image.is_dirty:
             if image.packed_file is not None:
                 data = image.packed_file.data
+                if self.__has_file_format_magic(data):
+                    return data
             else:
                 src_path = bpy.path.abspath(image.filepath_raw)
-                if os.path.isfile(src_path):
-                    with open(src_path, 'rb') as f:
-                        data = f.read()
-        # Check magic number is right
-        if data:
-            if self.file_format == 'PNG':
-                if data.startswith(b'\x89PNG'):
-                    return data
-            elif self.file_format == 'JPEG':
-                if data.startswith(b'\xff\xd8\xff'):
-                    return data
-            elif self.file_format == 'WEBP':
-                if data[8:12] == b'WEBP':
-                    return data
+                if self.__is_file_of_file_format(src_path):
+                    return SourceFile(src_path)
 
         # Copy to a temp image and save.
         with TmpImageGuard() as guard:
@@ -396,23 +527,30 @@ class ExportImage:
     def __encode_from_image_tile(self, udim_image, tile, export_settings):
         src_path = bpy.path.abspath(udim_image.filepath_raw).replace("<UDIM>", tile)
 
-        if os.path.isfile(src_path):
-            with open(src_path, 'rb') as f:
-                data = f.read()
-
-        if data:
-            if self.file_format == 'PNG':
-                if data.startswith(b'\x89PNG'):
-                    return data
-            elif self.file_format == 'JPEG':
-                if data.startswith(b'\xff\xd8\xff'):
-                    return data
-            elif self.file_format == 'WEBP':
-                if data[8:12] == b'WEBP':
-                    return data
+        if self.__is_file_of_file_format(src_path):
+            return SourceFile(src_path)
 
         # We don't manage UDIM packed image, so this could not happen to be here
 
+    def __is_file_of_file_format(self, path) -> bool:
+        # Only the header is read: the file is exported as is, without being read in memory
+        if not os.path.isfile(path):
+            return False
+        with open(path, 'rb') as f:
+            return self.__has_file_format_magic(f.read(12))
+
+    def __has_file_format_magic(self, data) -> bool:
+        # Check magic number is right
+        if not data:
+            return False
+        if self.file_format == 'PNG':
+            return data.startswith(b'\x89PNG')
+        elif self.file_format == 'JPEG':
+            return data.startswith(b'\xff\xd8\xff')
+        elif self.file_format == 'WEBP':
+            return data[8:12] == b'WEBP'
+        return False
+
 def _encode_temp_image(tmp_image: bpy.types.Image, file_format: str, export_settings) -> bytes:
     with tempfile.TemporaryDirectory() as tmpdirname:
         tmpfilename = tmpdirname + '/img'
@@ -430,6 +568,45 @@ def _encode_temp_image(tmp_image: bpy.types.Image, file_format: str, export_sett
             return f.read()
 
 
+def float_to_byte(values):
+    """Converts float (0-1) pixel values to bytes, rounded like Blender does."""
+    return np.clip(np.multiply(values, 255, dtype=np.float32) + 0.5, 0, 255).astype(np.uint8)
+
+
+def rgb2bw(pixels: np.ndarray) -> np.ndarray:
+    return pixels[:, :, 0] * 0.2989 + pixels[:, :, 1] * 0.5870 + pixels[:, :, 2] * 0.1140
+
+
+def read_pixels(image: bpy.types.Image, width: int, height: int) -> np.ndarray:
+    """
+    Returns the float pixels of image, as a (height, width, 4) array, resized
+    with NumPy if the image is not width x height.
+    """
+    pixels = np.empty(image.size[0] * image.size[1] * 4, np.float32)
+    image.pixels.foreach_get(pixels)
+    pixels = pixels.reshape(image.size[1], image.size[0], 4)
+    if image.size[0] != width or image.size[1] != height:
+        pixels = resize_pixels(pixels, width, height)
+    return pixels
+
+
+def resize_pixels(pixels: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Bilinear resize of a (height, width, channels) array, one axis at a time."""
+    for axis, size in ((0, height), (1, width)):
+        src_size = pixels.shape[axis]
+        if src_size == size:
+            continue
+        # Position of the centers of the new pixels, in old pixels
+        pos = np.clip((np.arange(size) + 0.5) * (src_size / size) - 0.5, 0, src_size - 1)
+        idx0 = pos.astype(np.intp)
+        idx1 = np.minimum(idx0 + 1, src_size - 1)
+        shape = [1, 1, 1]
+        shape[axis] = size
+        factor = (pos - idx0).astype(np.float32).reshape(shape)
+        pixels = np.take(pixels, idx0, axis=axis) * (1 - factor) + np.take(pixels, idx1, axis=axis) * factor
+    return pixels
+
+
 class TmpImageGuard:
     """Guard to automatically clean up temp images (use it with `with`)."""
     def __init__(self):
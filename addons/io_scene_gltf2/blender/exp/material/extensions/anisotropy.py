@@ -19,7 +19,7 @@ from .....io.com.gltf2_io_extensions import Extension
 from ....com.conversion import get_anisotropy_rotation_blender_to_gltf
 from ...material import texture_info as gltf2_blender_gather_texture_info
 from ..search_node_tree import detect_anisotropy_nodes, get_socket, has_image_node_from_socket, get_factor_from_socket
-from ..encode_image import TmpImageGuard, make_temp_image_copy, StoreImage, StoreData
+from ..encode_image import StoreImage, StoreData, read_pixels
 
 def export_anisotropy(blender_material, export_settings):
 
@@ -215,26 +215,14 @@ def grayscale_anisotropy_calculation(stored, export_settings):
         return gray
 
     for identifier, image in [(ident, store.image) for (ident, store) in stored.items() if isinstance(store, StoreImage)]:
-        tmp_buf = np.empty(width * height * 4, np.float32)
-
-        if image.size[0] == width and image.size[1] == height:
-            image.pixels.foreach_get(tmp_buf)
-        else:
-            # Image is the wrong size; make a temp copy and scale it.
-            with TmpImageGuard() as guard:
-                make_temp_image_copy(guard, src_image=image)
-                tmp_image = guard.image
-                tmp_image.scale(width, height)
-                tmp_image.pixels.foreach_get(tmp_buf)
-
-        buffers[identifier] = np.reshape(tmp_buf, [width, height, 4])
+        buffers[identifier] = read_pixels(image, width, height)
         buffers[identifier] = rgb2gray(buffers[identifier])
 
     for identifier, data in [(ident, data) for (ident, data) in stored.items() if isinstance(data, StoreData)]:
-        buffers[identifier] =  np.full((width, height), 1) # Set to white / 1.0, as value is set as factor
+        buffers[identifier] =  np.full((height, width), 1) # Set to white / 1.0, as value is set as factor
 
     # Combine the image
-    out_buf = np.zeros((width, height, 4), np.float32)
+    out_buf = np.zeros((height, width, 4), np.float32)
     out_buf[:,:,3] = 1.0  # A : Alpha
     out_buf[:,:,2] = buffers['anisotropy']  # B : Strength (Anisotropic socket)
 
@@ -18,6 +18,7 @@ import bpy
 from ....io.com import gltf2_io
 from ....io.com.gltf2_io_extensions import Extension
 from ....io.exp.user_extensions import export_user_extensions
+from ....io.com.debug import profiled
 from ...com.extras import generate_extras
 from ..cache import cached, cached_by_key
 from . import unlit as gltf2_unlit
@@ -55,6 +56,7 @@ def get_material_cache_key(blender_material, export_settings):
     )
 
 @cached_by_key(key=get_material_cache_key)
+@profiled('gather_material', object_name=lambda blender_material, export_settings: blender_material.name)
 def gather_material(blender_material, export_settings):
     """
     Gather the material used by the blender primitive.
@@ -193,9 +195,11 @@ def get_new_material_texture_shared(base, node):
         if type(node) in [gltf2_io.TextureInfo, gltf2_io.MaterialOcclusionTextureInfoClass, gltf2_io.MaterialNormalTextureInfoClass]:
             node.index = base.index
         else:
-            if hasattr(node, '__dict__'):
-                for attr, value in node.__dict__.items():
-                    get_new_material_texture_shared(getattr(base, attr), value)
+            if hasattr(node, '__slots__') or hasattr(node, '__dict__'):
+                # Fields of glTF properties are stored in __slots__, some also have a __dict__
+                attrs = [a for a in getattr(node, '__slots__', ()) if a != '__dict__'] + list(getattr(node, '__dict__', {}).keys())
+                for attr in attrs:
+                    get_new_material_texture_shared(getattr(base, attr), getattr(node, attr))
             else:
                 # For extensions (on a dict)
                 if type(node).__name__ == 'dict':
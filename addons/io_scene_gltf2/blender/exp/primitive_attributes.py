@@ -55,7 +55,7 @@ def __gather_skins(blender_primitive, export_settings):
 
     # Retrieve max set index
     max_bone_set_index = 0
-    while blender_primitive["attributes"].get('JOINTS_' + str(max_bone_set_index)) and blender_primitive["attributes"].get('WEIGHTS_' + str(max_bone_set_index)):
+    while blender_primitive["attributes"].get('JOINTS_' + str(max_bone_set_index)) is not None and blender_primitive["attributes"].get('WEIGHTS_' + str(max_bone_set_index)) is not None:
         max_bone_set_index += 1
     max_bone_set_index -= 1
 
@@ -100,7 +100,7 @@ def __gather_skins(blender_primitive, export_settings):
         weight_id = 'WEIGHTS_' + str(s)
         weight = blender_primitive["attributes"][weight_id]
         weight = np.array(weight, dtype=np.float32)
-        weight = weight.reshape(len(weight) // 4, 4)
+        weight = weight.reshape(-1, 4)
 
         # Set warning for the case where we are in the same group, will be done later (for example, 3 weights needed, but 2 wanted by user)
         # And then, remove no more needed weights
@@ -126,9 +126,9 @@ def __gather_skins(blender_primitive, export_settings):
 
         # joints
         joint_id = 'JOINTS_' + str(s)
-        internal_joint = blender_primitive["attributes"][joint_id]
+        internal_joint = np.asarray(blender_primitive["attributes"][joint_id])
         component_type = gltf2_io_constants.ComponentType.UnsignedShort
-        if max(internal_joint) < 256:
+        if internal_joint.max(initial=0) < 256:
             component_type = gltf2_io_constants.ComponentType.UnsignedByte
         joints = np.array(internal_joint, dtype= gltf2_io_constants.ComponentType.to_numpy_dtype(component_type))
         joints = joints.reshape(-1, 4)
@@ -14,20 +14,91 @@
 
 import numpy as np
 from copy import deepcopy
-from mathutils import Vector
 from ...blender.com.data_path import get_sk_exported
 from ...io.com.constants import ROUNDING_DIGIT
 from ...io.exp.user_extensions import export_user_extensions
 from ...io.com import constants as gltf2_io_constants
+from ...io.com.debug import profiled
 from ..com import conversion as gltf2_blender_conversion
 from ..com.gltf2_blender_utils import fast_structured_np_unique
 from .material.materials import get_base_material, get_material_from_idx, get_active_uvmap_index, get_new_material_texture_shared
 from .material.texture_info import gather_udim_texture_info
 from . import skins as gltf2_blender_gather_skins
-
-
+from .disk_cache import content_hash, mesh_content
+
+
+def __profiled_mesh_name(materials, blender_mesh, *args, **kwargs):
+    return blender_mesh.name
+
+def __primitives_byte_length(result):
+    primitives, _, shared_attributes = result
+    byte_length = 0
+    for attributes in [p['attributes'] for p in primitives if 'attributes' in p.keys()] + [shared_attributes or {}]:
+        # Joints and weights are stored as bare arrays, other attributes as dicts
+        byte_length += sum(attr.nbytes if isinstance(attr, np.ndarray) else attr['data'].nbytes for attr in attributes.values())
+    byte_length += sum(p['indices'].nbytes for p in primitives if p.get('indices') is not None)
+    return byte_length
+
+# Export settings used when extracting primitives
+__EXTRACT_SETTINGS = [
+    'gltf_normals',
+    'gltf_tangents',
+    'gltf_texcoords',
+    'gltf_materials',
+    'gltf_attributes',
+    'gltf_morph',
+    'gltf_morph_normal',
+    'gltf_morph_tangent',
+    'gltf_vertex_color',
+    'gltf_all_vertex_colors',
+    'gltf_active_vertex_color_when_no_material',
+    'gltf_loose_edges',
+    'gltf_loose_points',
+    'gltf_shared_accessors',
+    'gltf_yup',
+]
+
+def __disk_cache_key(materials, blender_mesh, uuid_for_skined_data, export_settings):
+    # Skinned meshes depend on the armature, and flag it while being extracted:
+    # always extract them
+    if uuid_for_skined_data is not None and export_settings['gltf_skins']:
+        return None
+
+    content = mesh_content(blender_mesh)
+    if content is None:
+        return None
+
+    # Materials decide which UVMaps and vertex colors are extracted
+    for material_idx in range(len(materials or [])):
+        base_material, material_info = get_base_material(material_idx, materials, export_settings)
+        if material_info['udim_info']:
+            return None
+        content.extend([base_material is None, material_info['uv_info'], material_info['vc_info']])
+
+    return content_hash(*content, *[export_settings.get(setting) for setting in __EXTRACT_SETTINGS])
+
+@profiled('extract_primitives', object_name=__profiled_mesh_name, produced_bytes=__primitives_byte_length)
 def extract_primitives(materials, blender_mesh, uuid_for_skined_data, blender_vertex_groups, modifiers, export_settings):
-    """Extract primitives from a mesh."""
+    """Extract primitives from a mesh, or load them from the disk cache when enabled."""
+    disk_cache = export_settings['disk_cache']
+    cache_key = None
+    if disk_cache is not None:
+        cache_key = __disk_cache_key(materials, blender_mesh, uuid_for_skined_data, export_settings)
+        if cache_key is not None:
+            result = disk_cache.load('primitives', cache_key, blender_mesh.name)
+            if result is not None:
+                export_settings['log'].info("Loading cached primitive: " + blender_mesh.name)
+                return result
+
+    result = __extract_primitives(materials, blender_mesh, uuid_for_skined_data, blender_vertex_groups, modifiers, export_settings)
+
+    # UDIM materials are not cached
+    if cache_key is not None and all(m is None for m in result[1]):
+        disk_cache.save('primitives', cache_key, result, blender_mesh.name)
+
+    return result
+
+def __extract_primitives(materials, blender_mesh, uuid_for_skined_data, blender_vertex_groups, modifiers, export_settings):
     export_settings['log'].info("Extracting primitive: " + blender_mesh.name)
 
     primitive_creator = PrimitiveCreator(materials, blender_mesh, uuid_for_skined_data, blender_vertex_groups, modifiers, export_settings)
@@ -329,23 +400,23 @@ class PrimitiveCreator:
 
         self.dots = np.empty(len(self.blender_mesh.loops), dtype=np.dtype(dot_fields))
 
+        if self.export_settings['gltf_loose_edges'] or self.export_settings['gltf_loose_points']:
+            edge_vidxs = np.empty(len(self.blender_mesh.edges) * 2, dtype=np.uint32)
+            self.blender_mesh.edges.foreach_get('vertices', edge_vidxs)
+
         # Find loose edges
         if self.export_settings['gltf_loose_edges']:
-            loose_edges = [e for e in self.blender_mesh.edges if e.is_loose]
-            self.blender_idxs_edges = [vi for e in loose_edges for vi in e.vertices]
-            self.blender_idxs_edges = np.array(self.blender_idxs_edges, dtype=np.uint32)
+            is_loose = np.empty(len(self.blender_mesh.edges), dtype=bool)
+            self.blender_mesh.edges.foreach_get('is_loose', is_loose)
+            self.blender_idxs_edges = edge_vidxs.reshape(-1, 2)[is_loose].reshape(-1)
 
             self.dots_edges = np.empty(len(self.blender_idxs_edges), dtype=np.dtype(dot_fields_edges))
             self.dots_edges['vertex_index'] = self.blender_idxs_edges
 
-        # Find loose points
+        # Find loose points (vertices that are in no edge)
         if self.export_settings['gltf_loose_points']:
-            verts_in_edge = set(vi for e in self.blender_mesh.edges for vi in e.vertices)
-            self.blender_idxs_points = [
-                vi for vi, _ in enumerate(self.blender_mesh.vertices)
-                if vi not in verts_in_edge
-            ]
-            self.blender_idxs_points = np.array(self.blender_idxs_points, dtype=np.uint32)
+            edge_counts = np.bincount(edge_vidxs, minlength=len(self.blender_mesh.vertices))
+            self.blender_idxs_points = np.flatnonzero(edge_counts == 0).astype(np.uint32)
 
             self.dots_points = np.empty(len(self.blender_idxs_points), dtype=np.dtype(dot_fields_points))
             self.dots_points['vertex_index'] = self.blender_idxs_points
@@ -796,22 +867,7 @@ class PrimitiveCreator:
                 self.__set_regular_attribute(self.dots, attr)
 
         if self.skin:
-            joints = [[] for _ in range(self.num_joint_sets)]
-            weights = [[] for _ in range(self.num_joint_sets)]
-
-            for vi in self.blender_idxs:
-                bones = self.vert_bones[vi]
-                for j in range(0, 4 * self.num_joint_sets):
-                    if j < len(bones):
-                        joint, weight = bones[j]
-                    else:
-                        joint, weight = 0, 0.0
-                    joints[j//4].append(joint)
-                    weights[j//4].append(weight)
-
-            for i, (js, ws) in enumerate(zip(joints, weights)):
-                self.attributes['JOINTS_%d' % i] = js
-                self.attributes['WEIGHTS_%d' % i] = ws
+            self.__set_bone_attributes(self.attributes)
 
 
         for material_idx, dot_indices in self.prim_indices.items():
@@ -877,22 +933,7 @@ class PrimitiveCreator:
 
 
             if self.skin:
-                joints = [[] for _ in range(self.num_joint_sets)]
-                weights = [[] for _ in range(self.num_joint_sets)]
-
-                for vi in self.blender_idxs:
-                    bones = self.vert_bones[vi]
-                    for j in range(0, 4 * self.num_joint_sets):
-                        if j < len(bones):
-                            joint, weight = bones[j]
-                        else:
-                            joint, weight = 0, 0.0
-                        joints[j//4].append(joint)
-                        weights[j//4].append(weight)
-
-                for i, (js, ws) in enumerate(zip(joints, weights)):
-                    self.attributes['JOINTS_%d' % i] = js
-                    self.attributes['WEIGHTS_%d' % i] = ws
+                self.__set_bone_attributes(self.attributes)
 
             primitives.append({
                 'attributes': self.attributes,
@@ -942,22 +983,7 @@ class PrimitiveCreator:
                             self.attributes_edges_points[attr['gltf_attribute_name']]["data_type"] = gltf2_blender_conversion.get_data_type(attr['blender_data_type'])
 
                 if self.skin:
-                    joints = [[] for _ in range(self.num_joint_sets)]
-                    weights = [[] for _ in range(self.num_joint_sets)]
-
-                    for vi in self.blender_idxs:
-                        bones = self.vert_bones[vi]
-                        for j in range(0, 4 * self.num_joint_sets):
-                            if j < len(bones):
-                                joint, weight = bones[j]
-                            else:
-                                joint, weight = 0, 0.0
-                            joints[j//4].append(joint)
-                            weights[j//4].append(weight)
-
-                    for i, (js, ws) in enumerate(zip(joints, weights)):
-                        self.attributes_edges_points['JOINTS_%d' % i] = js
-                        self.attributes_edges_points['WEIGHTS_%d' % i] = ws
+                    self.__set_bone_attributes(self.attributes_edges_points)
 
                 primitives_edges_points.append({
                     'attributes': self.attributes_edges_points,
@@ -994,22 +1020,7 @@ class PrimitiveCreator:
                             self.attributes_edges_points[attr['gltf_attribute_name']]["data_type"] = gltf2_blender_conversion.get_data_type(attr['blender_data_type'])
 
                 if self.skin:
-                    joints = [[] for _ in range(self.num_joint_sets)]
-                    weights = [[] for _ in range(self.num_joint_sets)]
-
-                    for vi in self.blender_idxs:
-                        bones = self.vert_bones[vi]
-                        for j in range(0, 4 * self.num_joint_sets):
-                            if j < len(bones):
-                                joint, weight = bones[j]
-                            else:
-                                joint, weight = 0, 0.0
-                            joints[j//4].append(joint)
-                            weights[j//4].append(weight)
-
-                    for i, (js, ws) in enumerate(zip(joints, weights)):
-                        self.attributes_edges_points['JOINTS_%d' % i] = js
-                        self.attributes_edges_points['WEIGHTS_%d' % i] = ws
+                    self.__set_bone_attributes(self.attributes_edges_points)
 
                 primitives_edges_points.append({
                     'attributes': self.attributes_edges_points,
@@ -1467,39 +1478,70 @@ class PrimitiveCreator:
         self.need_neutral_bone = False
         min_influence = 0.0001
 
+        vertex_count = len(self.blender_mesh.vertices)
+
         joint_name_to_index = {joint.name: index for index, joint in enumerate(self.skin.joints)}
-        group_to_joint = [joint_name_to_index.get(g.name) for g in self.blender_vertex_groups]
-
-        # List of (joint, weight) pairs for each vert
-        self.vert_bones = []
-        max_num_influences = 0
-
-        for vertex in self.blender_mesh.vertices:
-            bones = []
-            if vertex.groups:
-                for group_element in vertex.groups:
-                    weight = group_element.weight
-                    if weight <= min_influence:
-                        continue
-                    try:
-                        joint = group_to_joint[group_element.group]
-                    except Exception:
-                        continue
-                    if joint is None:
-                        continue
-                    bones.append((joint, weight))
-            bones.sort(key=lambda x: x[1], reverse=True)
-            if not bones:
-                # Is not assign to any bone
-                bones = ((len(self.skin.joints), 1.0),)  # Assign to a joint that will be created later
-                self.need_neutral_bone = True
-            self.vert_bones.append(bones)
-            if len(bones) > max_num_influences:
-                max_num_influences = len(bones)
+        # -1 for groups that are not joints. Last item is used for invalid group indices
+        group_to_joint = np.array(
+            [joint_name_to_index.get(g.name, -1) for g in self.blender_vertex_groups] + [-1],
+            dtype=np.int32
+        )
+
+        # Retrieve all (vertex, group, weight) influences in one pass
+        influences = np.fromiter(
+            ((vi, g.group, g.weight) for vi, vertex in enumerate(self.blender_mesh.vertices) for g in vertex.groups),
+            dtype=np.dtype([('vertex', np.uint32), ('group', np.int64), ('weight', np.float32)]),
+        )
+
+        groups = influences['group']
+        groups = np.where((groups >= 0) & (groups < len(group_to_joint) - 1), groups, len(group_to_joint) - 1)
+        joints = group_to_joint[groups]
+        keep = (influences['weight'] > min_influence) & (joints >= 0)
+        vertices = influences['vertex'][keep]
+        weights = influences['weight'][keep]
+        joints = joints[keep]
+        del influences, groups, keep
+
+        # Sort by vertex, then by decreasing weight
+        # lexsort is stable, so vertex group order is kept for same weights
+        order = np.lexsort((-weights, vertices))
+        vertices = vertices[order]
+        weights = weights[order]
+        joints = joints[order]
+        del order
+
+        # Rank of each influence in its vertex
+        counts = np.bincount(vertices, minlength=vertex_count)
+        ranks = np.arange(len(vertices)) - (np.cumsum(counts) - counts)[vertices]
+
+        not_assigned = counts == 0
+        if np.any(not_assigned):
+            self.need_neutral_bone = True
+
+        max_num_influences = int(counts.max(initial=0))
+        if self.need_neutral_bone is True:
+            max_num_influences = max(max_num_influences, 1)
 
         # How many joint sets do we need? 1 set = 4 influences
         self.num_joint_sets = (max_num_influences + 3) // 4
 
+        # (joint, weight) for each vert, padded with (0, 0.0)
+        self.vert_joints = np.zeros((vertex_count, 4 * self.num_joint_sets), dtype=np.uint32)
+        self.vert_weights = np.zeros((vertex_count, 4 * self.num_joint_sets), dtype=np.float32)
+        self.vert_joints[vertices, ranks] = joints
+        self.vert_weights[vertices, ranks] = weights
+
+        # Vertices not assigned to any bone are assigned to a joint that will be created later
+        self.vert_joints[not_assigned, 0] = len(self.skin.joints)
+        self.vert_weights[not_assigned, 0] = 1.0
+
+    def __set_bone_attributes(self, attributes):
+        joints = self.vert_joints[self.blender_idxs]
+        weights = self.vert_weights[self.blender_idxs]
+        for i in range(self.num_joint_sets):
+            attributes['JOINTS_%d' % i] = joints[:, 4 * i:4 * i + 4]
+            attributes['WEIGHTS_%d' % i] = weights[:, 4 * i:4 * i + 4]
+
 ##################################### Set ###################################
     def set_function(self):
 
@@ -1549,19 +1591,61 @@ class PrimitiveCreator:
             self.attributes_edges_points[attr['gltf_attribute_name']]["data"] = self.morph_tangents
 
     def __calc_morph_tangents(self):
-        # TODO: check if this works
-        self.morph_tangents = np.empty((len(self.normals), 3), dtype=np.float32)
-
-        for i in range(len(self.normals)):
-            n = Vector(self.normals[i])
-            morph_n = n + Vector(self.morph_normals[i])  # convert back to non-delta
-            t = Vector(self.tangents[i, :3])
-
-            rotation = morph_n.rotation_difference(n)
-
-            t_morph = Vector(t)
-            t_morph.rotate(rotation)
-            self.morph_tangents[i] = t_morph - t  # back to delta
+        # Rotate the tangents by the rotation from the morphed normals to the
+        # base normals (like mathutils Vector.rotation_difference), for all
+        # vertices at once
+        n = self.normals.astype(np.float64)
+        morph_n = n + self.morph_normals  # convert back to non-delta
+        t = self.tangents[:, :3].astype(np.float64)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            v1 = morph_n / np.linalg.norm(morph_n, axis=1, keepdims=True)
+            v2 = n / np.linalg.norm(n, axis=1, keepdims=True)
+        v1 = np.nan_to_num(v1, copy=False)
+        v2 = np.nan_to_num(v2, copy=False)
+
+        axis = np.cross(v1, v2)
+        sin = np.linalg.norm(axis, axis=1)
+        cos = np.einsum('ij,ij->i', v1, v2)
+        angle = np.arctan2(sin, cos)
+
+        degenerate = sin <= np.finfo(np.float32).eps
+        with np.errstate(invalid='ignore', divide='ignore'):
+            axis /= sin[:, np.newaxis]
+
+        # Parallel normals: no rotation
+        # Opposite normals: half turn around any orthogonal axis (same axis as mathutils)
+        opposite = degenerate & (cos <= 0)
+        axis[degenerate] = 0
+        angle[degenerate] = 0
+        if opposite.any():
+            ortho = self.__ortho_axis(v1[opposite])
+            axis[opposite] = ortho
+            # A null normal has no orthogonal axis: no rotation either
+            angle[opposite] = np.where(ortho.any(axis=1), np.pi, 0)
+
+        # Rodrigues' rotation formula
+        cos_a = np.cos(angle)[:, np.newaxis]
+        sin_a = np.sin(angle)[:, np.newaxis]
+        k_dot_t = np.einsum('ij,ij->i', axis, t)[:, np.newaxis]
+        t_morph = t * cos_a + np.cross(axis, t) * sin_a + axis * k_dot_t * (1 - cos_a)
+
+        self.morph_tangents = (t_morph - t).astype(np.float32)  # back to delta
+
+    @staticmethod
+    def __ortho_axis(v):
+        # Unit vector orthogonal to each v, built from its dominant axis (like Blender ortho_v3_v3).
+        # On ties, the later axis is dominant, like axis_dominant_v3_single.
+        a = np.abs(v)
+        dominant = np.where(a[:, 0] > a[:, 1], np.where(a[:, 0] > a[:, 2], 0, 2), np.where(a[:, 1] > a[:, 2], 1, 2))
+        x, y, z = v[:, 0], v[:, 1], v[:, 2]
+        ortho = np.where(
+            (dominant == 0)[:, np.newaxis], np.stack((-y - z, x, x), axis=1), np.where(
+                (dominant == 1)[:, np.newaxis], np.stack((y, -x - z, y), axis=1),
+                np.stack((z, z, -x - y), axis=1)))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ortho /= np.linalg.norm(ortho, axis=1, keepdims=True)
+        return np.nan_to_num(ortho, copy=False)
 
     def __set_regular_attribute(self, dots, attr):
             res = np.empty((len(dots), attr['len']), dtype=attr['type'])
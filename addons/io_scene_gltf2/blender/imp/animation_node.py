@@ -13,10 +13,11 @@
 # limitations under the License.
 
 import bpy
-from mathutils import Vector
+import numpy as np
 
 from ...io.imp.user_extensions import import_user_extensions
 from ...io.imp.gltf2_io_binary import BinaryData
+from ..com.gltf2_blender_math import multiply_quaternions
 from .animation_utils import make_fcurve
 from .vnode import VNode
 
@@ -65,34 +66,37 @@ class BlenderNodeAnim():
 
         action = BlenderNodeAnim.get_or_create_action(gltf, node_idx, animation.track_name)
 
-        keys = BinaryData.get_data_from_accessor(gltf, animation.samplers[channel.sampler].input)
-        values = BinaryData.get_data_from_accessor(gltf, animation.samplers[channel.sampler].output)
+        keys = BinaryData.decode_accessor(gltf, animation.samplers[channel.sampler].input)
+        values = BinaryData.decode_accessor(gltf, animation.samplers[channel.sampler].output)
 
         if animation.samplers[channel.sampler].interpolation == "CUBICSPLINE":
             # TODO manage tangent?
             values = values[1::3]
 
+        # Work on a float copy, as decoded data can be read-only
+        values = values.astype(np.float64)
+
         # Convert the curve from glTF to Blender.
 
         if path == "translation":
             blender_path = "location"
             group_name = "Location"
             num_components = 3
-            values = [gltf.loc_gltf_to_blender(vals) for vals in values]
+            gltf.locs_batch_gltf_to_blender(values)
             values = vnode.base_locs_to_final_locs(values)
 
         elif path == "rotation":
             blender_path = "rotation_quaternion"
             group_name = "Rotation"
             num_components = 4
-            values = [gltf.quaternion_gltf_to_blender(vals) for vals in values]
+            gltf.quaternions_batch_gltf_to_blender(values)
             values = vnode.base_rots_to_final_rots(values)
 
         elif path == "scale":
             blender_path = "scale"
             group_name = "Scale"
             num_components = 3
-            values = [gltf.scale_gltf_to_blender(vals) for vals in values]
+            gltf.scales_batch_gltf_to_blender(values)
             values = vnode.base_scales_to_final_scales(values)
 
         # Objects parented to a bone are translated to the bone tip by default.
@@ -100,8 +104,7 @@ class BlenderNodeAnim():
         if vnode.type == VNode.Object and path == "translation":
             if vnode.parent is not None and gltf.vnodes[vnode.parent].type == VNode.Bone:
                 bone_length = gltf.vnodes[vnode.parent].bone_length
-                off = Vector((0, -bone_length, 0))
-                values = [vals + off for vals in values]
+                values[:, 1] -= bone_length
 
         if vnode.type == VNode.Bone:
             # Need to animate the pose bone when the node is a bone.
@@ -129,19 +132,13 @@ class BlenderNodeAnim():
 
             if path == 'translation':
                 edit_trans, edit_rot = vnode.editbone_trans, vnode.editbone_rot
-                edit_rot_inv = edit_rot.conjugated()
-                values = [
-                    edit_rot_inv @ (trans - edit_trans)
-                    for trans in values
-                ]
+                edit_rot_inv = np.array(edit_rot.conjugated().to_matrix())
+                values = (values - np.array(edit_trans)) @ edit_rot_inv.T
 
             elif path == 'rotation':
                 edit_rot = vnode.editbone_rot
-                edit_rot_inv = edit_rot.conjugated()
-                values = [
-                    edit_rot_inv @ rot
-                    for rot in values
-                ]
+                edit_rot_inv = np.array(edit_rot.conjugated())
+                values = multiply_quaternions(edit_rot_inv, values)
 
             elif path == 'scale':
                 pass  # no change needed
@@ -149,17 +146,15 @@ class BlenderNodeAnim():
         # To ensure rotations always take the shortest path, we flip
         # adjacent antipodal quaternions.
         if path == 'rotation':
-            for i in range(1, len(values)):
-                if values[i].dot(values[i-1]) < 0:
-                    values[i] = -values[i]
+            values = BlenderNodeAnim.flip_antipodal_quaternions(values)
 
         fps = (bpy.context.scene.render.fps * bpy.context.scene.render.fps_base)
 
-        coords = [0] * (2 * len(keys))
-        coords[::2] = (key[0] * fps for key in keys)
+        coords = np.empty(2 * len(keys), dtype=np.float32)
+        coords[::2] = keys[:, 0] * fps
 
         for i in range(0, num_components):
-            coords[1::2] = (vals[i] for vals in values)
+            coords[1::2] = values[:, i]
             make_fcurve(
                 action,
                 coords,
@@ -171,6 +166,25 @@ class BlenderNodeAnim():
 
         import_user_extensions('gather_import_animation_channel_after_hook', gltf, animation, vnode, path, channel, action)
 
+    @staticmethod
+    def flip_antipodal_quaternions(values):
+        """Flip quaternions so that each one has a non negative dot product with the previous (flipped) one."""
+        if len(values) < 2:
+            return values
+
+        dots = np.einsum('ij,ij->i', values[1:], values[:-1])
+        # Sign of each quaternion relative to the previous original one.
+        # A zero dot product resets the flipping, as the quaternion is kept as is.
+        signs = np.where(dots < 0, -1.0, 1.0)
+        signs = np.concatenate(([1.0], signs))
+        cumulated = np.cumprod(signs)
+
+        resets = np.concatenate(([True], dots == 0))
+        last_reset = np.maximum.accumulate(np.where(resets, np.arange(len(values)), 0))
+        flips = cumulated * cumulated[last_reset]
+
+        return values * flips[:, np.newaxis]
+
     @staticmethod
     def get_or_create_action(gltf, node_idx, anim_name):
         vnode = gltf.vnodes[node_idx]
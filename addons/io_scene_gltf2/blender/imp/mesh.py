@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 import bpy
 from mathutils import Matrix
 import numpy as np
@@ -23,6 +25,7 @@ from ..com.extras import set_extras
 from ..com.gltf2_blender_utils import fast_structured_np_unique
 from .material import BlenderMaterial
 from .draco_compression_extension import decode_primitive
+from .vnode import VNode
 
 class BlenderMesh():
     """Blender Mesh."""
@@ -34,6 +37,15 @@ class BlenderMesh():
         """Mesh creation."""
         return create_mesh(gltf, mesh_idx, skin_idx)
 
+    @staticmethod
+    def decode_all(gltf):
+        """Start decoding meshes ahead of their creation."""
+        decode_meshes(gltf)
+
+    @staticmethod
+    def end_decoding(gltf):
+        end_decoding_meshes(gltf)
+
 
 # Maximum number of TEXCOORD_n/COLOR_n sets to import
 UV_MAX = 8
@@ -65,18 +77,25 @@ def create_mesh(gltf, mesh_idx, skin_idx):
     return mesh
 
 
-def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
-    """Put all primitive data into the mesh."""
+def decode_primitives(gltf, mesh_idx, skin_idx, mesh_options):
+    """
+    Gather all primitive data into arrays, converted to Blender space.
+    This does not touch any Blender data, so it can run outside the main thread.
+    """
     pymesh = gltf.data.meshes[mesh_idx]
 
-    # Use a class here, to be able to pass data by reference to hook (to be able to change them inside hook)
-    class IMPORT_mesh_options:
-        def __init__(self, skinning: bool = True, skin_into_bind_pose: bool = True):
-            self.skinning = skinning
-            self.skin_into_bind_pose = skin_into_bind_pose
+    # Accessors are cached in case they are shared between primitives. The
+    # cache is local, as several meshes can be decoded at once.
+    accessor_cache = {}
 
-    mesh_options = IMPORT_mesh_options()
-    import_user_extensions('gather_import_mesh_options', gltf, mesh_options, pymesh, skin_idx)
+    def decode_accessor(accessor_idx):
+        array = accessor_cache.get(accessor_idx)
+        if array is None:
+            array = BinaryData.decode_accessor(gltf, accessor_idx)
+            # Prevent accidentally modifying cached arrays
+            array.flags.writeable = False
+            accessor_cache[accessor_idx] = array
+        return array
 
     # Scan the primitives to find out what we need to create
 
@@ -85,7 +104,6 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
     num_cols = 0
     num_joint_sets = 0
     attributes = set({})
-    attribute_data = []
     attribute_type = {}
     attribute_component_type = {}
 
@@ -117,46 +135,11 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
             if not attr in attributes:
                 attribute_type[attr] = gltf.data.accessors[prim.attributes[attr]].type
                 attribute_component_type[attr] = gltf.data.accessors[prim.attributes[attr]].component_type
-                attribute_data.append(
-                    np.empty(
-                        dtype=ComponentType.to_numpy_dtype(attribute_component_type[attr]),
-                        shape=(0, DataType.num_elements(attribute_type[attr])))
-                        )
         attributes.update(set(custom_attrs))
 
 
     num_shapekeys = sum(sk_name is not None for sk_name in pymesh.shapekey_names)
 
-    # -------------
-    # We'll process all the primitives gathering arrays to feed into the
-    # various foreach_set function that create the mesh data.
-
-    num_faces = 0  # total number of faces
-    vert_locs = np.empty(dtype=np.float32, shape=(0,3))  # coordinate for each vert
-    vert_normals = np.empty(dtype=np.float32, shape=(0,3))  # normal for each vert
-    edge_vidxs = np.array([], dtype=np.uint32)  # vertex_index for each loose edge
-    loop_vidxs = np.array([], dtype=np.uint32)  # vertex_index for each loop
-    loop_uvs = [
-        np.empty(dtype=np.float32, shape=(0,2))  # UV for each loop for each layer
-        for _ in range(num_uvs)
-    ]
-    loop_cols = [
-        np.empty(dtype=np.float32, shape=(0,4))  # color for each loop for each layer
-        for _ in range(num_cols)
-    ]
-    vert_joints = [
-        np.empty(dtype=np.uint32, shape=(0,4))  # 4 joints for each vert for each set
-        for _ in range(num_joint_sets)
-    ]
-    vert_weights = [
-        np.empty(dtype=np.float32, shape=(0,4))  # 4 weights for each vert for each set
-        for _ in range(num_joint_sets)
-    ]
-    sk_vert_locs = [
-        np.empty(dtype=np.float32, shape=(0,3))  # coordinate for each vert for each shapekey
-        for _ in range(num_shapekeys)
-    ]
-
     # We need to detect if some non-tri primitives have some VC.
     # (Because, in that case, we will need to create vertex domain VC, instead of corner domain VC)
     has_non_tri_vcs = []
@@ -165,27 +148,28 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
         has_non_tri_vcs.append(any([prim.mode not in [None, 4, 5, 6] and any(['COLOR_' + str(i) in attr for attr in prim.attributes]) for prim in pymesh.primitives]))
         vc_domains.append('POINT' if has_non_tri_vcs[i] else 'CORNER')
 
+    # -------------
+    # First pass: decode the indices of every primitive, so we know the final
+    # number of verts and loops before allocating anything.
+
+    prim_indices = []  # (prim, indices, unique_indices, inv_indices, is_edges, is_tris)
+    num_verts = 0  # total number of verts
+    num_loops = 0  # total number of loops
+    num_edge_vidxs = 0  # total number of loose edge vertex indices
+    num_corners = 0  # total number of indices, for corner domain VC
+
     for prim in pymesh.primitives:
         prim.num_faces = 0
 
         if 'POSITION' not in prim.attributes:
             continue
 
-        vert_index_base = len(vert_locs)
-
-        if prim.extensions is not None and 'KHR_draco_mesh_compression' in prim.extensions:
-
-            gltf.log.info('Draco Decoder: Decode primitive {}'.format(pymesh.name or '[unnamed]'))
-            decode_primitive(gltf, prim)
-
-        import_user_extensions('gather_import_decode_primitive', gltf, pymesh, prim, skin_idx)
-
         if prim.indices is not None:
             indices = BinaryData.decode_accessor(gltf, prim.indices)
             indices = indices.reshape(len(indices))
         else:
-            num_verts = gltf.data.accessors[prim.attributes['POSITION']].count
-            indices = np.arange(0, num_verts, dtype=np.uint32)
+            prim_num_verts = gltf.data.accessors[prim.attributes['POSITION']].count
+            indices = np.arange(0, prim_num_verts, dtype=np.uint32)
 
         mode = 4 if prim.mode is None else prim.mode
         points, edges, tris = points_edges_tris(mode, indices)
@@ -199,39 +183,94 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
         # We'll add one vert to the arrays for each index used in indices
         unique_indices, inv_indices = np.unique(indices, return_inverse=True)
 
-        vs = BinaryData.decode_accessor(gltf, prim.attributes['POSITION'], cache=True)
-        vert_locs = np.concatenate((vert_locs, vs[unique_indices]))
+        prim_indices.append((prim, indices, unique_indices, inv_indices, edges is not None, tris is not None))
+
+        num_verts += len(unique_indices)
+        num_corners += len(indices)
+        if edges is not None:
+            num_edge_vidxs += len(indices)
+        if tris is not None:
+            num_loops += len(indices)
+
+    # -------------
+    # We'll process all the primitives filling arrays to feed into the
+    # various foreach_set function that create the mesh data.
+    # Each array is allocated once with its final size, and each primitive
+    # writes into its own slice.
+
+    num_faces = 0  # total number of faces
+    vert_locs = np.empty(dtype=np.float32, shape=(num_verts, 3))  # coordinate for each vert
+    vert_normals = np.empty(dtype=np.float32, shape=(num_verts if has_normals else 0, 3))  # normal for each vert
+    edge_vidxs = np.empty(dtype=np.uint32, shape=(num_edge_vidxs,))  # vertex_index for each loose edge
+    loop_vidxs = np.empty(dtype=np.uint32, shape=(num_loops,))  # vertex_index for each loop
+    loop_uvs = [
+        np.empty(dtype=np.float32, shape=(num_loops, 2))  # UV for each loop for each layer
+        for _ in range(num_uvs)
+    ]
+    loop_cols = [
+        np.empty(dtype=np.float32, shape=(num_corners if vc_domains[col_i] == 'CORNER' else num_verts, 4))  # color for each loop for each layer
+        for col_i in range(num_cols)
+    ]
+    vert_joints = [
+        np.empty(dtype=np.uint32, shape=(num_verts, 4))  # 4 joints for each vert for each set
+        for _ in range(num_joint_sets)
+    ]
+    vert_weights = [
+        np.empty(dtype=np.float32, shape=(num_verts, 4))  # 4 weights for each vert for each set
+        for _ in range(num_joint_sets)
+    ]
+    sk_vert_locs = [
+        np.empty(dtype=np.float32, shape=(num_verts, 3))  # coordinate for each vert for each shapekey
+        for _ in range(num_shapekeys)
+    ]
+    attribute_data = [
+        np.empty(
+            dtype=ComponentType.to_numpy_dtype(attribute_component_type[attr]),
+            shape=(num_verts, DataType.num_elements(attribute_type[attr])))
+        for attr in attributes
+    ]
+
+    # Second pass: decode the attributes of every primitive straight into
+    # their slices of the output arrays.
+
+    vert_index_base = 0
+    loop_index_base = 0
+    edge_index_base = 0
+    corner_index_base = 0
+
+    for prim, indices, unique_indices, inv_indices, is_edges, is_tris in prim_indices:
+        vert_slice = slice(vert_index_base, vert_index_base + len(unique_indices))
+        corner_slice = slice(corner_index_base, corner_index_base + len(indices))
+
+        vs = decode_accessor(prim.attributes['POSITION'])
+        vert_locs[vert_slice] = vs[unique_indices]
 
         if has_normals:
             if 'NORMAL' in prim.attributes:
-                ns = BinaryData.decode_accessor(gltf, prim.attributes['NORMAL'], cache=True)
-                ns = ns[unique_indices]
+                ns = decode_accessor(prim.attributes['NORMAL'])
+                vert_normals[vert_slice] = ns[unique_indices]
             else:
-                ns = np.zeros((len(unique_indices), 3), dtype=np.float32)
-            vert_normals = np.concatenate((vert_normals, ns))
+                vert_normals[vert_slice] = 0
 
         for i in range(num_joint_sets):
             if ('JOINTS_%d' % i) in prim.attributes and ('WEIGHTS_%d' % i) in prim.attributes:
-                js = BinaryData.decode_accessor(gltf, prim.attributes['JOINTS_%d' % i], cache=True)
-                ws = BinaryData.decode_accessor(gltf, prim.attributes['WEIGHTS_%d' % i], cache=True)
-                js = js[unique_indices]
-                ws = ws[unique_indices]
+                js = decode_accessor(prim.attributes['JOINTS_%d' % i])
+                ws = decode_accessor(prim.attributes['WEIGHTS_%d' % i])
+                vert_joints[i][vert_slice] = js[unique_indices]
+                vert_weights[i][vert_slice] = ws[unique_indices]
             else:
-                js = np.zeros((len(unique_indices), 4), dtype=np.uint32)
-                ws = np.zeros((len(unique_indices), 4), dtype=np.float32)
-            vert_joints[i] = np.concatenate((vert_joints[i], js))
-            vert_weights[i] = np.concatenate((vert_weights[i], ws))
+                vert_joints[i][vert_slice] = 0
+                vert_weights[i][vert_slice] = 0
 
         sk_i = 0
         for sk, sk_name in enumerate(pymesh.shapekey_names):
             if sk_name is None:
                 continue
             if prim.targets and 'POSITION' in prim.targets[sk]:
-                morph_vs = BinaryData.decode_accessor(gltf, prim.targets[sk]['POSITION'], cache=True)
-                morph_vs = morph_vs[unique_indices]
+                morph_vs = decode_accessor(prim.targets[sk]['POSITION'])
+                sk_vert_locs[sk_i][vert_slice] = morph_vs[unique_indices]
             else:
-                morph_vs = np.zeros((len(unique_indices), 3), dtype=np.float32)
-            sk_vert_locs[sk_i] = np.concatenate((sk_vert_locs[sk_i], morph_vs))
+                sk_vert_locs[sk_i][vert_slice] = 0
             sk_i += 1
 
         # inv_indices are the indices into the verts just for this prim;
@@ -239,55 +278,51 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
         prim_vidxs = inv_indices.astype(np.uint32, copy=False)
         prim_vidxs += vert_index_base  # offset for verts from previous prims
 
-        if edges is not None:
-            edge_vidxs = np.concatenate((edge_vidxs, prim_vidxs))
+        if is_edges:
+            edge_vidxs[edge_index_base:edge_index_base + len(prim_vidxs)] = prim_vidxs
+            edge_index_base += len(prim_vidxs)
 
-        if tris is not None:
+        if is_tris:
             prim.num_faces = len(indices) // 3
             num_faces += prim.num_faces
 
-            loop_vidxs = np.concatenate((loop_vidxs, prim_vidxs))
+            loop_slice = slice(loop_index_base, loop_index_base + len(indices))
+            loop_vidxs[loop_slice] = prim_vidxs
 
             # UV only if we have a face
             for uv_i in range(num_uvs):
                 if ('TEXCOORD_%d' % uv_i) in prim.attributes:
-                    uvs = BinaryData.decode_accessor(gltf, prim.attributes['TEXCOORD_%d' % uv_i], cache=True)
-                    uvs = uvs[indices]
+                    uvs = decode_accessor(prim.attributes['TEXCOORD_%d' % uv_i])
+                    loop_uvs[uv_i][loop_slice] = uvs[indices]
                 else:
-                    uvs = np.zeros((len(indices), 2), dtype=np.float32)
-                loop_uvs[uv_i] = np.concatenate((loop_uvs[uv_i], uvs))
+                    loop_uvs[uv_i][loop_slice] = 0
+
+            loop_index_base += len(indices)
 
         # We can have VC for points, lines, and tris
         for col_i in range(num_cols):
+            col_slice = corner_slice if vc_domains[col_i] == 'CORNER' else vert_slice
             if ('COLOR_%d' % col_i) in prim.attributes:
-                cols = BinaryData.decode_accessor(gltf, prim.attributes['COLOR_%d' % col_i], cache=True)
+                cols = decode_accessor(prim.attributes['COLOR_%d' % col_i])
                 if vc_domains[col_i] == 'CORNER':
                     cols = cols[indices]
                 else:
                     cols = cols[unique_indices]
                 if cols.shape[1] == 3:
                     cols = colors_rgb_to_rgba(cols)
+                loop_cols[col_i][col_slice] = cols
             else:
-                if vc_domains[col_i] == 'CORNER':
-                    cols = np.ones((len(indices), 4), dtype=np.float32)
-                else:
-                    cols = np.ones((len(unique_indices), 4), dtype=np.float32)
-            loop_cols[col_i] = np.concatenate((loop_cols[col_i], cols))
+                loop_cols[col_i][col_slice] = 1
 
         for idx, attr in enumerate(attributes):
             if attr in prim.attributes:
-                attr_data = BinaryData.decode_accessor(gltf, prim.attributes[attr], cache=True)
-                attribute_data[idx] = np.concatenate((attribute_data[idx], attr_data[unique_indices]))
+                attr_data = decode_accessor(prim.attributes[attr])
+                attribute_data[idx][vert_slice] = attr_data[unique_indices]
             else:
-                attr_data = np.zeros(
-                    (len(unique_indices), DataType.num_elements(attribute_type[attr])),
-                     dtype=ComponentType.to_numpy_dtype(attribute_component_type[attr])
-                )
-                attribute_data[idx] = np.concatenate((attribute_data[idx], attr_data))
+                attribute_data[idx][vert_slice] = 0
 
-    # Accessors are cached in case they are shared between primitives; clear
-    # the cache now that all prims are done.
-    gltf.decode_accessor_cache = {}
+        vert_index_base += len(unique_indices)
+        corner_index_base += len(indices)
 
     if gltf.import_settings['merge_vertices']:
         vert_locs, vert_normals, vert_joints, vert_weights, \
@@ -319,6 +354,205 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
     for uvs in loop_uvs:
         uvs_gltf_to_blender(uvs)
 
+    mesh_data = MeshData()
+    mesh_data.mesh_options = mesh_options
+    mesh_data.has_normals = has_normals
+    mesh_data.num_faces = num_faces
+    mesh_data.num_uvs = num_uvs
+    mesh_data.num_cols = num_cols
+    mesh_data.num_joint_sets = num_joint_sets
+    mesh_data.num_shapekeys = num_shapekeys
+    mesh_data.vc_domains = vc_domains
+    mesh_data.vert_locs = vert_locs
+    mesh_data.vert_normals = vert_normals
+    mesh_data.edge_vidxs = edge_vidxs
+    mesh_data.loop_vidxs = loop_vidxs
+    mesh_data.loop_uvs = loop_uvs
+    mesh_data.loop_cols = loop_cols
+    mesh_data.vert_joints = vert_joints
+    mesh_data.vert_weights = vert_weights
+    mesh_data.sk_vert_locs = sk_vert_locs
+    mesh_data.attributes = attributes
+    mesh_data.attribute_type = attribute_type
+    mesh_data.attribute_component_type = attribute_component_type
+    mesh_data.attribute_data = attribute_data
+
+    return mesh_data
+
+
+# Use a class here, to be able to pass data by reference to hook (to be able to change them inside hook)
+class IMPORT_mesh_options:
+    def __init__(self, skinning: bool = True, skin_into_bind_pose: bool = True):
+        self.skinning = skinning
+        self.skin_into_bind_pose = skin_into_bind_pose
+
+
+class MeshData:
+    """Mesh data decoded from the primitives, ready to be put into a Blender mesh."""
+    pass
+
+
+def decode_meshes(gltf):
+    """
+    Start decoding the primitives of the meshes used by the scene, ahead of
+    their creation.
+    Decoding is pure NumPy work, so it is run on a thread pool; the Blender
+    meshes are then filled on the main thread by do_primitives, that takes
+    each decoded mesh as its Blender mesh is created.
+    """
+    max_workers = gltf.import_settings['import_decode_threads'] or os.cpu_count() or 1
+    if max_workers <= 1:
+        return
+
+    # User extension hooks are expected to run in mesh creation order, with
+    # the Blender mesh at hand: keep decoding meshes one at a time then.
+    if gltf.import_user_extensions:
+        return
+
+    # Meshes are decoded in the order BlenderNode.create_vnode creates them
+    to_decode = []
+    stack = ['root']
+    while stack:
+        vnode = gltf.vnodes[stack.pop()]
+        stack.extend(reversed(vnode.children))
+
+        if vnode.mesh_node_idx is not None:
+            pynode = gltf.data.nodes[vnode.mesh_node_idx]
+            key = (pynode.mesh, pynode.skin)
+        elif vnode.type == VNode.Inst and vnode.mesh_idx is not None:
+            key = (vnode.mesh_idx, None)
+        else:
+            continue
+
+        if key[0] is None or not (0 <= key[0] < len(gltf.data.meshes)):
+            continue
+        if key not in to_decode:
+            to_decode.append(key)
+
+    if len(to_decode) <= 1:
+        return
+
+    gltf.mesh_decoder = MeshDecoder(gltf, to_decode, max_workers)
+
+
+def end_decoding_meshes(gltf):
+    """Stop decoding meshes ahead, and drop the meshes that were not taken."""
+    if gltf.mesh_decoder is not None:
+        gltf.mesh_decoder.shutdown()
+        gltf.mesh_decoder = None
+
+
+class MeshDecoder:
+    """
+    Decodes meshes on a thread pool, in creation order.
+
+    Only a window of meshes (twice the number of workers) is decoded ahead
+    of the mesh being created, so that decoded meshes waiting for their
+    creation don't use more memory than a few meshes.
+    """
+
+    def __init__(self, gltf, keys, max_workers):
+        self.gltf = gltf
+        self.keys = keys
+        self.next_key = 0
+        self.taken = set()
+        self.prepared_meshes = set()
+        self.futures = {}
+        self.window = 2 * max_workers
+
+        # Buffers are loaded on the main thread, workers only read them
+        for buffer_idx in range(len(gltf.data.buffers or [])):
+            if buffer_idx not in gltf.buffers:
+                gltf.load_buffer(buffer_idx)
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.__submit()
+
+    def __submit(self):
+        while len(self.futures) < self.window and self.next_key < len(self.keys):
+            key = self.keys[self.next_key]
+            self.next_key += 1
+            if key in self.taken:
+                continue
+
+            # Draco decoding adds new buffers to the glTF data: run it on the main thread
+            mesh_idx, skin_idx = key
+            if mesh_idx not in self.prepared_meshes:
+                prepare_primitives(self.gltf, self.gltf.data.meshes[mesh_idx], skin_idx)
+                self.prepared_meshes.add(mesh_idx)
+
+            self.futures[key] = self.executor.submit(decode_primitives, self.gltf, mesh_idx, skin_idx, IMPORT_mesh_options())
+
+    def take(self, key):
+        """
+        Returns the decoded data of a mesh, or None if it is not decoded ahead
+        (it is then decoded by the caller).
+        """
+        if key in self.taken:
+            return None
+        self.taken.add(key)
+
+        future = self.futures.pop(key, None)
+        mesh_data = future.result() if future is not None else None
+        self.__submit()
+        return mesh_data
+
+    def shutdown(self):
+        for future in self.futures.values():
+            future.cancel()
+        self.executor.shutdown(wait=True)
+        self.futures = {}
+
+
+def prepare_primitives(gltf, pymesh, skin_idx):
+    """Decompress primitives, so their accessors can be decoded."""
+    for prim in pymesh.primitives:
+        if 'POSITION' not in prim.attributes:
+            continue
+
+        if prim.extensions is not None and 'KHR_draco_mesh_compression' in prim.extensions:
+
+            gltf.log.info('Draco Decoder: Decode primitive {}'.format(pymesh.name or '[unnamed]'))
+            decode_primitive(gltf, prim)
+
+        import_user_extensions('gather_import_decode_primitive', gltf, pymesh, prim, skin_idx)
+
+
+def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
+    """Put all primitive data into the mesh."""
+    pymesh = gltf.data.meshes[mesh_idx]
+
+    # Meshes can already be decoded by decode_meshes
+    mesh_data = gltf.mesh_decoder.take((mesh_idx, skin_idx)) if gltf.mesh_decoder is not None else None
+    if mesh_data is None:
+        mesh_options = IMPORT_mesh_options()
+        import_user_extensions('gather_import_mesh_options', gltf, mesh_options, pymesh, skin_idx)
+
+        prepare_primitives(gltf, pymesh, skin_idx)
+        mesh_data = decode_primitives(gltf, mesh_idx, skin_idx, mesh_options)
+
+    mesh_options = mesh_data.mesh_options
+    has_normals = mesh_data.has_normals
+    num_faces = mesh_data.num_faces
+    num_uvs = mesh_data.num_uvs
+    num_cols = mesh_data.num_cols
+    num_joint_sets = mesh_data.num_joint_sets
+    num_shapekeys = mesh_data.num_shapekeys
+    vc_domains = mesh_data.vc_domains
+    vert_locs = mesh_data.vert_locs
+    vert_normals = mesh_data.vert_normals
+    edge_vidxs = mesh_data.edge_vidxs
+    loop_vidxs = mesh_data.loop_vidxs
+    loop_uvs = mesh_data.loop_uvs
+    loop_cols = mesh_data.loop_cols
+    vert_joints = mesh_data.vert_joints
+    vert_weights = mesh_data.vert_weights
+    sk_vert_locs = mesh_data.sk_vert_locs
+    attributes = mesh_data.attributes
+    attribute_type = mesh_data.attribute_type
+    attribute_component_type = mesh_data.attribute_component_type
+    attribute_data = mesh_data.attribute_data
+
     # ---------------
     # Start creating things
 
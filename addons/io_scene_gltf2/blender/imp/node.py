@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import bpy
+import numpy as np
 from mathutils import Vector, Matrix
 from ...io.imp.user_extensions import import_user_extensions
 from ..com.extras import set_extras
@@ -62,6 +63,9 @@ class BlenderNode():
         if vnode.mesh_node_idx is not None:
             obj = BlenderNode.create_mesh_object(gltf, vnode)
 
+        elif vnode.type == VNode.Inst and vnode.gpu_instances is not None:
+            obj = BlenderNode.create_gpu_instancer(gltf, vnode)
+
         elif vnode.type == VNode.Inst and vnode.mesh_idx is not None:
             obj = BlenderNode.create_mesh_object(gltf, vnode)
 
@@ -134,6 +138,83 @@ class BlenderNode():
 
         return obj
 
+    @staticmethod
+    def create_special_collection(gltf):
+        # Create a special collection (if not exists already)
+        # Content of this collection will not be exported
+        if BLENDER_GLTF_SPECIAL_COLLECTION not in bpy.data.collections:
+            bpy.data.collections.new(BLENDER_GLTF_SPECIAL_COLLECTION)
+            bpy.data.scenes[gltf.blender_scene].collection.children.link(bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION])
+            bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION].hide_viewport = True
+            bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION].hide_render = True
+
+    @staticmethod
+    def create_gpu_instancer(gltf, vnode):
+        """Create a single object for EXT_mesh_gpu_instancing, with one point per instance.
+
+        The mesh is instanced on the points with Geometry Nodes, using
+        the "rotation" and "scale" point attributes.
+        """
+        locs, rots, scales = vnode.gpu_instances
+
+        # The instanced mesh is stored in the special collection, so it is not exported
+        source = BlenderNode.create_mesh_object(gltf, vnode)
+        BlenderNode.create_special_collection(gltf)
+        bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION].objects.link(source)
+
+        name = vnode.name or vnode.default_name
+        mesh = bpy.data.meshes.new(name)
+        mesh.vertices.add(len(locs))
+        mesh.vertices.foreach_set('co', locs.astype(np.float32).reshape(-1))
+        attribute = mesh.attributes.new('rotation', 'QUATERNION', 'POINT')
+        attribute.data.foreach_set('value', rots.astype(np.float32).reshape(-1))
+        attribute = mesh.attributes.new('scale', 'FLOAT_VECTOR', 'POINT')
+        attribute.data.foreach_set('vector', scales.astype(np.float32).reshape(-1))
+        mesh.update()
+
+        obj = bpy.data.objects.new(name, mesh)
+        modifier = obj.modifiers.new('glTF GPU Instancing', 'NODES')
+        modifier.node_group = BlenderNode.create_instancing_node_group(source)
+
+        return obj
+
+    @staticmethod
+    def create_instancing_node_group(source):
+        group = bpy.data.node_groups.new('glTF GPU Instancing ' + source.name, 'GeometryNodeTree')
+        group.interface.new_socket('Geometry', in_out='INPUT', socket_type='NodeSocketGeometry')
+        group.interface.new_socket('Geometry', in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
+        group_input = group.nodes.new('NodeGroupInput')
+        group_input.location = (-400, 0)
+        group_output = group.nodes.new('NodeGroupOutput')
+        group_output.location = (400, 0)
+
+        object_info = group.nodes.new('GeometryNodeObjectInfo')
+        object_info.location = (-200, -100)
+        object_info.transform_space = 'ORIGINAL'
+        object_info.inputs['Object'].default_value = source
+
+        rotation = group.nodes.new('GeometryNodeInputNamedAttribute')
+        rotation.location = (-200, -300)
+        rotation.data_type = 'QUATERNION'
+        rotation.inputs['Name'].default_value = 'rotation'
+
+        scale = group.nodes.new('GeometryNodeInputNamedAttribute')
+        scale.location = (-200, -450)
+        scale.data_type = 'FLOAT_VECTOR'
+        scale.inputs['Name'].default_value = 'scale'
+
+        instance_on_points = group.nodes.new('GeometryNodeInstanceOnPoints')
+        instance_on_points.location = (100, 0)
+
+        group.links.new(group_input.outputs[0], instance_on_points.inputs['Points'])
+        group.links.new(object_info.outputs['Geometry'], instance_on_points.inputs['Instance'])
+        group.links.new(rotation.outputs['Attribute'], instance_on_points.inputs['Rotation'])
+        group.links.new(scale.outputs['Attribute'], instance_on_points.inputs['Scale'])
+        group.links.new(instance_on_points.outputs['Instances'], group_output.inputs[0])
+
+        return group
+
     @staticmethod
     def armature_display(gltf, obj):
         obj.show_in_front = True
@@ -143,13 +224,7 @@ class BlenderNode():
         if gltf.import_settings['disable_bone_shape'] is True:
             return
 
-        # Create a special collection (if not exists already)
-        # Content of this collection will not be exported
-        if BLENDER_GLTF_SPECIAL_COLLECTION not in bpy.data.collections:
-            bpy.data.collections.new(BLENDER_GLTF_SPECIAL_COLLECTION)
-            bpy.data.scenes[gltf.blender_scene].collection.children.link(bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION])
-            bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION].hide_viewport = True
-            bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION].hide_render = True
+        BlenderNode.create_special_collection(gltf)
 
         # Create an icosphere, and assign it to the collection
         bpy.ops.mesh.primitive_ico_sphere_add(radius=1, enter_editmode=False, align='WORLD', location=(0, 0, 0), scale=(1, 1, 1))
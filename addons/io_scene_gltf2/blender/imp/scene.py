@@ -15,6 +15,7 @@
 import bpy
 
 from .node import BlenderNode
+from .mesh import BlenderMesh
 from .animation import BlenderAnimation
 from .vnode import VNode, compute_vnodes
 from ..com.extras import set_extras
@@ -41,8 +42,12 @@ class BlenderScene():
 
         compute_vnodes(gltf)
 
-        gltf.display_current_node = 0  # for debugging
-        BlenderNode.create_vnode(gltf, 'root')
+        BlenderMesh.decode_all(gltf)
+        try:
+            gltf.display_current_node = 0  # for debugging
+            BlenderNode.create_vnode(gltf, 'root')
+        finally:
+            BlenderMesh.end_decoding(gltf)
 
         # User extensions before scene creation
         gltf_scene = None
@@ -13,9 +13,10 @@
 # limitations under the License.
 
 import bpy
+import numpy as np
 from mathutils import Vector, Quaternion, Matrix
 from ...io.imp.gltf2_io_binary import BinaryData
-from ..com.gltf2_blender_math import scale_rot_swap_matrix, nearby_signed_perm_matrix
+from ..com.gltf2_blender_math import scale_rot_swap_matrix, nearby_signed_perm_matrix, multiply_quaternions
 
 def compute_vnodes(gltf):
     """Computes the tree of virtual nodes.
@@ -76,17 +77,19 @@ class VNode:
             m @ s,
         )
 
+    # Batch versions of trs(), operating on (n, 3) / (n, 4) numpy arrays
+
     def base_locs_to_final_locs(self, base_locs):
-        ra = self.rotation_after
-        return [ra @ loc for loc in base_locs]
+        ra = np.array(self.rotation_after.to_matrix())
+        return base_locs @ ra.T
 
     def base_rots_to_final_rots(self, base_rots):
-        ra, rb = self.rotation_after, self.rotation_before
-        return [ra @ rot @ rb for rot in base_rots]
+        ra, rb = np.array(self.rotation_after), np.array(self.rotation_before)
+        return multiply_quaternions(multiply_quaternions(ra, base_rots), rb)
 
     def base_scales_to_final_scales(self, base_scales):
-        m = scale_rot_swap_matrix(self.rotation_before)
-        return [m @ scale for scale in base_scales]
+        m = np.array(scale_rot_swap_matrix(self.rotation_before))
+        return base_scales @ m.T
 
 def local_rotation(gltf, vnode_id, rot):
     """Appends a local rotation to vnode's world transform:
@@ -143,7 +146,9 @@ def init_vnodes(gltf):
         gltf.vnodes[root].parent = 'root'
 
 def manage_gpu_instancing(gltf, vnode, i, ext, mesh_id):
-
+    if gltf.import_settings['import_gpu_instances'] == 'INSTANCER':
+        manage_gpu_instancing_instancer(gltf, vnode, i, ext, mesh_id)
+        return
 
     trans_list = BinaryData.get_data_from_accessor(gltf, ext['attributes'].get('TRANSLATION', None)) \
             if ext['attributes'].get('TRANSLATION', None) is not None else None
@@ -186,10 +191,47 @@ def manage_gpu_instancing(gltf, vnode, i, ext, mesh_id):
         inst_vnode.children = []
         inst_vnode.base_trs = get_inst_trs(gltf, trans_list[inst], rot_list[inst], scale_list[inst])
         inst_vnode.mesh_idx = mesh_id
+        inst_vnode.gpu_instances = None
 
         vnode.children.append(inst_id)
 
 
+def manage_gpu_instancing_instancer(gltf, vnode, i, ext, mesh_id):
+    # Create a single vnode, holding TRS of all instances as arrays
+    attributes = {}
+    for attr in ['TRANSLATION', 'ROTATION', 'SCALE']:
+        if ext['attributes'].get(attr, None) is not None:
+            # Work on a float copy, as decoded data can be read-only
+            attributes[attr] = BinaryData.decode_accessor(gltf, ext['attributes'][attr]).astype(np.float64)
+
+    # We can't have only custom properties
+    if not attributes:
+        return
+
+    length = len(next(iter(attributes.values())))
+    assert all(len(values) == length for values in attributes.values())
+
+    locs = attributes.get('TRANSLATION', np.zeros((length, 3)))
+    rots = attributes.get('ROTATION', np.tile([0.0, 0.0, 0.0, 1.0], (length, 1)))
+    scales = attributes.get('SCALE', np.ones((length, 3)))
+
+    gltf.locs_batch_gltf_to_blender(locs)
+    gltf.quaternions_batch_gltf_to_blender(rots)
+    gltf.scales_batch_gltf_to_blender(scales)
+
+    inst_id = '%d' % i + ".instances"
+    inst_vnode = VNode()
+    inst_vnode.type = VNode.Inst
+    gltf.vnodes[inst_id] = inst_vnode
+    inst_vnode.name = None
+    inst_vnode.default_name = 'Node_' + inst_id
+    inst_vnode.children = []
+    inst_vnode.mesh_idx = mesh_id
+    inst_vnode.gpu_instances = (locs, rots, scales)
+
+    vnode.children.append(inst_id)
+
+
 def get_inst_trs(gltf, trans, rot, scale):
     t = gltf.loc_gltf_to_blender(trans or [0, 0, 0])
     r = gltf.quaternion_gltf_to_blender(rot or [0, 0, 0, 1])
@@ -17,6 +17,10 @@
 #
 
 import time
+import json
+import functools
+import threading
+import contextlib
 import logging
 import logging.handlers
 
@@ -73,6 +77,89 @@ def profile_end(label=None):
     print('PROFILE', output)
 
 
+class ExportProfiler:
+    """Collect wall time, call counts and produced bytes of export stages.
+
+    Times are inclusive: a stage running inside another one is also counted
+    in the outer stage.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.start = time.perf_counter()
+        self.__lock = threading.Lock()
+
+    def record(self, stage, elapsed, produced_bytes=0, object_name=None):
+        with self.__lock:
+            if stage not in self.stages:
+                self.stages[stage] = {'time': 0.0, 'calls': 0, 'bytes': 0, 'objects': {}}
+            records = [self.stages[stage]]
+            if object_name is not None:
+                if object_name not in self.stages[stage]['objects']:
+                    self.stages[stage]['objects'][object_name] = {'time': 0.0, 'calls': 0, 'bytes': 0}
+                records.append(self.stages[stage]['objects'][object_name])
+            for record in records:
+                record['time'] += elapsed
+                record['calls'] += 1
+                record['bytes'] += produced_bytes
+
+    @contextlib.contextmanager
+    def stage(self, stage, object_name=None):
+        """Record the code run in the with block. The yielded dict can receive produced 'bytes'."""
+        result = {'bytes': 0}
+        start = time.perf_counter()
+        try:
+            yield result
+        finally:
+            self.record(stage, time.perf_counter() - start, result['bytes'], object_name)
+
+    def to_dict(self):
+        return {
+            'total_time': time.perf_counter() - self.start,
+            'stages': self.stages
+        }
+
+    def save(self, filepath):
+        with open(filepath, 'w', encoding='utf8') as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+
+
+def profiled(stage, object_name=None, produced_bytes=None):
+    """Decorator recording calls of an export function in the profiler, when profiling is enabled.
+
+    object_name is called with the arguments of the function, produced_bytes with its result.
+    Profiling never makes the export fail: when they raise, the error is logged.
+    """
+    def metric(f, default, export_settings, *args, **kwargs):
+        try:
+            return f(*args, **kwargs)
+        except Exception as e:
+            if export_settings.get('log') is not None:
+                export_settings['log'].warning("Profiling of '{}' failed: {!r}".format(stage, e))
+            return default
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            export_settings = kwargs['export_settings'] if 'export_settings' in kwargs else args[-1]
+            profiler = export_settings.get('profiler')
+            if profiler is None:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            profiler.record(
+                stage,
+                elapsed,
+                metric(produced_bytes, 0, export_settings, result) if produced_bytes is not None else 0,
+                metric(object_name, None, export_settings, *args, **kwargs) if object_name is not None else None
+            )
+            return result
+        return wrapper
+    return decorator
+
+
 class Log:
     def __init__(self, loglevel):
         self.logger = logging.getLogger('glTFImporter')
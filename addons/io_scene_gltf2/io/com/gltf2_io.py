@@ -16,7 +16,8 @@
 # command used:
 # quicktype --src glTF.schema.json --src-lang schema -t gltf --lang python --python-version 3.5
 
-# TODO: add __slots__ to all classes by extending the generator
+# NOTE: __slots__ were added to all classes. The ones the importer stores its own
+# data on (blender_name, num_faces, animations, ...) also keep a __dict__.
 
 # TODO: REMOVE traceback import
 
@@ -25,7 +26,9 @@
 # NOTE: this file is modified for mix/max accessor value check. See
 # https://github.com/KhronosGroup/glTF-Blender-IO/pull/2338/commits/5178b5f61ab942704b85ff51262a3d595e70d2b5
 
+import functools
 import sys
+import threading
 import traceback
 
 from ...io.com import debug as gltf2_io_debug
@@ -73,6 +76,78 @@ def from_list(f, x):
     return [f(y) for y in x]
 
 
+class LazyList(list):
+    """List of glTF properties, kept as their JSON dicts until they are read.
+
+    Each property is built with f on first access, and stored in place of its dict.
+    Methods that read several items (index, in, ==, reversed, copy, ...) build
+    all of them first, so raw dicts are never exposed. Building is locked, so
+    that threads reading the same item share one property.
+    """
+
+    __slots__ = ('f', 'lock')
+
+    def __init__(self, f, x):
+        super().__init__(x)
+        self.f = f
+        self.lock = threading.Lock()
+
+    def __build(self, index):
+        item = super().__getitem__(index)
+        if isinstance(item, dict):
+            with self.lock:
+                # Another thread may have built it meanwhile
+                item = super().__getitem__(index)
+                if isinstance(item, dict):
+                    item = self.f(item)
+                    super().__setitem__(index, item)
+        return item
+
+    def materialize(self):
+        """Builds all items, and returns the list."""
+        for i in range(len(self)):
+            self.__build(i)
+        return self
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.__build(i) for i in range(*index.indices(len(self)))]
+        return self.__build(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.__build(i)
+
+    def __reduce_ex__(self, protocol):
+        # Copied and pickled as a plain list of properties
+        return list, (list(self),)
+
+
+def __materialized(name):
+    method = getattr(list, name)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.materialize()
+        for arg in args:
+            if isinstance(arg, LazyList):
+                arg.materialize()
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+for name in ['__contains__', '__eq__', '__ne__', '__lt__', '__le__', '__gt__', '__ge__', '__add__', '__iadd__',
+             '__mul__', '__rmul__', '__imul__', '__reversed__', '__repr__', 'copy', 'count', 'index', 'pop', 'remove',
+             'sort']:
+    setattr(LazyList, name, __materialized(name))
+del name
+
+
+def from_lazy_list(f, x):
+    assert isinstance(x, list)
+    return LazyList(f, x)
+
+
 def from_float(x):
     assert isinstance(x, (float, int)) and not isinstance(x, bool)
     return float(x)
@@ -119,6 +194,8 @@ class AccessorSparseIndices:
     Indices of those attributes that deviate from their initialization value.
     """
 
+    __slots__ = ('buffer_view', 'byte_offset', 'component_type', 'extensions', 'extras')
+
     def __init__(self, buffer_view, byte_offset, component_type, extensions, extras):
         self.buffer_view = buffer_view
         self.byte_offset = byte_offset
@@ -157,6 +234,8 @@ class AccessorSparseValues:
     accessor attributes pointed by `accessor.sparse.indices`.
     """
 
+    __slots__ = ('buffer_view', 'byte_offset', 'extensions', 'extras')
+
     def __init__(self, buffer_view, byte_offset, extensions, extras):
         self.buffer_view = buffer_view
         self.byte_offset = byte_offset
@@ -186,6 +265,8 @@ class AccessorSparseValues:
 class AccessorSparse:
     """Sparse storage of attributes that deviate from their initialization value."""
 
+    __slots__ = ('count', 'extensions', 'extras', 'indices', 'values')
+
     def __init__(self, count, extensions, extras, indices, values):
         self.count = count
         self.extensions = extensions
@@ -221,6 +302,9 @@ class Accessor:
     WebGL's `vertexAttribPointer()` defines an attribute in a buffer.
     """
 
+    __slots__ = ('buffer_view', 'byte_offset', 'component_type', 'count', 'extensions', 'extras', 'max', 'min', 'name',
+                 'normalized', 'sparse', 'type')
+
     def __init__(self, buffer_view, byte_offset, component_type, count, extensions, extras, max, min, name, normalized,
                  sparse, type):
         self.buffer_view = buffer_view
@@ -279,6 +363,8 @@ class AnimationChannelTarget:
     The index of the node and TRS property that an animation channel targets.
     """
 
+    __slots__ = ('extensions', 'extras', 'node', 'path')
+
     def __init__(self, extensions, extras, node, path):
         self.extensions = extensions
         self.extras = extras
@@ -308,6 +394,8 @@ class AnimationChannelTarget:
 class AnimationChannel:
     """Targets an animation's sampler at a node's property."""
 
+    __slots__ = ('extensions', 'extras', 'sampler', 'target')
+
     def __init__(self, extensions, extras, sampler, target):
         self.extensions = extensions
         self.extras = extras
@@ -339,6 +427,8 @@ class AnimationSampler:
     graph (but not its target).
     """
 
+    __slots__ = ('extensions', 'extras', 'input', 'interpolation', 'output')
+
     def __init__(self, extensions, extras, input, interpolation, output):
         self.extensions = extensions
         self.extras = extras
@@ -371,6 +461,8 @@ class AnimationSampler:
 class Animation:
     """A keyframe animation."""
 
+    __slots__ = ('channels', 'extensions', 'extras', 'name', 'samplers', '__dict__')
+
     def __init__(self, channels, extensions, extras, name, samplers):
         self.channels = channels
         self.extensions = extensions
@@ -403,6 +495,8 @@ class Animation:
 class Asset:
     """Metadata about the glTF asset."""
 
+    __slots__ = ('copyright', 'extensions', 'extras', 'generator', 'min_version', 'version')
+
     def __init__(self, copyright, extensions, extras, generator, min_version, version):
         self.copyright = copyright
         self.extensions = extensions
@@ -438,6 +532,8 @@ class Asset:
 class BufferView:
     """A view into a buffer generally representing a subset of the buffer."""
 
+    __slots__ = ('buffer', 'byte_length', 'byte_offset', 'byte_stride', 'extensions', 'extras', 'name', 'target')
+
     def __init__(self, buffer, byte_length, byte_offset, byte_stride, extensions, extras, name, target):
         self.buffer = buffer
         self.byte_length = byte_length
@@ -479,6 +575,8 @@ class BufferView:
 class Buffer:
     """A buffer points to binary geometry, animation, or skins."""
 
+    __slots__ = ('byte_length', 'extensions', 'extras', 'name', 'uri')
+
     def __init__(self, byte_length, extensions, extras, name, uri):
         self.byte_length = byte_length
         self.extensions = extensions
@@ -511,6 +609,8 @@ class Buffer:
 class CameraOrthographic:
     """An orthographic camera containing properties to create an orthographic projection matrix."""
 
+    __slots__ = ('extensions', 'extras', 'xmag', 'ymag', 'zfar', 'znear')
+
     def __init__(self, extensions, extras, xmag, ymag, zfar, znear):
         self.extensions = extensions
         self.extras = extras
@@ -546,6 +646,8 @@ class CameraOrthographic:
 class CameraPerspective:
     """A perspective camera containing properties to create a perspective projection matrix."""
 
+    __slots__ = ('aspect_ratio', 'extensions', 'extras', 'yfov', 'zfar', 'znear')
+
     def __init__(self, aspect_ratio, extensions, extras, yfov, zfar, znear):
         self.aspect_ratio = aspect_ratio
         self.extensions = extensions
@@ -583,6 +685,8 @@ class Camera:
     camera in the scene.
     """
 
+    __slots__ = ('extensions', 'extras', 'name', 'orthographic', 'perspective', 'type', '__dict__')
+
     def __init__(self, extensions, extras, name, orthographic, perspective, type):
         self.extensions = extensions
         self.extras = extras
@@ -620,6 +724,8 @@ class Image:
     index. `mimeType` is required in the latter case.
     """
 
+    __slots__ = ('buffer_view', 'extensions', 'extras', 'mime_type', 'name', 'uri', '__dict__')
+
     def __init__(self, buffer_view, extensions, extras, mime_type, name, uri):
         self.buffer_view = buffer_view
         self.extensions = extensions
@@ -662,6 +768,8 @@ class TextureInfo:
     Reference to a texture.
     """
 
+    __slots__ = ('extensions', 'extras', 'index', 'tex_coord', '__dict__')
+
     def __init__(self, extensions, extras, index, tex_coord):
         self.extensions = extensions
         self.extras = extras
@@ -694,6 +802,8 @@ class MaterialNormalTextureInfoClass:
     Reference to a texture.
     """
 
+    __slots__ = ('extensions', 'extras', 'index', 'scale', 'tex_coord', '__dict__')
+
     def __init__(self, extensions, extras, index, scale, tex_coord):
         self.extensions = extensions
         self.extras = extras
@@ -729,6 +839,8 @@ class MaterialOcclusionTextureInfoClass:
     Reference to a texture.
     """
 
+    __slots__ = ('extensions', 'extras', 'index', 'strength', 'tex_coord', '__dict__')
+
     def __init__(self, extensions, extras, index, strength, tex_coord):
         self.extensions = extensions
         self.extras = extras
@@ -767,6 +879,9 @@ class MaterialPBRMetallicRoughness:
     from Physically-Based Rendering (PBR) methodology.
     """
 
+    __slots__ = ('base_color_factor', 'base_color_texture', 'extensions', 'extras', 'metallic_factor',
+                 'metallic_roughness_texture', 'roughness_factor', '__dict__')
+
     def __init__(self, base_color_factor, base_color_texture, extensions, extras, metallic_factor,
                  metallic_roughness_texture, roughness_factor):
         self.base_color_factor = base_color_factor
@@ -809,6 +924,9 @@ class MaterialPBRMetallicRoughness:
 class Material:
     """The material appearance of a primitive."""
 
+    __slots__ = ('alpha_cutoff', 'alpha_mode', 'double_sided', 'emissive_factor', 'emissive_texture', 'extensions',
+                 'extras', 'name', 'normal_texture', 'occlusion_texture', 'pbr_metallic_roughness', '__dict__')
+
     def __init__(self, alpha_cutoff, alpha_mode, double_sided, emissive_factor, emissive_texture, extensions, extras,
                  name, normal_texture, occlusion_texture, pbr_metallic_roughness):
         self.alpha_cutoff = alpha_cutoff
@@ -866,6 +984,8 @@ class Material:
 class MeshPrimitive:
     """Geometry to be rendered with the given material."""
 
+    __slots__ = ('attributes', 'extensions', 'extras', 'indices', 'material', 'mode', 'targets', '__dict__')
+
     def __init__(self, attributes, extensions, extras, indices, material, mode, targets):
         self.attributes = attributes
         self.extensions = extensions
@@ -907,6 +1027,8 @@ class Mesh:
     places the mesh in the scene.
     """
 
+    __slots__ = ('extensions', 'extras', 'name', 'primitives', 'weights', '__dict__')
+
     def __init__(self, extensions, extras, name, primitives, weights):
         self.extensions = extensions
         self.extras = extras
@@ -947,6 +1069,9 @@ class Node:
     may be present; `matrix` will not be present.
     """
 
+    __slots__ = ('camera', 'children', 'extensions', 'extras', 'matrix', 'mesh', 'name', 'rotation', 'scale', 'skin',
+                 'translation', 'weights', '__dict__')
+
     def __init__(self, camera, children, extensions, extras, matrix, mesh, name, rotation, scale, skin, translation,
                  weights):
         self.camera = camera
@@ -1002,6 +1127,8 @@ class Node:
 class Sampler:
     """Texture sampler properties for filtering and wrapping modes."""
 
+    __slots__ = ('extensions', 'extras', 'mag_filter', 'min_filter', 'name', 'wrap_s', 'wrap_t')
+
     def __init__(self, extensions, extras, mag_filter, min_filter, name, wrap_s, wrap_t):
         self.extensions = extensions
         self.extras = extras
@@ -1040,6 +1167,8 @@ class Sampler:
 class Scene:
     """The root nodes of a scene."""
 
+    __slots__ = ('extensions', 'extras', 'name', 'nodes')
+
     def __init__(self, extensions, extras, name, nodes):
         self.extensions = extensions
         self.extras = extras
@@ -1069,6 +1198,8 @@ class Scene:
 class Skin:
     """Joints and matrices defining a skin."""
 
+    __slots__ = ('extensions', 'extras', 'inverse_bind_matrices', 'joints', 'name', 'skeleton')
+
     def __init__(self, extensions, extras, inverse_bind_matrices, joints, name, skeleton):
         self.extensions = extensions
         self.extras = extras
@@ -1104,6 +1235,8 @@ class Skin:
 class Texture:
     """A texture and its sampler."""
 
+    __slots__ = ('extensions', 'extras', 'name', 'sampler', 'source')
+
     def __init__(self, extensions, extras, name, sampler, source):
         self.extensions = extensions
         self.extras = extras
@@ -1136,6 +1269,10 @@ class Texture:
 class Gltf:
     """The root object for a glTF asset."""
 
+    __slots__ = ('accessors', 'animations', 'asset', 'buffers', 'buffer_views', 'cameras', 'extensions',
+                 'extensions_required', 'extensions_used', 'extras', 'images', 'materials', 'meshes', 'nodes',
+                 'samplers', 'scene', 'scenes', 'skins', 'textures')
+
     def __init__(self, accessors, animations, asset, buffers, buffer_views, cameras, extensions, extensions_required,
                  extensions_used, extras, images, materials, meshes, nodes, samplers, scene, scenes, skins, textures):
         self.accessors = accessors
@@ -1161,26 +1298,27 @@ class Gltf:
     @staticmethod
     def from_dict(obj):
         assert isinstance(obj, dict)
-        accessors = from_union([lambda x: from_list(Accessor.from_dict, x), from_none], obj.get("accessors"))
-        animations = from_union([lambda x: from_list(Animation.from_dict, x), from_none], obj.get("animations"))
+        accessors = from_union([lambda x: from_lazy_list(Accessor.from_dict, x), from_none], obj.get("accessors"))
+        animations = from_union([lambda x: from_lazy_list(Animation.from_dict, x), from_none], obj.get("animations"))
         asset = Asset.from_dict(obj.get("asset"))
-        buffers = from_union([lambda x: from_list(Buffer.from_dict, x), from_none], obj.get("buffers"))
-        buffer_views = from_union([lambda x: from_list(BufferView.from_dict, x), from_none], obj.get("bufferViews"))
-        cameras = from_union([lambda x: from_list(Camera.from_dict, x), from_none], obj.get("cameras"))
+        buffers = from_union([lambda x: from_lazy_list(Buffer.from_dict, x), from_none], obj.get("buffers"))
+        buffer_views = from_union([lambda x: from_lazy_list(BufferView.from_dict, x), from_none],
+                                  obj.get("bufferViews"))
+        cameras = from_union([lambda x: from_lazy_list(Camera.from_dict, x), from_none], obj.get("cameras"))
         extensions = from_union([lambda x: from_dict(lambda x: from_dict(lambda x: x, x), x), from_none],
                                 obj.get("extensions"))
         extensions_required = from_union([lambda x: from_list(from_str, x), from_none], obj.get("extensionsRequired"))
         extensions_used = from_union([lambda x: from_list(from_str, x), from_none], obj.get("extensionsUsed"))
         extras = obj.get("extras")
-        images = from_union([lambda x: from_list(Image.from_dict, x), from_none], obj.get("images"))
-        materials = from_union([lambda x: from_list(Material.from_dict, x), from_none], obj.get("materials"))
-        meshes = from_union([lambda x: from_list(Mesh.from_dict, x), from_none], obj.get("meshes"))
-        nodes = from_union([lambda x: from_list(Node.from_dict, x), from_none], obj.get("nodes"))
-        samplers = from_union([lambda x: from_list(Sampler.from_dict, x), from_none], obj.get("samplers"))
+        images = from_union([lambda x: from_lazy_list(Image.from_dict, x), from_none], obj.get("images"))
+        materials = from_union([lambda x: from_lazy_list(Material.from_dict, x), from_none], obj.get("materials"))
+        meshes = from_union([lambda x: from_lazy_list(Mesh.from_dict, x), from_none], obj.get("meshes"))
+        nodes = from_union([lambda x: from_lazy_list(Node.from_dict, x), from_none], obj.get("nodes"))
+        samplers = from_union([lambda x: from_lazy_list(Sampler.from_dict, x), from_none], obj.get("samplers"))
         scene = from_union([from_int, from_none], obj.get("scene"))
-        scenes = from_union([lambda x: from_list(Scene.from_dict, x), from_none], obj.get("scenes"))
-        skins = from_union([lambda x: from_list(Skin.from_dict, x), from_none], obj.get("skins"))
-        textures = from_union([lambda x: from_list(Texture.from_dict, x), from_none], obj.get("textures"))
+        scenes = from_union([lambda x: from_lazy_list(Scene.from_dict, x), from_none], obj.get("scenes"))
+        skins = from_union([lambda x: from_lazy_list(Skin.from_dict, x), from_none], obj.get("skins"))
+        textures = from_union([lambda x: from_lazy_list(Texture.from_dict, x), from_none], obj.get("textures"))
         return Gltf(accessors, animations, asset, buffers, buffer_views, cameras, extensions, extensions_required,
                     extensions_used, extras, images, materials, meshes, nodes, samplers, scene, scenes, skins, textures)
 
@@ -14,23 +14,103 @@
 
 import typing
 import array
+import hashlib
+import os
+import shutil
+from concurrent.futures import Future
 from ...io.com import constants as gltf2_io_constants
 
+COPY_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+class SourceFile:
+    """
+    An existing file, exported as is: it is copied or streamed to the output
+    when written, and never fully read in memory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.byte_length = os.path.getsize(path)
+
+    def __eq__(self, other):
+        return isinstance(other, SourceFile) and self.path == other.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+    def read(self) -> bytes:
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def digest(self) -> bytes:
+        """Same digest as BinaryData.digest of the file content, computed chunk by chunk."""
+        h = hashlib.blake2b(digest_size=20)
+        with open(self.path, 'rb') as f:
+            for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b''):
+                h.update(chunk)
+        return h.digest()
+
+    def write_to(self, file):
+        """Copy the file content to an opened binary file, chunk by chunk."""
+        with open(self.path, 'rb') as f:
+            shutil.copyfileobj(f, file, COPY_CHUNK_SIZE)
+
+    def copy_to(self, path: str):
+        """Copy the file, with OS-level copy when available."""
+        try:
+            shutil.copyfile(self.path, path)
+        except shutil.SameFileError:
+            pass
+
 
 class BinaryData:
     """Store for gltf binary data that can later be stored in a buffer."""
 
-    def __init__(self, data: bytes, bufferViewTarget=None):
-        if not isinstance(data, bytes):
+    def __init__(self, data: typing.Union[bytes, Future, SourceFile], bufferViewTarget=None):
+        # data can be a Future (data still being computed, eg. an image being encoded),
+        # or a SourceFile (data of an existing file, eg. a texture file)
+        if not isinstance(data, (bytes, Future, SourceFile)):
             raise TypeError("Data is not a bytes array")
-        self.data = data
+        self.__data = data
+        # Pending data is compared by identity, as its content is not known yet
+        self.__key = data
         self.bufferViewTarget = bufferViewTarget
+        self.__digest = None
 
     def __eq__(self, other):
-        return self.data == other.data
+        return self.__key == other.__key
 
     def __hash__(self):
-        return hash(self.data)
+        return hash(self.__key)
+
+    def __deepcopy__(self, memo):
+        # Data is immutable (and a Future can't be copied): copies share it
+        return self
+
+    @property
+    def data(self):
+        """The data, waiting for it if it is still being computed. Prefer source_file for file data."""
+        if isinstance(self.__data, Future):
+            self.__data = self.__data.result()
+        if isinstance(self.__data, SourceFile):
+            return self.__data.read()
+        return self.__data
+
+    @property
+    def source_file(self) -> typing.Optional[SourceFile]:
+        """The file the data is in, if it is not in memory."""
+        return self.__data if isinstance(self.__data, SourceFile) else None
+
+    @property
+    def digest(self):
+        """Content digest of the data, computed once, without copying it."""
+        if self.__digest is None:
+            if self.source_file is not None:
+                self.__digest = self.source_file.digest()
+            else:
+                self.__digest = hashlib.blake2b(memoryview(self.data), digest_size=20).digest()
+        return self.__digest
 
     @classmethod
     def from_list(cls, lst: typing.List[typing.Any], gltf_component_type: gltf2_io_constants.ComponentType, bufferViewTarget=None):
@@ -39,4 +119,6 @@ class BinaryData:
 
     @property
     def byte_length(self):
+        if self.source_file is not None:
+            return self.source_file.byte_length
         return len(self.data)
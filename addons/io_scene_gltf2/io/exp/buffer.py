@@ -13,30 +13,52 @@
 # limitations under the License.
 
 import base64
+import shutil
+import tempfile
 
 from ...io.com import gltf2_io
 from ...io.exp import binary_data as gltf2_io_binary_data
 
+# Binary data is kept in memory up to this size, then spilled to a temporary file
+SPOOL_MAX_SIZE = 64 * 1024 * 1024
+COPY_CHUNK_SIZE = 16 * 1024 * 1024
+
 
 class Buffer:
     """Class representing binary data for use in a glTF file as 'buffer' property."""
 
     def __init__(self, buffer_index=0, initial_data=None):
-        self.__data = bytearray(b"")
+        self.__data = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self.__byte_length = 0
+        # Buffer views already written, by content, so identical data is stored only once
+        self.__views = {}
         if initial_data is not None:
-            self.__data = bytearray(initial_data.tobytes())
+            self.__write(initial_data.tobytes())
         self.__buffer_index = buffer_index
 
+    def __write(self, data):
+        self.__data.write(data)
+        self.__byte_length += len(data)
+
     def add_and_get_view(self, binary_data: gltf2_io_binary_data.BinaryData) -> gltf2_io.BufferView:
-        """Add binary data to the buffer. Return a glTF BufferView."""
-        offset = len(self.__data)
-        self.__data.extend(binary_data.data)
+        """Add binary data to the buffer. Return a glTF BufferView, shared by identical data."""
+        key = (binary_data.digest, binary_data.byte_length, binary_data.bufferViewTarget)
+        buffer_view = self.__views.get(key)
+        if buffer_view is not None:
+            return buffer_view
 
+        offset = self.__byte_length
         length = binary_data.byte_length
+        if binary_data.source_file is not None:
+            # Streamed from the file, without reading it in memory
+            binary_data.source_file.write_to(self.__data)
+            self.__byte_length += length
+        else:
+            self.__write(binary_data.data)
 
         # offsets should be a multiple of 4 --> therefore add padding if necessary
         padding = (4 - (length % 4)) % 4
-        self.__data.extend(b"\x00" * padding)
+        self.__write(b"\x00" * padding)
 
         buffer_view = gltf2_io.BufferView(
             buffer=self.__buffer_index,
@@ -48,17 +70,31 @@ class Buffer:
             name=None,
             target=binary_data.bufferViewTarget
         )
+        self.__views[key] = buffer_view
         return buffer_view
 
     @property
     def byte_length(self):
-        return len(self.__data)
+        return self.__byte_length
 
     def to_bytes(self):
-        return self.__data
+        """Read the whole buffer back into memory. Prefer write_to for large buffers."""
+        self.__data.seek(0)
+        data = self.__data.read()
+        self.__data.seek(0, 2)
+        return data
+
+    def write_to(self, file):
+        """Copy the buffer content to an opened binary file, chunk by chunk."""
+        self.__data.seek(0)
+        shutil.copyfileobj(self.__data, file, COPY_CHUNK_SIZE)
+        self.__data.seek(0, 2)
 
     def clear(self):
-        self.__data = b""
+        self.__data.close()
+        self.__data = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self.__byte_length = 0
+        self.__views = {}
 
     def to_embed_string(self):
-        return 'data:application/octet-stream;base64,' + base64.b64encode(self.__data).decode('ascii')
+        return 'data:application/octet-stream;base64,' + base64.b64encode(self.to_bytes()).decode('ascii')
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from ctypes import *
 from pathlib import Path
 
@@ -64,10 +66,31 @@ def encode_scene_primitives(scenes, export_settings):
     # Don't encode the same primitive multiple times.
     encoded_primitives_cache = {}
 
-    # Compress meshes into Draco buffers.
+    # Collect primitives in traversal order, so results are applied in a deterministic order.
+    primitives = []
     for scene in scenes:
         for node in scene.nodes:
-            __traverse_node(node, lambda node: __encode_node(node, dll, export_settings, encoded_primitives_cache))
+            __traverse_node(node, lambda node: __collect_node(node, primitives, export_settings))
+
+    # Primitives are shared when nodes are duplicated in Blender: encode each of them only once.
+    to_encode = []
+    for primitive in primitives:
+        if primitive in encoded_primitives_cache:
+            continue
+        encoded_primitives_cache[primitive] = None
+        if __is_encodable(primitive, export_settings):
+            to_encode.append(primitive)
+
+    # Native encoding releases the GIL, so primitives can be encoded in parallel.
+    max_workers = export_settings.get('gltf_draco_mesh_compression_threads', 1) or os.cpu_count() or 1
+    if max_workers > 1 and len(to_encode) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(to_encode))) as executor:
+            results = list(executor.map(lambda p: __encode_primitive(p, dll, export_settings), to_encode))
+    else:
+        results = [__encode_primitive(p, dll, export_settings) for p in to_encode]
+
+    for primitive, result in zip(to_encode, results):
+        __apply_encoded_primitive(primitive, result, export_settings, encoded_primitives_cache)
 
     # Release uncompressed index and attribute buffers.
     # Since those buffers may be shared across nodes, this step must happen after all meshes have been compressed.
@@ -97,38 +120,38 @@ def __traverse_node(node, f):
             __traverse_node(child, f)
 
 
-def __encode_node(node, dll, export_settings, encoded_primitives_cache):
+def __collect_node(node, primitives, export_settings):
     if node.mesh is not None:
         export_settings['log'].info('Draco encoder: Encoding mesh {}.'.format(node.name))
-        for primitive in node.mesh.primitives:
-            __encode_primitive(primitive, dll, export_settings, encoded_primitives_cache)
+        primitives.extend(node.mesh.primitives)
 
 
-def __encode_primitive(primitive, dll, export_settings, encoded_primitives_cache):
+def __is_encodable(primitive, export_settings):
     attributes = primitive.attributes
-    indices = primitive.indices
-
-    # Check if this primitive has already been encoded.
-    # This usually happens when nodes are duplicated in Blender, thus their indices/attributes are shared data.
-    if primitive in encoded_primitives_cache:
-        if primitive.extensions is None:
-            primitive.extensions = {}
-        primitive.extensions['KHR_draco_mesh_compression'] = encoded_primitives_cache[primitive]
-        return
 
     # Only do TRIANGLES primitives
     if primitive.mode not in [None, 4]:
-        return
+        return False
 
     if 'POSITION' not in attributes:
         export_settings['log'].warning('Draco encoder: Primitive without positions encountered. Skipping.')
-        return
-
-    positions = attributes['POSITION']
+        return False
 
     # Skip nodes without a position buffer, e.g. a primitive from a Blender shared instance.
     if attributes['POSITION'].buffer_view is None:
-        return
+        return False
+
+    return True
+
+
+def __encode_primitive(primitive, dll, export_settings):
+    """
+    Encode a primitive with Draco. May run on a worker thread, so the primitive is not modified here.
+    """
+    attributes = primitive.attributes
+    indices = primitive.indices
+
+    positions = attributes['POSITION']
 
     encoder = dll.encoderCreate(positions.count)
 
@@ -149,13 +172,26 @@ def __encode_primitive(primitive, dll, export_settings, encoded_primitives_cache
         export_settings['gltf_draco_generic_quantization'])
 
     preserve_triangle_order = primitive.targets is not None and len(primitive.targets) > 0
-    if not dll.encoderEncode(encoder, preserve_triangle_order):
-        export_settings['log'].error('Could not encode primitive. Skipping primitive.')
+    success = dll.encoderEncode(encoder, preserve_triangle_order)
 
     byte_length = dll.encoderGetByteLength(encoder)
     encoded_data = bytes(byte_length)
     dll.encoderCopy(encoder, encoded_data)
 
+    encoded_indices = dll.encoderGetEncodedIndexCount(encoder)
+    encoded_vertices = dll.encoderGetEncodedVertexCount(encoder)
+
+    dll.encoderRelease(encoder)
+
+    return success, encoded_data, draco_ids, encoded_indices, encoded_vertices
+
+
+def __apply_encoded_primitive(primitive, result, export_settings, encoded_primitives_cache):
+    success, encoded_data, draco_ids, encoded_indices, encoded_vertices = result
+
+    if not success:
+        export_settings['log'].error('Could not encode primitive. Skipping primitive.')
+
     if primitive.extensions is None:
         primitive.extensions = {}
 
@@ -170,9 +206,6 @@ def __encode_primitive(primitive, dll, export_settings, encoded_primitives_cache
     primitive.mode = 4
 
     # Update accessors to match encoded data.
-    indices.count = dll.encoderGetEncodedIndexCount(encoder)
-    encoded_vertices = dll.encoderGetEncodedVertexCount(encoder)
-    for attr_name in attributes:
-        attributes[attr_name].count = encoded_vertices
-
-    dll.encoderRelease(encoder)
+    primitive.indices.count = encoded_indices
+    for attr_name in primitive.attributes:
+        primitive.attributes[attr_name].count = encoded_vertices
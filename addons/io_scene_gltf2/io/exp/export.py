@@ -16,7 +16,9 @@
 # Imports
 #
 
+import contextlib
 import json
+import os
 import struct
 from ...io.exp.user_extensions import export_user_extensions
 
@@ -27,7 +29,6 @@ from ...io.exp.user_extensions import export_user_extensions
 #
 # Functions
 #
-from collections import OrderedDict
 
 
 def save_gltf(gltf, export_settings, encoder, glb_buffer):
@@ -69,59 +70,173 @@ def save_gltf(gltf, export_settings, encoder, glb_buffer):
 
     export_user_extensions('gather_gltf_encoded_hook', export_settings, gltf_format, sort_order)
 
-    gltf_ordered = OrderedDict(sorted(gltf.items(), key=lambda item: sort_order.index(item[0])))
-    gltf_encoded = json.dumps(gltf_ordered, indent=gltf_format.indent, separators=gltf_format.separators, cls=encoder, allow_nan=False)
+    sort_rank = {key: rank for rank, key in enumerate(sort_order)}
+    gltf_ordered = dict(sorted(gltf.items(), key=lambda item: sort_rank[item[0]]))
 
     #
 
     if export_settings['gltf_format'] != 'GLB':
-        file = open(export_settings['gltf_filepath'], "w", encoding="utf8", newline="\n")
-        file.write(gltf_encoded)
-        file.write("\n")
-        file.close()
+        with __open_replacing(export_settings['gltf_filepath'], "w", encoding="utf8", newline="\n") as file:
+            __write_json(file.write, gltf_ordered, gltf_format, encoder)
+            file.write("\n")
 
         binary = export_settings['gltf_binary']
         if len(binary) > 0 and not export_settings['gltf_embed_buffers']:
-            file = open(export_settings['gltf_filedirectory'] + export_settings['gltf_binaryfilename'], "wb")
-            file.write(binary)
-            file.close()
+            with __open_replacing(export_settings['gltf_filedirectory'] + export_settings['gltf_binaryfilename'], "wb") as file:
+                file.write(binary)
 
     else:
-        file = open(export_settings['gltf_filepath'], "wb")
+        with __open_replacing(export_settings['gltf_filepath'], "wb") as file:
+            __write_glb(file, gltf_ordered, gltf_format, encoder, glb_buffer)
 
-        gltf_data = gltf_encoded.encode()
-        binary = glb_buffer
-
-        length_gltf = len(gltf_data)
-        spaces_gltf = (4 - (length_gltf & 3)) & 3
-        length_gltf += spaces_gltf
-
-        length_bin = len(binary)
-        zeros_bin = (4 - (length_bin & 3)) & 3
-        length_bin += zeros_bin
-
-        length = 12 + 8 + length_gltf
-        if length_bin > 0:
-            length += 8 + length_bin
-
-        # Header (Version 2)
-        file.write('glTF'.encode())
-        file.write(struct.pack("I", 2))
-        file.write(struct.pack("I", length))
-
-        # Chunk 0 (JSON)
-        file.write(struct.pack("I", length_gltf))
-        file.write('JSON'.encode())
-        file.write(gltf_data)
-        file.write(b' ' * spaces_gltf)
-
-        # Chunk 1 (BIN)
-        if length_bin > 0:
-            file.write(struct.pack("I", length_bin))
-            file.write('BIN\0'.encode())
-            file.write(binary)
-            file.write(b'\0' * zeros_bin)
+    return True
 
-        file.close()
 
-    return True
+@contextlib.contextmanager
+def __open_replacing(path, mode, **kwargs):
+    """
+    Opens a temporary file next to path, that replaces it once fully written.
+    If writing fails, the temporary file is removed, and an existing file at
+    path is left untouched.
+    """
+    tmp_path = path + '.%d.tmp' % os.getpid()
+    try:
+        with open(tmp_path, mode, **kwargs) as file:
+            yield file
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def __write_glb(file, gltf, gltf_format, encoder, binary):
+    length_bin = __binary_length(binary)
+    zeros_bin = (4 - (length_bin & 3)) & 3
+    length_bin += zeros_bin
+
+    # Header (Version 2), total length is written once known
+    file.write('glTF'.encode())
+    file.write(struct.pack("I", 2))
+    file.write(struct.pack("I", 0))
+
+    # Chunk 0 (JSON), streamed, length is written once known
+    file.write(struct.pack("I", 0))
+    file.write('JSON'.encode())
+    json_start = file.tell()
+    __write_json(lambda chunk: file.write(chunk.encode()), gltf, gltf_format, encoder)
+    length_gltf = file.tell() - json_start
+    spaces_gltf = (4 - (length_gltf & 3)) & 3
+    length_gltf += spaces_gltf
+    file.write(b' ' * spaces_gltf)
+
+    # Chunk 1 (BIN)
+    if length_bin > 0:
+        file.write(struct.pack("I", length_bin))
+        file.write('BIN\0'.encode())
+        __write_binary(file, binary)
+        file.write(b'\0' * zeros_bin)
+
+    length = 12 + 8 + length_gltf
+    if length_bin > 0:
+        length += 8 + length_bin
+
+    file.seek(8)
+    file.write(struct.pack("I", length))
+    file.write(struct.pack("I", length_gltf))
+
+
+def __write_json(write, gltf, gltf_format, encoder):
+    """
+    Write the glTF JSON chunk by chunk: one chunk per root property, and one
+    per item of root arrays. The output is the same as json.dumps, without
+    building the whole string in memory.
+    """
+    indent = gltf_format.indent
+    if isinstance(indent, int):
+        indent = ' ' * indent
+    item_separator, key_separator = gltf_format.separators
+
+    # Items are encoded with the standard encoder; items with simple shapes are
+    # formatted from a compact encoding, that uses the C encoder
+    dumps = encoder(indent=indent, separators=gltf_format.separators, allow_nan=False).encode
+    dumps_compact = encoder(separators=(',', ':'), allow_nan=False).encode
+
+    def encode(value, level):
+        if indent is None:
+            return dumps(value)
+        encoded = __encode_simple_item(value, dumps_compact, indent, level, item_separator, key_separator)
+        if encoded is None:
+            # JSON strings can't contain raw newlines: this only indents the structure
+            encoded = dumps(value).replace('\n', '\n' + indent * level)
+        return encoded
+
+    if not gltf:
+        write('{}')
+        return
+
+    newline = '' if indent is None else '\n'
+    newline1 = '' if indent is None else '\n' + indent
+    newline2 = '' if indent is None else '\n' + indent * 2
+
+    write('{')
+    for idx, (key, value) in enumerate(gltf.items()):
+        write((item_separator if idx > 0 else '') + newline1 + dumps_compact(key) + key_separator)
+        if isinstance(value, list) and value:
+            write('[')
+            for item_idx, item in enumerate(value):
+                write((item_separator if item_idx > 0 else '') + newline2 + encode(item, 2))
+            write(newline1 + ']')
+        else:
+            write(encode(value, 1))
+    write(newline + '}')
+
+
+__SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def __encode_simple_item(item, dumps_compact, indent, level, item_separator, key_separator):
+    """
+    Fast path for indented output of the most common shape of root array items
+    (accessors, buffer views, nodes...): a dict of scalars and lists of numbers.
+    Returns None for other shapes.
+    """
+    if not isinstance(item, dict) or not item:
+        return None
+
+    newline = '\n' + indent * level
+    newline1 = newline + indent
+    newline2 = newline1 + indent
+
+    parts = []
+    for key, value in item.items():
+        if not isinstance(key, str):
+            return None
+        if isinstance(value, __SCALAR_TYPES):
+            encoded = dumps_compact(value)
+        elif isinstance(value, list) and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value):
+            if not value:
+                encoded = '[]'
+            else:
+                # Numbers don't contain commas
+                encoded = '[' + newline2 + (item_separator + newline2).join(dumps_compact(value)[1:-1].split(',')) + newline1 + ']'
+        else:
+            return None
+        parts.append(newline1 + dumps_compact(key) + key_separator + encoded)
+
+    return '{' + item_separator.join(parts) + newline + '}'
+
+
+def __binary_length(binary):
+    if isinstance(binary, (bytes, bytearray, memoryview)):
+        return len(binary)
+    # Streamed buffer (see io.exp.buffer.Buffer)
+    return binary.byte_length
+
+
+def __write_binary(file, binary):
+    if isinstance(binary, (bytes, bytearray, memoryview)):
+        file.write(binary)
+    else:
+        # Streamed buffer: copy chunk by chunk, never holding the whole BIN chunk in memory
+        binary.write_to(file)
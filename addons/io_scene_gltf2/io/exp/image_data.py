@@ -13,6 +13,8 @@
 # limitations under the License.
 
 import re
+from concurrent.futures import Future
+from .binary_data import SourceFile
 
 
 class ImageData:
@@ -21,15 +23,21 @@ class ImageData:
     # the node graph elements with numpy functions
 
     def __init__(self, data: bytes, mime_type: str, name: str):
+        # data can be a Future (image still being encoded), or a SourceFile (texture file exported as is)
         self._data = data
+        self._key = data
         self._mime_type = mime_type
         self._name = name
 
     def __eq__(self, other):
-        return self._data == other.data
+        return self._key == other._key
 
     def __hash__(self):
-        return hash(self._data)
+        return hash(self._key)
+
+    def __deepcopy__(self, memo):
+        # Data is immutable (and a Future can't be copied): copies share it
+        return self
 
     def adjusted_name(self):
         regex_dot = re.compile(r"\.")
@@ -37,9 +45,27 @@ class ImageData:
         new_name = "".join([char for char in adjusted_name if char not in r"!#$&'()*+,/:;<>?@[\]^`{|}~"])
         return new_name
 
+    def __resolve(self):
+        # Wait for an image still being encoded
+        if isinstance(self._data, Future):
+            self._data = self._data.result()
+        return self._data
+
     @property
     def data(self):
-        return self._data
+        data = self.__resolve()
+        if isinstance(data, SourceFile):
+            return data.read()
+        return data
+
+    def write_to_file(self, path: str):
+        """Write the image to path. Files exported as is are copied, without being read in memory."""
+        data = self.__resolve()
+        if isinstance(data, SourceFile):
+            data.copy_to(path)
+        else:
+            with open(path, 'wb') as f:
+                f.write(data)
 
     @property
     def name(self):
@@ -55,4 +81,7 @@ class ImageData:
 
     @property
     def byte_length(self):
-        return len(self._data)
+        data = self.__resolve()
+        if isinstance(data, SourceFile):
+            return data.byte_length
+        return len(data)
@@ -0,0 +1,76 @@
+# Copyright 2018-2021 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+import zlib
+import numpy as np
+
+
+# PNG color type, by number of channels
+__COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+# Rows filtered and compressed at once, to bound memory use on large images
+__BAND_HEIGHT = 256
+
+
+def encode_png(pixels: np.ndarray, compression_level=zlib.Z_BEST_SPEED) -> bytes:
+    """
+    Encodes 8-bit pixels to PNG.
+    pixels is a uint8 array of shape (height, width, channels), with the top
+    row first, and 1 (gray), 2 (gray, alpha), 3 (RGB) or 4 (RGBA) channels.
+    The default compression level is the one of Blender's default PNG settings.
+    """
+    height, width, channels = pixels.shape
+    row_length = width * channels
+    pixels = pixels.reshape(height, row_length)
+
+    compressor = zlib.compressobj(compression_level)
+    idat = []
+    previous_row = np.zeros((1, row_length), dtype=np.int16)
+    for start in range(0, height, __BAND_HEIGHT):
+        band = pixels[start:start + __BAND_HEIGHT].astype(np.int16)
+
+        # Paeth filter, on every row. It only depends on unfiltered bytes, so
+        # all the rows of a band are filtered at once.
+        up = np.concatenate((previous_row, band[:-1]))
+        left = np.zeros_like(band)
+        left[:, channels:] = band[:, :-channels]
+        up_left = np.zeros_like(band)
+        up_left[:, channels:] = up[:, :-channels]
+
+        p = left + up - up_left
+        pa = np.abs(p - left)
+        pb = np.abs(p - up)
+        pc = np.abs(p - up_left)
+        predictor = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+
+        rows = np.empty((len(band), 1 + row_length), dtype=np.uint8)
+        rows[:, 0] = 4  # Paeth filter type
+        rows[:, 1:] = band - predictor  # Modulo 256
+        idat.append(compressor.compress(rows.data))
+
+        previous_row = band[-1:]
+    idat.append(compressor.flush())
+
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, __COLOR_TYPES[channels], 0, 0, 0)
+    return b''.join((
+        b'\x89PNG\r\n\x1a\n',
+        __chunk(b'IHDR', ihdr),
+        __chunk(b'IDAT', b''.join(idat)),
+        __chunk(b'IEND', b''),
+    ))
+
+
+def __chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(data, zlib.crc32(chunk_type)))
@@ -19,6 +19,8 @@ import logging
 import json
 import struct
 import base64
+import mmap
+import gc
 from os.path import dirname, join, isfile
 
 
@@ -36,8 +38,10 @@ class glTFImporter():
         self.import_settings = import_settings
         self.glb_buffer = None
         self.buffers = {}
+        self.mapped_files = [] # Keep mapped files opened while buffers are used
         self.accessor_cache = {}
         self.decode_accessor_cache = {}
+        self.mesh_decoder = None # Decodes meshes ahead of their creation (see blender.imp.mesh.MeshDecoder)
         self.import_user_extensions = import_settings['import_user_extensions']
         self.variant_mapping = {} # Used to map between mgltf material idx and blender material, for Variants
 
@@ -157,8 +161,7 @@ class glTFImporter():
         if not isfile(self.filename):
             raise ImportError("Please select a file")
 
-        with open(self.filename, 'rb') as f:
-            content = memoryview(f.read())
+        content = self.read_file(self.filename)
 
         if content[:4] == b'glTF':
             gltf, self.glb_buffer = self.load_glb(content)
@@ -175,6 +178,22 @@ class glTFImporter():
             traceback.print_exc()
             raise ImportError("Couldn't parse glTF. Check that the file is valid")
 
+    def close(self):
+        """Release the buffers, and close the mapped files. Call it once the import is done."""
+        self.glb_buffer = None
+        self.buffers = {}
+        self.accessor_cache = {}
+        self.decode_accessor_cache = {}
+        # Arrays decoded from the buffers may still be referenced in cycles
+        gc.collect()
+        for mapped in self.mapped_files:
+            try:
+                mapped.close()
+            except BufferError:
+                # Data is still referenced (eg. by a user extension): closed when garbage collected
+                pass
+        self.mapped_files = []
+
     def load_buffer(self, buffer_idx):
         """Load buffer."""
         buffer = self.data.buffers[buffer_idx]
@@ -202,8 +221,18 @@ class glTFImporter():
 
         path = join(dirname(self.filename), uri_to_path(uri))
         try:
-            with open(path, 'rb') as f_:
-                return memoryview(f_.read())
+            return self.read_file(path)
         except Exception:
             self.log.error("Couldn't read file: " + path)
             return None
+
+    def read_file(self, path):
+        """Map a file in memory. Pages are only read from disk when the data is accessed."""
+        with open(path, 'rb') as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # Empty file, or file that can't be mapped: read it
+                return memoryview(f.read())
+        self.mapped_files.append(mapped)
+        return memoryview(mapped)
@@ -0,0 +1,75 @@
+# Copyright 2018-2021 The Khronos Group Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Minimal PNG decoder (8-bit, non interlaced), to check encoded images
+
+import struct
+import zlib
+
+import numpy as np
+
+CHANNELS = {0: 1, 4: 2, 2: 3, 6: 4}
+
+
+def decode_png(data):
+    """Returns the pixels of a PNG, as a uint8 array of shape (height, width, channels), top row first."""
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    pos = 8
+    idat = []
+    header = None
+    while pos < len(data):
+        length, chunk_type = struct.unpack('>I4s', data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        crc, = struct.unpack('>I', data[pos + 8 + length:pos + 12 + length])
+        assert crc == zlib.crc32(chunk, zlib.crc32(chunk_type))
+        if chunk_type == b'IHDR':
+            header = struct.unpack('>IIBBBBB', chunk)
+        elif chunk_type == b'IDAT':
+            idat.append(chunk)
+        elif chunk_type == b'IEND':
+            break
+        pos += 12 + length
+
+    width, height, bit_depth, color_type, _, _, interlace = header
+    assert bit_depth == 8 and interlace == 0
+    channels = CHANNELS[color_type]
+    row_length = width * channels
+    raw = zlib.decompress(b''.join(idat))
+    assert len(raw) == height * (1 + row_length)
+
+    pixels = np.zeros((height, row_length), dtype=np.uint8)
+    previous = [0] * row_length
+    for y in range(height):
+        filter_type = raw[y * (1 + row_length)]
+        row = list(raw[y * (1 + row_length) + 1:(y + 1) * (1 + row_length)])
+        for x in range(row_length):
+            left = row[x - channels] if x >= channels else 0
+            up = previous[x]
+            up_left = previous[x - channels] if x >= channels else 0
+            if filter_type == 1:
+                predictor = left
+            elif filter_type == 2:
+                predictor = up
+            elif filter_type == 3:
+                predictor = (left + up) // 2
+            elif filter_type == 4:
+                p = left + up - up_left
+                pa, pb, pc = abs(p - left), abs(p - up), abs(p - up_left)
+                predictor = left if pa <= pb and pa <= pc else up if pb <= pc else up_left
+            else:
+                predictor = 0
+            row[x] = (row[x] + predictor) & 0xFF
+        pixels[y] = row
+        previous = row
+    return pixels.reshape(height, width, channels)
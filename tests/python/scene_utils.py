@@ -0,0 +1,65 @@
+# Copyright 2018-2021 The Khronos Group Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Helpers building small scenes for the unit tests that need Blender data
+
+import bpy
+
+GRID_VERTS = [(x, y, 0.0) for y in range(3) for x in range(3)]
+GRID_FACES = [(0, 1, 4, 3), (1, 2, 5, 4), (3, 4, 7, 6), (4, 5, 8, 7)]
+
+
+def clear_scene():
+    for collection in (bpy.data.objects, bpy.data.meshes, bpy.data.armatures, bpy.data.materials, bpy.data.images):
+        for data in list(collection):
+            collection.remove(data)
+
+
+def add_mesh(name='Mesh', uv_maps=('UVMap',)):
+    """Adds a 3x3 grid object, with a UV map of each name (each one with different UVs)."""
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(GRID_VERTS, [], GRID_FACES)
+    for idx, uv_map in enumerate(uv_maps):
+        uv_layer = mesh.uv_layers.new(name=uv_map)
+        for loop in mesh.loops:
+            x, y, _ = GRID_VERTS[loop.vertex_index]
+            # Rotate the UVs of each map, so that they give different tangents
+            uv_layer.data[loop.index].uv = (x, y) if idx % 2 == 0 else (y, -x)
+    mesh.update()
+
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def add_skinned_mesh(name='Skinned'):
+    """Adds a grid object skinned to a one bone armature."""
+    armature = bpy.data.armatures.new(name + 'Armature')
+    armature_obj = bpy.data.objects.new(name + 'Armature', armature)
+    bpy.context.scene.collection.objects.link(armature_obj)
+
+    bpy.context.view_layer.objects.active = armature_obj
+    bpy.ops.object.mode_set(mode='EDIT')
+    bone = armature.edit_bones.new('Bone')
+    bone.head = (0.0, 0.0, 0.0)
+    bone.tail = (0.0, 0.0, 1.0)
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    obj = add_mesh(name)
+    obj.parent = armature_obj
+    group = obj.vertex_groups.new(name='Bone')
+    group.add(list(range(len(GRID_VERTS))), 1.0, 'REPLACE')
+    modifier = obj.modifiers.new('Armature', 'ARMATURE')
+    modifier.object = armature_obj
+    return obj
@@ -0,0 +1,57 @@
+# Copyright 2018-2021 The Khronos Group Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import unittest
+
+import numpy as np
+from mathutils import Matrix, Vector
+
+from io_scene_gltf2.blender.com.gltf2_blender_math import transform_array, transform_location, transform_scale
+
+SCALES = np.array([
+    [1.0, 1.0, 1.0],
+    [2.0, 0.5, 3.0],
+    [-1.0, 1.0, 1.0],
+    [-2.0, -0.5, 3.0],
+    [0.0, 1.0, 2.0],
+])
+
+TRANSFORMS = {
+    'identity': Matrix.Identity(4),
+    'rotation': Matrix.Rotation(math.radians(30.0), 4, Vector((1.0, 2.0, 3.0)).normalized()),
+    'mirror': Matrix.Scale(-1.0, 4, Vector((1.0, 0.0, 0.0))),
+    'mirrored rotation': Matrix.Rotation(math.radians(-45.0), 4, 'Z') @ Matrix.Diagonal((1.0, -2.0, 1.0, 1.0)),
+    'translation': Matrix.Translation((1.0, -2.0, 3.0)) @ Matrix.Rotation(math.radians(90.0), 4, 'X'),
+}
+
+
+class TestTransformArray(unittest.TestCase):
+    """transform_array() must give the same values as transform() on each keyframe."""
+
+    def test_scale(self):
+        for name, transform in TRANSFORMS.items():
+            with self.subTest(transform=name):
+                expected = [transform_scale(Vector(scale), transform) for scale in SCALES]
+                np.testing.assert_allclose(transform_array(SCALES, 'scale', transform), expected, atol=1e-6)
+
+    def test_location(self):
+        for name, transform in TRANSFORMS.items():
+            with self.subTest(transform=name):
+                expected = [transform_location(Vector(location), transform) for location in SCALES]
+                np.testing.assert_allclose(transform_array(SCALES, 'location', transform), expected, atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
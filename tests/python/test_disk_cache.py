@@ -0,0 +1,231 @@
+# Copyright 2018-2021 The Khronos Group Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import bpy
+import numpy as np
+
+from io_scene_gltf2.blender.exp.disk_cache import DiskCache, content_hash, mesh_content, update_manifest
+from io_scene_gltf2.blender.exp.primitive_extract import PrimitiveCreator
+import scene_utils
+
+
+def cache_entries(cache_directory, namespace):
+    directory = os.path.join(cache_directory, namespace)
+    return sorted(name for _, _, names in os.walk(directory) for name in names if not name.endswith('.tmp'))
+
+
+class TestMeshDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        scene_utils.clear_scene()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_directory = os.path.join(self.tmp_dir.name, 'cache')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def export(self, name='scene', **kwargs):
+        filepath = os.path.join(self.tmp_dir.name, name + '.glb')
+        result = bpy.ops.export_scene.gltf(
+            filepath=filepath,
+            export_format='GLB',
+            export_tangents=True,
+            export_cache_directory=self.cache_directory,
+            **kwargs)
+        self.assertEqual(result, {'FINISHED'})
+        return cache_entries(self.cache_directory, 'primitives')
+
+    def test_unchanged_mesh_hits(self):
+        scene_utils.add_mesh(uv_maps=('UVMap', 'Other'))
+        first = self.export()
+        self.assertEqual(len(first), 1)
+        self.assertEqual(self.export(), first)
+
+    def test_active_uv_map_misses(self):
+        obj = scene_utils.add_mesh(uv_maps=('UVMap', 'Other'))
+        first = self.export()
+
+        # Tangents are computed on the active UVMap
+        obj.data.uv_layers.active_index = 1
+        second = self.export()
+
+        self.assertEqual(len(second), 2)
+        self.assertTrue(set(first) < set(second))
+
+    def test_active_render_uv_map_misses(self):
+        obj = scene_utils.add_mesh(uv_maps=('UVMap', 'Other'))
+        first = self.export()
+        obj.data.uv_layers[1].active_render = True
+        self.assertNotEqual(self.export(), first)
+
+    def test_color_attributes_miss(self):
+        obj = scene_utils.add_mesh()
+        obj.data.color_attributes.new('Col', 'BYTE_COLOR', 'CORNER')
+        obj.data.color_attributes.new('Other', 'BYTE_COLOR', 'CORNER')
+        obj.data.color_attributes.active_color_index = 0
+        obj.data.color_attributes.render_color_index = 0
+        keys = [content_hash(*mesh_content(obj.data))]
+
+        obj.data.color_attributes.active_color_index = 1
+        keys.append(content_hash(*mesh_content(obj.data)))
+        obj.data.color_attributes.render_color_index = 1
+        keys.append(content_hash(*mesh_content(obj.data)))
+
+        self.assertEqual(len(set(keys)), 3)
+
+    def test_geometry_misses(self):
+        obj = scene_utils.add_mesh()
+        first = self.export()
+        obj.data.vertices[4].co.z = 1.0
+        obj.data.update()
+        self.assertEqual(len(self.export()), len(first) + 1)
+
+    def test_export_settings_miss(self):
+        scene_utils.add_mesh()
+        first = self.export()
+        self.assertEqual(len(self.export(export_normals=False)), len(first) + 1)
+
+
+class TestIncrementalExport(unittest.TestCase):
+
+    def setUp(self):
+        scene_utils.clear_scene()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmp_dir.name, 'scene.glb')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def export(self):
+        """Exports with the operator, and returns the names of the meshes that were extracted."""
+        extracted = []
+        prepare_data = PrimitiveCreator.prepare_data
+
+        def spy(creator):
+            extracted.append(creator.blender_mesh.name)
+            prepare_data(creator)
+
+        with mock.patch.object(PrimitiveCreator, 'prepare_data', spy):
+            result = bpy.ops.export_scene.gltf(filepath=self.filepath, export_format='GLB', export_incremental=True)
+        self.assertEqual(result, {'FINISHED'})
+        return sorted(extracted)
+
+    def test_only_changed_mesh_is_extracted(self):
+        scene_utils.add_mesh('A')
+        obj = scene_utils.add_mesh('B')
+        self.assertEqual(self.export(), ['A', 'B'])
+        self.assertEqual(self.export(), [])
+
+        obj.data.vertices[0].co.z = 1.0
+        obj.data.update()
+        self.assertEqual(self.export(), ['B'])
+
+        # The cache is next to the exported file, and the previous entry of B was removed
+        self.assertEqual(len(cache_entries(os.path.join(self.tmp_dir.name, 'scene.cache'), 'primitives')), 2)
+
+    def test_skinned_mesh_is_always_extracted(self):
+        scene_utils.add_mesh('A')
+        scene_utils.add_skinned_mesh('Skinned')
+        self.assertEqual(self.export(), ['A', 'Skinned'])
+        self.assertEqual(self.export(), ['Skinned'])
+
+
+class TestContentHash(unittest.TestCase):
+
+    def test_large_arrays_in_containers(self):
+        # The repr of these arrays, and so of lists of them, is the same
+        a = np.zeros(3000, dtype=np.float32)
+        b = a.copy()
+        b[1500] = 1.0
+        self.assertEqual(repr([a]), repr([b]))
+
+        for wrap in [lambda x: [x], lambda x: (0, x), lambda x: {'data': x}, lambda x: [[x]]]:
+            self.assertNotEqual(content_hash(wrap(a)), content_hash(wrap(b)))
+            self.assertEqual(content_hash(wrap(a)), content_hash(wrap(a.copy())))
+
+    def test_parts_are_not_shifted(self):
+        self.assertNotEqual(content_hash([1, 2], 3), content_hash([1], 2, 3))
+        self.assertNotEqual(content_hash([1, (2,)]), content_hash([1, 2]))
+        self.assertNotEqual(content_hash(b'ab', b'c'), content_hash(b'a', b'bc'))
+
+
+class Log:
+    def __init__(self):
+        self.infos = []
+        self.warnings = []
+
+    def info(self, message):
+        self.infos.append(message)
+
+    def warning(self, message):
+        self.warnings.append(message)
+
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_directory = os.path.join(self.tmp_dir.name, 'cache')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def export(self, name, keys):
+        """Simulates an incremental export of name, using the primitives of keys."""
+        disk_cache = DiskCache(self.cache_directory)
+        for key in keys:
+            if disk_cache.load('primitives', key, 'Mesh_' + key) is None:
+                disk_cache.save('primitives', key, key, 'Mesh_' + key)
+        log = Log()
+        update_manifest(disk_cache, os.path.join(self.tmp_dir.name, name + '.glb'), log)
+        return log
+
+    def entries(self):
+        return cache_entries(self.cache_directory, 'primitives')
+
+    def test_reuse_is_logged(self):
+        self.assertEqual(self.export('a', ['k1', 'k2']).infos, [])
+        self.assertEqual(self.export('a', ['k1', 'k2']).infos, ['Incremental export: 2 primitives reused, 0 regenerated'])
+        self.assertEqual(
+            self.export('a', ['k1', 'k3']).infos,
+            ['Incremental export: 1 primitives reused, 1 regenerated: Mesh_k3'])
+
+    def test_unused_entries_are_removed(self):
+        self.export('a', ['k1', 'k2'])
+        self.export('a', ['k1'])
+        self.assertEqual(self.entries(), ['k1'])
+
+    def test_shared_directory(self):
+        self.export('a', ['k1', 'k2'])
+        self.export('b', ['k2', 'k3'])
+
+        # k2 is still used by b
+        self.export('a', ['k1'])
+        self.assertEqual(self.entries(), ['k1', 'k2', 'k3'])
+
+        # b was the last export using k2
+        self.export('b', ['k3'])
+        self.assertEqual(self.entries(), ['k1', 'k3'])
+
+        # Each export compares with its own previous export
+        self.assertEqual(self.export('a', ['k1']).infos, ['Incremental export: 1 primitives reused, 0 regenerated'])
+
+
+if __name__ == '__main__':
+    unittest.main()
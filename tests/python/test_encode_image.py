@@ -0,0 +1,157 @@
+# Copyright 2018-2021 The Khronos Group Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import bpy
+import numpy as np
+
+from io_scene_gltf2.blender.exp.disk_cache import DiskCache
+from io_scene_gltf2.blender.exp.material.encode_image import Channel, ExportImage
+from png_utils import decode_png
+import scene_utils
+from test_disk_cache import cache_entries
+
+WIDTH = 5
+HEIGHT = 3
+
+
+def new_export_settings(**kwargs):
+    export_settings = {
+        'encoded_images': {},
+        'image_source_hashes': {},
+        'exported_images': {},
+        'disk_cache': None,
+        'image_executor': None,
+        'gltf_image_quality': 75,
+        'profiler': None,
+        'log': None,
+    }
+    export_settings.update(kwargs)
+    return export_settings
+
+
+def new_image(name='Source'):
+    """Image with distinct byte values in each pixel and channel, bottom row first (Blender order)."""
+    values = np.arange(HEIGHT * WIDTH * 4, dtype=np.uint8).reshape(HEIGHT, WIDTH, 4) * 3
+    image = bpy.data.images.new(name, WIDTH, HEIGHT, alpha=True)
+    image.pixels.foreach_set((values.reshape(-1) / np.float32(255)).astype(np.float32))
+    return image, values
+
+
+class TestEncodeUnhappyPng(unittest.TestCase):
+    """Images packed from channels of other images are encoded with io.exp.png."""
+
+    def setUp(self):
+        scene_utils.clear_scene()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def encode(self, export_image, export_settings=None):
+        data, _ = export_image.encode('image/png', export_settings or new_export_settings())
+        return data
+
+    def test_packed_rgb(self):
+        image, values = new_image()
+        export_image = ExportImage()
+        export_image.fill_image(image, dst_chan=Channel.R, src_chan=Channel.B)
+        export_image.fill_image(image, dst_chan=Channel.G, src_chan=Channel.G)
+        export_image.fill_white(Channel.B)
+
+        decoded = decode_png(self.encode(export_image))
+
+        # No alpha channel is written, and the top row comes first
+        self.assertEqual(decoded.shape, (HEIGHT, WIDTH, 3))
+        expected = values[::-1]
+        np.testing.assert_array_equal(decoded[:, :, 0], expected[:, :, 2])
+        np.testing.assert_array_equal(decoded[:, :, 1], expected[:, :, 1])
+        np.testing.assert_array_equal(decoded[:, :, 2], 255)
+
+    def test_packed_rgba(self):
+        image, values = new_image()
+        export_image = ExportImage()
+        for chan in [Channel.R, Channel.G, Channel.A]:
+            export_image.fill_image(image, dst_chan=chan, src_chan=chan)
+        export_image.fill_with(Channel.B, 0.0)
+
+        data = self.encode(export_image)
+        decoded = decode_png(data)
+
+        self.assertEqual(decoded.shape, (HEIGHT, WIDTH, 4))
+        expected = values[::-1].copy()
+        expected[:, :, 2] = 0
+        np.testing.assert_array_equal(decoded, expected)
+
+        # Blender reads it back as the source image
+        path = os.path.join(self.tmp_dir.name, 'packed.png')
+        with open(path, 'wb') as f:
+            f.write(data)
+        loaded = bpy.data.images.load(path)
+        loaded.colorspace_settings.name = image.colorspace_settings.name
+        pixels = np.empty(WIDTH * HEIGHT * 4, np.float32)
+        loaded.pixels.foreach_get(pixels)
+        expected = values.copy()
+        expected[:, :, 2] = 0
+        np.testing.assert_array_equal(np.round(pixels * 255).astype(np.uint8).reshape(HEIGHT, WIDTH, 4), expected)
+
+
+    def test_worker_encoding(self):
+        image, values = new_image()
+        export_image = ExportImage()
+        export_image.fill_image(image, dst_chan=Channel.R, src_chan=Channel.B)
+        export_image.fill_white(Channel.G)
+        disk_cache = DiskCache(os.path.join(self.tmp_dir.name, 'cache'))
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            data = self.encode(export_image, new_export_settings(image_executor=executor, disk_cache=disk_cache))
+            self.assertIsInstance(data, Future)
+            decoded = decode_png(data.result())
+
+        np.testing.assert_array_equal(decoded[:, :, 0], values[::-1, :, 2])
+        # Cache entries are labelled with names read on the main thread
+        self.assertEqual(set(disk_cache.used['images'].values()), {'Source'})
+
+
+    def test_disk_cache_stores_once(self):
+        image, _ = new_image()
+        path = os.path.join(self.tmp_dir.name, 'source.png')
+        image.filepath_raw = path
+        image.file_format = 'PNG'
+        image.save()
+        image = bpy.data.images.load(path)
+        cache_directory = os.path.join(self.tmp_dir.name, 'cache')
+
+        def encode():
+            export_image = ExportImage()
+            export_image.fill_image(image, dst_chan=Channel.R, src_chan=Channel.G)
+            export_image.fill_white(Channel.G)
+            disk_cache = DiskCache(cache_directory)
+            return self.encode(export_image, new_export_settings(disk_cache=disk_cache)), disk_cache
+
+        data, _ = encode()
+        # Stored by fill recipe only, not by pixels too
+        self.assertEqual(len(cache_entries(cache_directory, 'images')), 1)
+
+        cached, disk_cache = encode()
+        self.assertEqual(cached, data)
+        self.assertEqual(len(disk_cache.used['images']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# Copyright 2018-2021 The Khronos Group Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import tempfile
+import unittest
+
+import bpy
+
+from io_scene_gltf2.io.com.debug import profiled, ExportProfiler
+import scene_utils
+
+
+class TestExportProfile(unittest.TestCase):
+
+    def setUp(self):
+        scene_utils.clear_scene()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_profiled_skinned_mesh(self):
+        scene_utils.add_skinned_mesh()
+        filepath = os.path.join(self.tmp_dir.name, 'skinned.glb')
+
+        result = bpy.ops.export_scene.gltf(filepath=filepath, export_format='GLB', export_profile=True)
+
+        self.assertEqual(result, {'FINISHED'})
+        with open(os.path.splitext(filepath)[0] + '.profile.json', encoding='utf8') as f:
+            report = json.load(f)
+        # Joints and weights are counted too
+        self.assertGreater(report['stages']['extract_primitives']['bytes'], 0)
+        self.assertIn('Skinned', report['stages']['extract_primitives']['objects'])
+
+    def test_failing_metric_does_not_fail(self):
+        class Log:
+            def __init__(self):
+                self.warnings = []
+
+            def warning(self, message):
+                self.warnings.append(message)
+
+        @profiled('stage', object_name=lambda export_settings: None.name, produced_bytes=lambda result: len(result))
+        def func(export_settings):
+            return None
+
+        export_settings = {'profiler': ExportProfiler(), 'log': Log()}
+        self.assertIsNone(func(export_settings))
+        self.assertEqual(export_settings['profiler'].stages['stage']['calls'], 1)
+        self.assertEqual(len(export_settings['log'].warnings), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# Copyright 2018-2021 The Khronos Group Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import pickle
+import threading
+import unittest
+
+from io_scene_gltf2.io.com import gltf2_io
+
+
+def new_list(count=4):
+    return gltf2_io.from_lazy_list(gltf2_io.Scene.from_dict, [{'name': 'Scene%d' % i, 'nodes': [i]} for i in range(count)])
+
+
+class TestLazyList(unittest.TestCase):
+
+    def assertBuilt(self, items):
+        for item in items:
+            self.assertIsInstance(item, gltf2_io.Scene)
+
+    def test_items_are_built_once(self):
+        scenes = new_list()
+        self.assertIs(scenes[1], scenes[1])
+        self.assertIs(scenes[-1], scenes[3])
+        self.assertEqual(scenes[2].name, 'Scene2')
+        self.assertBuilt(scenes)
+        self.assertBuilt(scenes[1:3])
+        self.assertEqual([s.name for s in scenes[::-2]], ['Scene3', 'Scene1'])
+
+    def test_list_api_never_exposes_dicts(self):
+        scenes = new_list()
+        scene = new_list()[0]  # Not in the list
+        self.assertNotIn(scene, scenes)
+        self.assertEqual(scenes.count(scene), 0)
+        self.assertBuilt(reversed(new_list()))
+        self.assertBuilt(new_list().copy())
+        self.assertBuilt(new_list() + [])
+        self.assertBuilt(new_list() * 2)
+        self.assertBuilt(list(new_list()))
+        self.assertBuilt(copy.copy(new_list()))
+        self.assertBuilt(pickle.loads(pickle.dumps(new_list())))
+        self.assertNotIn('{', repr(new_list()))
+
+        scenes = new_list()
+        built = scenes[2]
+        self.assertIn(built, scenes)
+        self.assertEqual(scenes.index(built), 2)
+        scenes.remove(built)
+        self.assertEqual(len(scenes), 3)
+        self.assertBuilt([scenes.pop()])
+
+    def test_equality(self):
+        scenes = new_list()
+        self.assertEqual(scenes, scenes)
+        self.assertEqual(scenes, list(scenes))
+        self.assertNotEqual(new_list(), new_list())  # Properties compare by identity
+
+    def test_threads_share_items(self):
+        scenes = new_list(1000)
+        results = [None] * 8
+
+        def read(i):
+            results[i] = [id(scene) for scene in scenes]
+
+        threads = [threading.Thread(target=read, args=(i,)) for i in range(len(results))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(result == results[0] for result in results))
+
+    def test_slots(self):
+        scenes = new_list()
+        with self.assertRaises(AttributeError):
+            scenes[0].blender_data = None
+        # The importer stores its own data on some properties
+        mesh = gltf2_io.Mesh.from_dict({'primitives': []})
+        mesh.blender_name = {}
+        self.assertEqual(mesh.blender_name, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+# Copyright 2018-2021 The Khronos Group Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+
+from io_scene_gltf2.io.imp.gltf2_io_gltf import glTFImporter
+from io_scene_gltf2.io.imp.gltf2_io_binary import BinaryData
+
+GLTF_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'gltf')
+
+
+class TestImportedFiles(unittest.TestCase):
+
+    def __read(self, filename):
+        importer = glTFImporter(os.path.join(GLTF_DIR, filename), {'import_user_extensions': []})
+        importer.read()
+        for accessor_idx in range(len(importer.data.accessors)):
+            BinaryData.decode_accessor(importer, accessor_idx)
+        return importer
+
+    def test_close_unmaps_glb(self):
+        importer = self.__read('Box.glb')
+        mapped_files = list(importer.mapped_files)
+        self.assertEqual(len(mapped_files), 1)
+
+        importer.close()
+        self.assertTrue(all(mapped.closed for mapped in mapped_files))
+        self.assertEqual(importer.buffers, {})
+
+    def test_close_unmaps_gltf_buffers(self):
+        importer = self.__read('Box.gltf')
+        mapped_files = list(importer.mapped_files)
+        self.assertTrue(mapped_files)
+
+        importer.close()
+        self.assertTrue(all(mapped.closed for mapped in mapped_files))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+# Copyright 2018-2021 The Khronos Group Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import bpy
+import numpy as np
+
+from io_scene_gltf2.blender.imp import mesh as blender_mesh
+import scene_utils
+
+MESH_COUNT = 10
+
+
+class TestDecodeMeshes(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.filepath = os.path.join(cls.tmp_dir.name, 'meshes.glb')
+        scene_utils.clear_scene()
+        for i in range(MESH_COUNT):
+            obj = scene_utils.add_mesh('Mesh%d' % i)
+            for vertex in obj.data.vertices:
+                vertex.co.z = i + vertex.index * 0.1
+        bpy.ops.export_scene.gltf(filepath=cls.filepath, export_format='GLB')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def import_meshes(self, threads):
+        scene_utils.clear_scene()
+        bpy.ops.import_scene.gltf(filepath=self.filepath, import_decode_threads=threads)
+        meshes = {}
+        for obj in bpy.data.objects:
+            co = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+            obj.data.vertices.foreach_get('co', co)
+            meshes[obj.name] = co
+        return meshes
+
+    def test_same_as_serial_import(self):
+        serial = self.import_meshes(1)
+        threaded = self.import_meshes(4)
+        self.assertEqual(len(serial), MESH_COUNT)
+        self.assertEqual(serial.keys(), threaded.keys())
+        for name in serial:
+            np.testing.assert_array_equal(serial[name], threaded[name])
+
+    def test_bounded_window(self):
+        # Decoded meshes waiting for their creation never exceed the window
+        in_flight = []
+        take = blender_mesh.MeshDecoder.take
+
+        def checked_take(decoder, key):
+            in_flight.append((len(decoder.futures), decoder.window))
+            return take(decoder, key)
+
+        with mock.patch.object(blender_mesh.MeshDecoder, 'take', checked_take):
+            self.import_meshes(2)
+
+        self.assertEqual(len(in_flight), MESH_COUNT)
+        self.assertTrue(all(count <= window < MESH_COUNT for count, window in in_flight))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+# Copyright 2018-2021 The Khronos Group Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import random
+import struct
+import tempfile
+import unittest
+
+from io_scene_gltf2.io.exp import export as gltf2_io_export
+from io_scene_gltf2.io.exp.binary_data import BinaryData, SourceFile
+from io_scene_gltf2.io.exp.buffer import Buffer
+
+write_json = getattr(gltf2_io_export, '__write_json')
+
+
+class GlTF_format:
+    def __init__(self, indent, separators):
+        self.indent = indent
+        self.separators = separators
+
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(8 if depth < 3 else 5)
+    if kind == 0:
+        return rng.choice([None, True, False])
+    if kind == 1:
+        return rng.randrange(-1000, 1000)
+    if kind == 2:
+        return rng.uniform(-1e6, 1e6)
+    if kind == 3:
+        return rng.choice(['', 'name', 'é"\\\n\t', 'data:application/octet-stream;base64,AAAA'])
+    if kind == 4:
+        return [rng.uniform(-1, 1) for _ in range(rng.choice([0, 3, 4, 16]))]
+    if kind == 5:
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    return {'key%d' % i: random_value(rng, depth + 1) for i in range(rng.randrange(5))}
+
+
+def random_gltf(rng):
+    gltf = {'asset': {'generator': 'test', 'version': '2.0'}}
+    for key in ['scene', 'scenes', 'nodes', 'meshes', 'accessors', 'bufferViews', 'extensions']:
+        if rng.random() < 0.8:
+            if key == 'scene':
+                gltf[key] = 0
+            elif key == 'extensions':
+                gltf[key] = random_value(rng, 1)
+            else:
+                gltf[key] = [random_value(rng, 1) for _ in range(rng.randrange(6))]
+    return gltf
+
+
+class TestWriteJson(unittest.TestCase):
+
+    def dumps(self, gltf, gltf_format):
+        chunks = []
+        write_json(chunks.append, gltf, gltf_format, json.JSONEncoder)
+        return ''.join(chunks)
+
+    def test_same_as_json_dumps(self):
+        rng = random.Random(0)
+        formats = [GlTF_format(None, (',', ':')), GlTF_format('\t', (',', ':')), GlTF_format(2, (', ', ': '))]
+        for _ in range(500):
+            gltf = random_gltf(rng)
+            for gltf_format in formats:
+                expected = json.dumps(gltf, indent=gltf_format.indent, separators=gltf_format.separators, allow_nan=False)
+                self.assertEqual(self.dumps(gltf, gltf_format), expected)
+
+    def test_empty(self):
+        self.assertEqual(self.dumps({}, GlTF_format('\t', (',', ':'))), '{}')
+
+    def test_nan_is_an_error(self):
+        for value in [float('nan'), float('inf')]:
+            for gltf_format in [GlTF_format(None, (',', ':')), GlTF_format('\t', (',', ':'))]:
+                with self.assertRaises(ValueError):
+                    self.dumps({'accessors': [{'min': [value]}]}, gltf_format)
+
+
+class TestSaveGlb(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_streamed_source_file(self):
+        # Odd length, so that the buffer view and the BIN chunk are padded
+        texture = bytes(range(256)) * 40 + b'end'
+        texture_path = os.path.join(self.tmp_dir.name, 'texture.png')
+        with open(texture_path, 'wb') as f:
+            f.write(texture)
+
+        buffer = Buffer()
+        accessor_view = buffer.add_and_get_view(BinaryData(b'\x01\x02\x03'))
+        texture_view = buffer.add_and_get_view(BinaryData(SourceFile(texture_path)))
+        # Same file content: same view
+        self.assertIs(buffer.add_and_get_view(BinaryData(SourceFile(texture_path))), texture_view)
+        self.assertEqual(texture_view.byte_offset, 4)
+        self.assertEqual(texture_view.byte_length, len(texture))
+
+        gltf = {'asset': {'version': '2.0'}, 'buffers': [{'byteLength': buffer.byte_length}]}
+        filepath = os.path.join(self.tmp_dir.name, 'out.glb')
+        export_settings = {'gltf_format': 'GLB', 'gltf_filepath': filepath, 'gltf_user_extensions': []}
+        gltf2_io_export.save_gltf(gltf, export_settings, json.JSONEncoder, buffer)
+
+        with open(filepath, 'rb') as f:
+            glb = f.read()
+
+        magic, version, length = struct.unpack('<4sII', glb[:12])
+        self.assertEqual((magic, version, length), (b'glTF', 2, len(glb)))
+        self.assertEqual(length % 4, 0)
+
+        json_length, json_type = struct.unpack('<I4s', glb[12:20])
+        self.assertEqual(json_type, b'JSON')
+        self.assertEqual(json.loads(glb[20:20 + json_length]), gltf)
+
+        bin_start = 20 + json_length
+        bin_length, bin_type = struct.unpack('<I4s', glb[bin_start:bin_start + 8])
+        self.assertEqual(bin_type, b'BIN\0')
+        self.assertEqual(bin_length % 4, 0)
+        self.assertEqual(bin_start + 8 + bin_length, len(glb))
+
+        binary = glb[bin_start + 8:]
+        self.assertEqual(binary[:3], b'\x01\x02\x03')
+        self.assertEqual(binary[4:4 + len(texture)], texture)
+        self.assertEqual(buffer.byte_length, 4 + len(texture) + 1)
+
+
+    def test_failing_write_keeps_existing_file(self):
+        for gltf_format in ['GLB', 'GLTF_SEPARATE']:
+            filepath = os.path.join(self.tmp_dir.name, 'existing.' + ('glb' if gltf_format == 'GLB' else 'gltf'))
+            with open(filepath, 'wb') as f:
+                f.write(b'previous export')
+
+            gltf = {'asset': {'version': '2.0'}, 'nodes': [{'translation': [0.0, float('nan'), 0.0]}]}
+            export_settings = {
+                'gltf_format': gltf_format,
+                'gltf_filepath': filepath,
+                'gltf_user_extensions': [],
+                'gltf_binary': b'',
+                'gltf_embed_buffers': False,
+            }
+            with self.assertRaises(ValueError):
+                gltf2_io_export.save_gltf(gltf, export_settings, json.JSONEncoder, Buffer())
+
+            with open(filepath, 'rb') as f:
+                self.assertEqual(f.read(), b'previous export')
+            self.assertEqual(os.listdir(self.tmp_dir.name), [os.path.basename(filepath)])
+            os.remove(filepath)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# Copyright 2018-2021 The Khronos Group Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+import unittest
+
+import numpy as np
+
+from io_scene_gltf2.io.exp.png import encode_png
+from png_utils import decode_png
+
+
+class TestEncodePng(unittest.TestCase):
+
+    def round_trip(self, pixels):
+        data = encode_png(pixels)
+        np.testing.assert_array_equal(decode_png(data), pixels)
+        return data
+
+    def test_channels(self):
+        rng = np.random.default_rng(0)
+        for channels, color_type in [(1, 0), (2, 4), (3, 2), (4, 6)]:
+            pixels = rng.integers(0, 256, (7, 5, channels), dtype=np.uint8)
+            data = self.round_trip(pixels)
+            width, height, _, png_color_type = struct.unpack('>IIBB', data[16:26])
+            self.assertEqual((width, height, png_color_type), (5, 7, color_type))
+
+    def test_alpha(self):
+        # Without alpha, RGB is encoded: the alpha channel is dropped, not premultiplied
+        rgba = np.zeros((4, 4, 4), dtype=np.uint8)
+        rgba[..., 0] = 200
+        rgba[..., 3] = np.arange(16).reshape(4, 4) * 16
+        self.round_trip(rgba)
+        self.round_trip(rgba[:, :, :3])
+
+    def test_several_bands(self):
+        # Rows are filtered by bands: rows at band boundaries use the previous band
+        pixels = np.random.default_rng(1).integers(0, 256, (600, 3, 3), dtype=np.uint8)
+        pixels[256:260] = pixels[255]
+        self.round_trip(pixels)
+
+    def test_gradients(self):
+        # Worst cases of the Paeth predictor: values wrapping around 0 and 255
+        x = np.arange(64, dtype=np.uint8)
+        pixels = np.stack(np.broadcast_arrays(x * 4, x[:, np.newaxis] * 4, 255 - x * 4, (x[:, np.newaxis] + x) * 8), axis=2)
+        self.round_trip(np.ascontiguousarray(pixels.astype(np.uint8)))
+
+    def test_top_row_first(self):
+        # Blender stores the bottom row first: the exporter flips before encoding
+        blender_order = np.zeros((2, 1, 3), dtype=np.uint8)
+        blender_order[0] = 255  # Bottom row is white
+        decoded = decode_png(encode_png(blender_order[::-1]))
+        self.assertEqual(decoded[0, 0].tolist(), [0, 0, 0])
+        self.assertEqual(decoded[1, 0].tolist(), [255, 255, 255])
+
+    def test_single_pixel(self):
+        self.round_trip(np.full((1, 1, 4), 255, dtype=np.uint8))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# Copyright 2018-2021 The Khronos Group Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import unittest
+
+import numpy as np
+from mathutils import Vector
+
+from io_scene_gltf2.blender.exp.primitive_extract import PrimitiveCreator
+
+
+def mathutils_morph_tangents(normals, morph_normals, tangents):
+    """Reference implementation, one vertex at a time."""
+    morph_tangents = np.empty((len(normals), 3), dtype=np.float32)
+    for i in range(len(normals)):
+        n = Vector(normals[i])
+        morph_n = n + Vector(morph_normals[i])
+        t = Vector(tangents[i, :3])
+        t_morph = Vector(t)
+        t_morph.rotate(morph_n.rotation_difference(n))
+        morph_tangents[i] = t_morph - t
+    return morph_tangents
+
+
+class TestMorphTangents(unittest.TestCase):
+
+    def check(self, normals, morph_normals):
+        rng = np.random.default_rng(0)
+        creator = PrimitiveCreator.__new__(PrimitiveCreator)
+        creator.normals = np.array(normals, dtype=np.float32)
+        creator.morph_normals = np.array(morph_normals, dtype=np.float32)
+        creator.tangents = np.ones((len(normals), 4), dtype=np.float32)
+        creator.tangents[:, :3] = rng.uniform(-1, 1, (len(normals), 3))
+
+        creator._PrimitiveCreator__calc_morph_tangents()
+
+        expected = mathutils_morph_tangents(creator.normals, creator.morph_normals, creator.tangents)
+        np.testing.assert_allclose(creator.morph_tangents, expected, atol=1e-5)
+
+    def test_random(self):
+        rng = np.random.default_rng(1)
+        normals = rng.normal(size=(1000, 3))
+        normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+        self.check(normals, rng.normal(size=(1000, 3)) * 0.5)
+
+    def test_degenerate(self):
+        s2 = 1 / math.sqrt(2)
+        s3 = 1 / math.sqrt(3)
+        # Axis aligned normals, and normals with ties between their dominant axes
+        base = np.array([
+            (0, 0, 1), (0, -1, 0), (1, 0, 0),
+            (s2, s2, 0), (s2, 0, -s2), (0, s2, s2), (s3, -s3, s3),
+        ])
+        normals = np.concatenate((
+            base,  # Parallel
+            base,  # Antiparallel
+            base,  # Null morphed normal
+            np.zeros((2, 3)),  # Null normal
+        ))
+        morph_normals = np.concatenate((
+            np.zeros_like(base),
+            -2 * base,
+            -base,
+            [(0, 0, 0), (0, 1, 0)],
+        ))
+        self.check(normals, morph_normals)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+# Copyright 2018-2021 The Khronos Group Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Runs the Python unit tests of the python/ directory inside Blender:
+#   blender -b --addons io_scene_gltf2 -noaudio --python python_unittests.py [-- pattern]
+
+import os
+import sys
+import unittest
+
+try:
+    argv = sys.argv
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]  # get all args after "--"
+    else:
+        argv = []
+
+    tests_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'python')
+    suite = unittest.defaultTestLoader.discover(tests_dir, pattern=argv[0] if argv else 'test_*.py')
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    if not result.wasSuccessful():
+        sys.exit(1)
+except Exception as err:
+    print(err, file=sys.stderr)
+    sys.exit(1)
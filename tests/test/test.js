@@ -64,6 +64,18 @@ function blenderRoundtripGltf(blenderVersion, gltfPath, outDirName, done, option
     });
 }
 
+function blenderPythonUnitTests(blenderVersion, done) {
+    const { exec } = require('child_process');
+    const cmd = `${blenderVersion} -b --addons io_scene_gltf2 -noaudio --python python_unittests.py`;
+    var prc = exec(cmd, (error, stdout, stderr) => {
+        if (error) {
+            done(new Error(stderr));
+            return;
+        }
+        done();
+    });
+}
+
 function validateGltf(gltfPath, done) {
     const asset = fs.readFileSync(gltfPath);
     validator.validateBytes(new Uint8Array(asset), {
@@ -239,6 +251,14 @@ describe('General', function () {
     });
 });
 
+describe('Python', function () {
+    blenderVersions.forEach(function (blenderVersion) {
+        it(blenderVersion + '_unittests', function (done) {
+            blenderPythonUnitTests(blenderVersion, done);
+        });
+    });
+});
+
 describe('Exporter', function () {
     let blenderSampleScenes = fs.readdirSync('scenes').filter(f => f.endsWith('.blend')).map(f => f.substring(0, f.length - 6));
 